@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Content-addressed on-disk cache for rendered schedule files
+Shared by the CLI, the Tkinter GUI and the Streamlit app
+
+Files are keyed by a hash of the normalised parameters, seed and format, written
+atomically, and evicted least-recently-used first once the cache grows past its size limit.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+# Bump when the rendered output of any format changes so stale files are never served
+CACHE_VERSION = 2
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "hello_kitty_schedule")
+DEFAULT_MAX_MB = 256
+
+
+class ArtifactCache:
+    def __init__(self, directory=None, max_bytes=None):
+        self.directory = directory or os.environ.get("SCHEDULE_CACHE_DIR", DEFAULT_CACHE_DIR)
+        if max_bytes is None:
+            max_bytes = int(float(os.environ.get("SCHEDULE_CACHE_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024)
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def key(params, seed, fmt):
+        """Hash of the normalised parameters, seed and format."""
+        payload = json.dumps({"version": CACHE_VERSION, "params": params, "seed": seed, "format": fmt},
+                             sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key)
+
+    def fetch(self, key, destination):
+        """Copy a cached file to `destination`. Returns False on a cache miss."""
+        path = self._path(key)
+        try:
+            shutil.copyfile(path, destination)
+        except FileNotFoundError:
+            return False
+        # Mark as recently used for LRU eviction
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return True
+
+    def store(self, key, source):
+        """Atomically add `source` to the cache, then evict old entries if over the size limit."""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as temp_file, open(source, "rb") as source_file:
+                shutil.copyfileobj(source_file, temp_file)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self.evict()
+
+    def entries(self):
+        """(last used, size, path) for every cached file."""
+        result = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.startswith(".tmp-"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                result.append((stat.st_mtime, stat.st_size, path))
+        return result
+
+    def evict(self):
+        """Remove least-recently-used files until the cache fits in `max_bytes`."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        for _, _, path in self.entries():
+            os.remove(path)
+
+
+def main():
+    cache = ArtifactCache()
+    if sys.argv[1:] == ["clear"]:
+        cache.clear()
+        print(f"🧹 Cleared {cache.directory}")
+    else:
+        entries = cache.entries()
+        size_mb = sum(size for _, size, _ in entries) / 2 ** 20
+        print(f"🗃 {cache.directory}: {len(entries)} files, {size_mb:.1f} MB "
+              f"(limit {cache.max_bytes / 2 ** 20:.0f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Bulk schedule generation
+Reads a CSV or XLSX of parameter sets (one per employee or project), validates every row
+up front, generates them all on a worker pool and bundles the files into one ZIP
+
+Mode 1 rows give hours_per_week and days, Mode 2 rows give total_hours; start_week, seed,
+sessions_per_day and min_gap are optional. Used by the Streamlit app's Bulk tab.
+"""
+
+import argparse
+import collections
+import contextlib
+import csv
+import io
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from datetime import datetime
+
+import pandas as pd
+
+import generate_schedule_cli_copy as core
+from feasibility import check_schedule
+
+BULK_COLUMNS = ("filename", "start_date", "hours_per_week", "days", "total_hours", "start_week", "seed",
+                "sessions_per_day", "min_gap")
+BULK_FORMATS = ("txt", "xlsx", "docx", "jsonl", "ics")
+BULK_MAX_ROWS = 500
+TEMPLATE_CSV = ("filename,start_date,hours_per_week,days,total_hours,start_week,seed\n"
+                "alice,2024-01-08,10,60,,1,\n"
+                "bob,2024-01-08,,,120,1,42\n")
+
+
+def read_parameter_file(source, name):
+    """Read an uploaded or local .csv/.xlsx file into a DataFrame with normalised column names."""
+    extension = os.path.splitext(name)[1].lower()
+    if extension == ".csv":
+        frame = pd.read_csv(source, dtype=str)
+    elif extension == ".xlsx":
+        frame = pd.read_excel(source, dtype=object)
+    else:
+        raise ValueError(f"Unsupported parameter file: {name} (use .csv or .xlsx)")
+    frame.columns = [str(column).strip().lower() for column in frame.columns]
+    return frame
+
+
+def _cell(row, column):
+    """A cell's value, or None when the column is missing or the cell is empty."""
+    value = row.get(column)
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    return value
+
+
+def _number(row, column, default=None):
+    value = _cell(row, column)
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"'{column}' must be a number, not {value!r}.")
+
+
+def _whole_number(row, column, default=None):
+    value = _number(row, column, default)
+    if value is not None and value != int(value):
+        raise ValueError(f"'{column}' must be a whole number.")
+    return None if value is None else int(value)
+
+
+def _parse_row(row):
+    filename = _cell(row, "filename")
+    if filename is None:
+        raise ValueError("'filename' is required.")
+    filename = str(filename)
+    if "/" in filename or "\\" in filename or filename in (".", ".."):
+        raise ValueError(f"'filename' must be a plain name, not {filename!r}.")
+
+    start_date = _cell(row, "start_date")
+    if start_date is None:
+        raise ValueError("'start_date' (YYYY-MM-DD) is required.")
+    if hasattr(start_date, "strftime"):
+        start_date = start_date.strftime("%Y-%m-%d")
+    try:
+        datetime.strptime(str(start_date)[:10], "%Y-%m-%d")
+    except ValueError:
+        raise ValueError(f"'start_date' must be YYYY-MM-DD, not {start_date!r}.")
+
+    params = {
+        "filename": filename,
+        "start_date": str(start_date)[:10],
+        "start_week": _whole_number(row, "start_week", 1),
+        "seed": _whole_number(row, "seed"),
+        "sessions_per_day": _whole_number(row, "sessions_per_day", 1),
+        "min_gap": _whole_number(row, "min_gap", 30),
+    }
+
+    hours_per_week = _number(row, "hours_per_week")
+    total_hours = _number(row, "total_hours")
+    if (hours_per_week is None) == (total_hours is None):
+        raise ValueError("Give either 'hours_per_week' and 'days' (Mode 1) or 'total_hours' (Mode 2).")
+    if hours_per_week is not None:
+        days = _whole_number(row, "days")
+        request = {"hours_per_week": hours_per_week, "total_days": days}
+        params.update(mode="weekly", hours_per_week=hours_per_week, days=days)
+    else:
+        request = {"total_overall_hours": total_hours}
+        params.update(mode="total", total_hours=total_hours)
+    check = check_schedule(start_week=params["start_week"], sessions_per_day=params["sessions_per_day"],
+                           min_gap=params["min_gap"], **request)
+    if not check["ok"]:
+        raise ValueError(" ".join(reason["message"] for reason in check["reasons"]))
+    params["weeks"] = check["weeks"]
+    return params
+
+
+def validate_parameter_sets(frame):
+    """Check every row before anything is generated.
+
+    Returns (parameter sets, errors); errors read "Row N: ..." with N the
+    spreadsheet row (the header is row 1).
+    """
+    errors = []
+    missing = {"filename", "start_date"} - set(frame.columns)
+    if missing:
+        errors.append(f"Missing column(s): {', '.join(sorted(missing))}")
+    if "hours_per_week" not in frame.columns and "total_hours" not in frame.columns:
+        errors.append("Add 'hours_per_week' and 'days' columns (Mode 1) or a 'total_hours' column (Mode 2).")
+    unknown = set(frame.columns) - set(BULK_COLUMNS)
+    if unknown:
+        errors.append(f"Unknown column(s): {', '.join(sorted(unknown))}")
+    if len(frame) > BULK_MAX_ROWS:
+        errors.append(f"At most {BULK_MAX_ROWS} parameter sets can be generated at once.")
+    if errors:
+        return [], errors
+    if frame.empty:
+        return [], ["The file has no parameter sets."]
+
+    parameter_sets = []
+    seen = {}
+    for index, row in enumerate(frame.to_dict("records")):
+        row_number = index + 2
+        try:
+            params = _parse_row(row)
+        except ValueError as e:
+            errors.append(f"Row {row_number}: {e}")
+            continue
+        if params["filename"] in seen:
+            errors.append(f"Row {row_number}: filename {params['filename']!r} is already used in row "
+                          f"{seen[params['filename']]}.")
+            continue
+        seen[params["filename"]] = row_number
+        params["row"] = row_number
+        parameter_sets.append(params)
+    return parameter_sets, errors
+
+
+def generate_parameter_set(params, output_filename, formats, **options):
+    """Run generate_schedule or generate_schedule_total_hours for one validated parameter set.
+
+    `options` are passed on, e.g. progress, cancel_event, cache or store.
+    """
+    options.update({f"export_{fmt}": fmt in formats for fmt in core.EXPORT_FORMATS})
+    options.update(seed=params["seed"], sessions_per_day=params["sessions_per_day"], min_gap=params["min_gap"])
+    if params["mode"] == "weekly":
+        return core.generate_schedule(params["start_date"], params["hours_per_week"], params["days"],
+                                      output_filename, params["start_week"], **options)
+    return core.generate_schedule_total_hours(params["start_date"], params["total_hours"], output_filename,
+                                              params["start_week"], **options)
+
+
+class BulkJob:
+    """Generates a list of validated parameter sets on an executor, into one working directory"""
+
+    def __init__(self, parameter_sets, formats, cache=None):
+        self.parameter_sets = parameter_sets
+        self.formats = formats
+        self.cache = cache
+        self.directory = tempfile.mkdtemp(prefix="schedule-bulk-")
+        self.cancel_event = threading.Event()
+        self.weeks_done = [0] * len(parameter_sets)
+        self.weeks_total = sum(params["weeks"] for params in parameter_sets)
+        self.futures = []
+        self.zip_data = None
+        self.bundled = 0
+        self.bundle_error = None
+
+    def start(self, executor, max_in_flight=None):
+        """Submit the rows to `executor`, at most `max_in_flight` at a time (default: all at once).
+
+        Rows beyond the limit wait in the job rather than in the executor's
+        queue, so on a shared pool other users' generations are not stuck
+        behind hundreds of bulk rows. `futures` holds one future per row from
+        the start; a row still waiting here can be cancelled.
+        """
+        self.futures = [Future() for _ in self.parameter_sets]
+        waiting = collections.deque(enumerate(self.parameter_sets))
+        lock = threading.Lock()
+
+        def submit_next(_=None):
+            while True:
+                with lock:
+                    if not waiting:
+                        return
+                    index, params = waiting.popleft()
+                row = self.futures[index]
+                if not row.set_running_or_notify_cancel():
+                    continue
+                try:
+                    submitted = executor.submit(self._generate, index, params)
+                except RuntimeError as e:  # The executor has been shut down
+                    row.set_exception(e)
+                    continue
+                submitted.add_done_callback(lambda submitted: self._finish_row(row, submitted))
+                submitted.add_done_callback(submit_next)
+                return
+
+        for _ in range(min(max_in_flight or len(self.parameter_sets), len(self.parameter_sets))):
+            submit_next()
+        return self
+
+    @staticmethod
+    def _finish_row(row, submitted):
+        if submitted.cancelled():
+            row.set_exception(core.ScheduleCancelled("Schedule generation was cancelled."))
+        elif submitted.exception() is not None:
+            row.set_exception(submitted.exception())
+        else:
+            row.set_result(submitted.result())
+
+    def bundle_when_done(self):
+        """Once every row has finished, bundle the ZIP into `zip_data` and remove the working directory.
+
+        For callers that may go away before the job ends, such as a closed
+        browser tab: the files never outlive the job.
+        """
+        remaining = [len(self.futures)]
+        lock = threading.Lock()
+
+        def finished(future):
+            with lock:
+                remaining[0] -= 1
+                if remaining[0]:
+                    return
+            buffer = io.BytesIO()
+            try:
+                self.bundled = self.write_zip(buffer)
+                self.zip_data = buffer.getvalue()
+            except Exception as e:
+                self.bundle_error = str(e)
+            finally:
+                self.cleanup()
+
+        for future in self.futures:
+            future.add_done_callback(finished)
+        return self
+
+    @property
+    def bundled_or_failed(self):
+        return self.zip_data is not None or self.bundle_error is not None
+
+    def _generate(self, index, params):
+        if self.cancel_event.is_set():
+            raise core.ScheduleCancelled("Schedule generation was cancelled.")
+
+        def progress(weeks_done, weeks_total):
+            # Called from the worker thread; plain item writes are enough for polling
+            self.weeks_done[index] = weeks_done
+
+        return generate_parameter_set(params, os.path.join(self.directory, params["filename"]), self.formats,
+                                      progress=progress, cancel_event=self.cancel_event, cache=self.cache)
+
+    def cancel(self):
+        self.cancel_event.set()
+        for future in self.futures:
+            future.cancel()
+
+    @property
+    def fraction(self):
+        return sum(self.weeks_done) / self.weeks_total if self.weeks_total else 0.0
+
+    @property
+    def finished_count(self):
+        return sum(1 for future in self.futures if future.done())
+
+    def done(self):
+        return all(future.done() for future in self.futures)
+
+    def outcomes(self):
+        """(parameter set, result or None, error message or None) for every finished row."""
+        outcomes = []
+        for params, future in zip(self.parameter_sets, self.futures):
+            if future.cancelled():
+                outcomes.append((params, None, "Cancelled"))
+            elif future.done():
+                error = future.exception()
+                if error is None:
+                    outcomes.append((params, future.result(), None))
+                elif isinstance(error, core.ScheduleCancelled):
+                    outcomes.append((params, None, "Cancelled"))
+                else:
+                    outcomes.append((params, None, str(error)))
+        return outcomes
+
+    def write_zip(self, target):
+        """Write every generated file plus a summary.csv of seeds and totals into one ZIP archive.
+
+        Files are streamed from the working directory into the archive one by one.
+        Returns the number of schedules bundled.
+        """
+        summary = io.StringIO()
+        writer = csv.writer(summary)
+        writer.writerow(["row", "filename", "seed", "total_hours", "conflicts", "error"])
+        bundled = 0
+        with zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED) as bundle:
+            for params, result, error in self.outcomes():
+                if result is None:
+                    writer.writerow([params["row"], params["filename"], params["seed"], "", "", error])
+                    continue
+                for path in result["files"]:
+                    bundle.write(path, os.path.basename(path))
+                writer.writerow([params["row"], params["filename"], result["seed"],
+                                 f"{result['total_hours']:.2f}", result["conflicts"], ""])
+                bundled += 1
+            bundle.writestr("summary.csv", summary.getvalue())
+        return bundled
+
+    def cleanup(self):
+        """Remove the working directory with every generated file."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="🎀 Generate a schedule for every row of a parameter file")
+    parser.add_argument("parameters", help="CSV or XLSX file with one parameter set per row")
+    parser.add_argument("--formats", nargs="+", default=["txt", "xlsx", "docx"], choices=BULK_FORMATS)
+    parser.add_argument("--output", default="schedules.zip", help="ZIP archive to write")
+    parser.add_argument("--workers", type=int, default=4, help="Schedules generated at the same time")
+    args = parser.parse_args()
+
+    parameter_sets, errors = validate_parameter_sets(read_parameter_file(args.parameters, args.parameters))
+    if errors:
+        for error in errors:
+            print(f"❌ {error}")
+        sys.exit(1)
+
+    job = BulkJob(parameter_sets, args.formats)
+    try:
+        # The generator prints every schedule; keep the output to the summary below
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull), \
+                ThreadPoolExecutor(max_workers=args.workers) as executor:
+            job.start(executor)
+            wait(job.futures)
+        bundled = job.write_zip(args.output)
+    finally:
+        job.cleanup()
+    print(f"🗜 {bundled} of {len(parameter_sets)} schedules saved to: {args.output}")
+    for params, _, error in job.outcomes():
+        if error:
+            print(f"⚠️ Row {params['row']} ({params['filename']}): {error}")
+
+
+if __name__ == "__main__":
+    main()
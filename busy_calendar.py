@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Busy calendars for the schedule generator
+Imports existing commitments from .ics or CSV files so generated sessions avoid them
+
+Intervals are kept per date, merged and sorted, so checking a time range is a
+dictionary lookup plus a bisect no matter how many events were imported.
+"""
+
+import bisect
+import csv
+import hashlib
+import os
+import re
+import sys
+from datetime import datetime, time, timedelta, timezone
+
+import generate_schedule_cli_copy as core
+
+DURATION_RE = re.compile(r"^P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$")
+
+
+class BusyCalendar:
+    def __init__(self):
+        self.pending = {}    # date -> [(start minute, end minute)] not merged yet
+        self.intervals = {}  # date -> (starts, ends), merged and sorted
+
+    def add(self, start, end):
+        """Mark `start`–`end` (datetimes) as busy, splitting it at midnight where needed."""
+        while start < end:
+            midnight = datetime.combine(start.date() + timedelta(days=1), time())
+            piece_end = min(end, midnight)
+            end_minute = 24 * 60 if piece_end == midnight else piece_end.hour * 60 + piece_end.minute
+            self.pending.setdefault(start.date(), []).append((start.hour * 60 + start.minute, end_minute))
+            start = piece_end
+
+    def _day(self, date):
+        """Merged (starts, ends) lists for one date."""
+        if date in self.pending:
+            merged = []
+            existing = self.intervals.get(date, ((), ()))
+            for start, end in sorted(list(zip(*existing)) + self.pending.pop(date)):
+                if merged and start <= merged[-1][1]:
+                    merged[-1][1] = max(merged[-1][1], end)
+                else:
+                    merged.append([start, end])
+            self.intervals[date] = ([start for start, _ in merged], [end for _, end in merged])
+        return self.intervals.get(date, ((), ()))
+
+    def overlaps(self, date, start_minute, end_minute):
+        """Whether `start_minute`–`end_minute` on `date` overlaps any busy interval."""
+        starts, ends = self._day(date)
+        index = bisect.bisect_right(ends, start_minute)  # First interval ending after the start
+        return index < len(starts) and starts[index] < end_minute
+
+    def busy_slots(self, date):
+        """Bitmap of the 30-minute working slots (09:00–18:00) on `date` that touch a busy interval."""
+        starts, ends = self._day(date)
+        work_end = core.WORK_START + core.WORK_SLOTS * core.SLOT_MINUTES
+        bitmap = 0
+        for index in range(bisect.bisect_right(ends, core.WORK_START), len(starts)):
+            if starts[index] >= work_end:
+                break
+            first = max(0, (starts[index] - core.WORK_START) // core.SLOT_MINUTES)
+            last = min(core.WORK_SLOTS, -(-(ends[index] - core.WORK_START) // core.SLOT_MINUTES))
+            bitmap |= ((1 << (last - first)) - 1) << first
+        return bitmap
+
+    def intervals_on(self, date):
+        """Busy (start minute, end minute) pairs on `date`, merged and in time order."""
+        return list(zip(*self._day(date)))
+
+    def fingerprint(self):
+        """Stable hash of every busy interval, for cache keys."""
+        digest = hashlib.sha256()
+        for date in sorted(set(self.pending) | set(self.intervals)):
+            digest.update(f"{date}:{self.intervals_on(date)};".encode())
+        return digest.hexdigest()
+
+    def __len__(self):
+        return sum(len(self._day(date)[0]) for date in list(self.pending) + list(self.intervals))
+
+
+def _parse_ics_datetime(value, params):
+    if "VALUE=DATE" in params or len(value) == 8:
+        return datetime.strptime(value[:8], "%Y%m%d"), True
+    parsed = datetime.strptime(value.rstrip("Z")[:15], "%Y%m%dT%H%M%S")
+    if value.endswith("Z"):
+        # UTC times are converted to local wall-clock time, like the generated schedules
+        parsed = parsed.replace(tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+    return parsed, False
+
+
+def _parse_ics_duration(value):
+    match = DURATION_RE.match(value.lstrip("+"))
+    if not match:
+        raise ValueError(f"Unsupported DURATION: {value}")
+    weeks, days, hours, minutes, seconds = (int(part or 0) for part in match.groups())
+    return timedelta(weeks=weeks, days=days, hours=hours, minutes=minutes, seconds=seconds)
+
+
+def load_ics(path, calendar=None):
+    """Add every VEVENT of an iCalendar file to `calendar` (a new BusyCalendar by default).
+
+    Timezone parameters are ignored (times are taken as local wall-clock time) and
+    recurrence rules are not expanded.
+    """
+    if calendar is None:
+        calendar = BusyCalendar()
+    with open(path, encoding="utf-8") as f:
+        # Undo RFC 5545 line folding
+        text = re.sub(r"\r?\n[ \t]", "", f.read())
+
+    event = None
+    for line in text.splitlines():
+        if line == "BEGIN:VEVENT":
+            event = {}
+        elif line == "END:VEVENT" and event is not None:
+            if "DTSTART" in event:
+                start, all_day = _parse_ics_datetime(*event["DTSTART"])
+                if "DTEND" in event:
+                    end, _ = _parse_ics_datetime(*event["DTEND"])
+                elif "DURATION" in event:
+                    end = start + _parse_ics_duration(event["DURATION"][0])
+                else:
+                    end = start + timedelta(days=1) if all_day else start
+                calendar.add(start, end)
+            event = None
+        elif event is not None and ":" in line:
+            name, value = line.split(":", 1)
+            name, _, params = name.partition(";")
+            event[name.upper()] = (value.strip(), params.upper())
+    return calendar
+
+
+def load_csv(path, calendar=None):
+    """Add busy times from a CSV file to `calendar` (a new BusyCalendar by default).
+
+    Either `start,end` columns with full datetimes ("2024-01-08 10:00"), or
+    `date,start,end` columns with a YYYY-MM-DD date and HH:MM times.
+    """
+    if calendar is None:
+        calendar = BusyCalendar()
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            if row.get("date"):
+                day = datetime.strptime(row["date"].strip(), "%Y-%m-%d")
+                start = day + timedelta(minutes=core.time_to_minutes(row["start"].strip()))
+                end = day + timedelta(minutes=core.time_to_minutes(row["end"].strip()))
+            else:
+                start = datetime.fromisoformat(row["start"].strip())
+                end = datetime.fromisoformat(row["end"].strip())
+            calendar.add(start, end)
+    return calendar
+
+
+def load_busy_calendar(paths):
+    """Load .ics and .csv files into one BusyCalendar."""
+    calendar = BusyCalendar()
+    for path in paths:
+        extension = os.path.splitext(path)[1].lower()
+        if extension == ".ics":
+            load_ics(path, calendar)
+        elif extension == ".csv":
+            load_csv(path, calendar)
+        else:
+            raise ValueError(f"Unsupported busy calendar file: {path} (use .ics or .csv)")
+    return calendar
+
+
+def main():
+    if len(sys.argv) < 3:
+        print("Usage: busy_calendar.py YYYY-MM-DD FILE [FILE ...]")
+        sys.exit(1)
+    calendar = load_busy_calendar(sys.argv[2:])
+    date = datetime.strptime(sys.argv[1], "%Y-%m-%d").date()
+    print(f"📆 {len(calendar)} busy intervals loaded")
+    for start, end in calendar.intervals_on(date):
+        print(f"   {date} {start // 60:02d}:{start % 60:02d}–{end // 60:02d}:{end % 60:02d}")
+
+
+if __name__ == "__main__":
+    main()
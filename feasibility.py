@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Feasibility pre-check shared by the CLI, the Tkinter GUI, the Streamlit app and the HTTP service
+Decides in constant time whether a schedule request can be generated, before any work starts
+
+The check works on the same rounded weekly minutes as the generator: every week needs
+30–900 minutes, and the last day of a short final week, which takes that week's
+shortfall, must still fit between 09:00 and 18:00. Reasons come back as dicts with a
+code, the offending field and a message.
+"""
+
+import math
+import sys
+
+import generate_schedule_cli_copy as core
+
+MIN_WEEKLY_MINUTES = 30
+MAX_WEEKLY_MINUTES = 15 * 60
+MAX_DAY_MINUTES = 120
+DAY_WINDOW_MINUTES = core.WORK_SLOTS * core.SLOT_MINUTES
+
+
+class InfeasibleRequest(ValueError):
+    """Raised by `require_feasible`; `reasons` holds the structured reasons."""
+
+    def __init__(self, reasons):
+        self.reasons = reasons
+        super().__init__(" ".join(reason["message"] for reason in reasons))
+
+    def __reduce__(self):
+        # Keep the reasons when the error crosses a process boundary
+        return InfeasibleRequest, (self.reasons,)
+
+
+def _reason(code, field, message):
+    return {"code": code, "field": field, "message": message}
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def _first_days_units(units, days):
+    """Fewest and most 30-minute units `split_weekly_minutes` can give `days` of a week's days.
+
+    Units are dealt to the seven days round-robin in random order, one per
+    day (up to 4) per round, so the days differ by at most one unit.
+    """
+    if units < 7:
+        return max(0, days - (7 - units)), min(days, units)
+    rounds, extra = divmod(units - 7, 7)
+    base = 1 + rounds
+    if base >= MAX_DAY_MINUTES // 30:
+        return days * (MAX_DAY_MINUTES // 30), days * (MAX_DAY_MINUTES // 30)
+    return base * days + max(0, extra - (7 - days)), base * days + min(extra, days)
+
+
+def _check_short_week(minutes_per_week, total_days):
+    """Reasons why the short final week cannot fit, and warnings when it only might not."""
+    days = total_days % 7
+    if days == 0:
+        return [], []
+    fewest_units, most_units = _first_days_units(minutes_per_week // 30, days - 1)
+    fewest = minutes_per_week - most_units * 30
+    most = minutes_per_week - fewest_units * 30
+    message = (f"The last week has only {days} day(s), so its last day takes the rest of the "
+               f"{minutes_per_week // 60}h {minutes_per_week % 60}m week")
+    if fewest > DAY_WINDOW_MINUTES:
+        return [_reason("short_week_overflow", "total_days",
+                        f"{message} - at least {fewest} minutes, more than fits between 09:00 and 18:00. "
+                        "Add or remove a few days, or lower the weekly hours.")], []
+    if most > DAY_WINDOW_MINUTES:
+        return [], [_reason("short_week_may_overflow", "total_days",
+                            f"{message} - up to {most} minutes, which may run past 18:00.")]
+    return [], []
+
+
+def check_schedule(hours_per_week=None, total_days=None, total_overall_hours=None, start_week=1,
+                   sessions_per_day=1, min_gap=30):
+    """Check a Mode 1 (`hours_per_week` and `total_days`) or Mode 2 (`total_overall_hours`) request.
+
+    Returns a dict with "ok", "reasons" and "warnings" (lists of dicts with
+    "code", "field" and "message") and, when ok, the plan the generator will
+    use: "hours_per_week", "minutes_per_week", "total_days" and "weeks".
+    """
+    reasons = []
+    if not _is_number(start_week) or start_week < 1 or start_week != int(start_week):
+        reasons.append(_reason("start_week", "start_week", "The starting week must be a whole number of at least 1."))
+    if not _is_number(sessions_per_day) or sessions_per_day < 1 or sessions_per_day != int(sessions_per_day):
+        reasons.append(_reason("sessions_per_day", "sessions_per_day",
+                               "Sessions per day must be a whole number of at least 1."))
+    if not _is_number(min_gap) or min_gap < 0:
+        reasons.append(_reason("min_gap", "min_gap", "The minimum gap between sessions cannot be negative."))
+
+    if total_overall_hours is not None:
+        if not _is_number(total_overall_hours) or total_overall_hours < MIN_WEEKLY_MINUTES / 60:
+            reasons.append(_reason("total_hours_too_low", "total_overall_hours",
+                                   "Total overall hours must be at least 0.5."))
+        else:
+            _, hours_per_week, total_days = core.plan_total_hours(total_overall_hours)
+        field = "total_overall_hours"
+    else:
+        if not _is_number(total_days) or total_days < 1 or total_days != int(total_days):
+            reasons.append(_reason("total_days", "total_days", "Total days must be a whole number of at least 1."))
+        if not _is_number(hours_per_week):
+            reasons.append(_reason("hours_per_week", "hours_per_week", "Weekly hours must be a number."))
+        field = "hours_per_week"
+
+    if reasons:
+        return {"ok": False, "reasons": reasons, "warnings": []}
+
+    total_days = int(total_days)
+    minutes_per_week = round(hours_per_week * 60 / 30) * 30  # Same rounding as render_schedule
+    warnings = []
+    if minutes_per_week < MIN_WEEKLY_MINUTES:
+        reasons.append(_reason("weekly_hours_too_low", field,
+                               "Weekly hours must be at least 0.5 (30 minutes) after rounding to 30 minutes."))
+    elif minutes_per_week > MAX_WEEKLY_MINUTES:
+        reasons.append(_reason("weekly_hours_too_high", field, "Weekly hours cannot exceed 15."))
+    else:
+        reasons, warnings = _check_short_week(minutes_per_week, total_days)
+    if not reasons and total_overall_hours is not None:
+        planned_hours = minutes_per_week * ((total_days + 6) // 7) / 60
+        if abs(planned_hours - total_overall_hours) >= 0.5:
+            warnings.append(_reason("total_rounded", "total_overall_hours",
+                                    f"Weekly hours are rounded to 30 minutes, so the schedule totals "
+                                    f"{planned_hours:.2f} hours instead of {total_overall_hours:.2f}."))
+
+    result = {"ok": not reasons, "reasons": reasons, "warnings": warnings}
+    if not reasons:
+        result.update(hours_per_week=hours_per_week, minutes_per_week=minutes_per_week, total_days=total_days,
+                      weeks=(total_days + 6) // 7)
+    return result
+
+
+def require_feasible(**request):
+    """`check_schedule(**request)`, raising InfeasibleRequest when the request cannot be generated."""
+    result = check_schedule(**request)
+    if not result["ok"]:
+        raise InfeasibleRequest(result["reasons"])
+    return result
+
+
+def main():
+    if len(sys.argv) != 3:
+        print("Usage: feasibility.py HOURS_PER_WEEK TOTAL_DAYS")
+        sys.exit(1)
+    result = check_schedule(float(sys.argv[1]), int(sys.argv[2]))
+    for reason in result["reasons"]:
+        print(f"❌ [{reason['code']}] {reason['message']}")
+    for warning in result["warnings"]:
+        print(f"⚠️ [{warning['code']}] {warning['message']}")
+    if result["ok"]:
+        print(f"✅ {result['weeks']} weeks of {result['minutes_per_week']} minutes can be generated")
+    sys.exit(0 if result["ok"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,28 @@
 import pandas as pd
+import argparse
+import collections
+import contextlib
+import functools
+import hashlib
+import json
+import multiprocessing
+import os
 import random
-from datetime import datetime, timedelta
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
 from docx import Document
 from docx.shared import Inches
 
+class ScheduleCancelled(Exception):
+    """Raised when a generation is cancelled through its cancel event."""
+
 def get_monday(date_str):
     date = datetime.strptime(date_str, "%Y-%m-%d")
     return date - timedelta(days=date.weekday())
 
-def split_weekly_minutes(total_minutes):
+def split_weekly_minutes(total_minutes, rng=random):
     """Safely split total weekly minutes across 7 days with 30–120 min/day using 30-min units."""
     min_day = 30
     max_day = 120
@@ -26,7 +40,7 @@ def split_weekly_minutes(total_minutes):
     # Step 1: Start with 0 for all days
     result = [0] * 7
     day_indices = list(range(7))
-    random.shuffle(day_indices)
+    rng.shuffle(day_indices)
 
     # Step 2: Pre-fill with min 30 mins per day until used or out of budget
     remaining = total_minutes
@@ -43,7 +57,7 @@ def split_weekly_minutes(total_minutes):
     
     while remaining >= unit and attempts < max_attempts:
         attempts += 1
-        random.shuffle(day_indices)
+        rng.shuffle(day_indices)
         distributed_this_round = False
         
         for i in day_indices:
@@ -68,8 +82,12 @@ def split_weekly_minutes(total_minutes):
 
     return result
 
-def random_start_time(duration_min):
-    """Generate a random time between 09:00 and 18:00 that fits the session, aligned to :00 or :30."""
+def random_start_time(duration_min, rng=random, busy=0):
+    """Generate a random time between 09:00 and 18:00 that fits the session, aligned to :00 or :30.
+
+    `busy` is a bitmap of the 30-minute slots from 09:00 that are already
+    taken (see `place_sessions`); only starts clear of them are chosen.
+    """
     earliest_start = 9 * 60
     latest_start = 18 * 60 - duration_min
 
@@ -77,191 +95,918 @@ def random_start_time(duration_min):
         raise ValueError(f"Duration {duration_min} min too long to fit within working hours (09:00–18:00).")
 
     valid_slots = [t for t in range(earliest_start, latest_start + 1, 30)]
+    if busy:
+        block = (1 << -(-duration_min // 30)) - 1
+        valid_slots = [t for t in valid_slots if not (busy >> ((t - earliest_start) // 30)) & block]
+        if not valid_slots:
+            raise ValueError(f"No free slot of {duration_min} minutes between the busy times.")
     if not valid_slots:
         raise ValueError(f"No valid slots found for {duration_min} minutes between 09:00 and 18:00.")
 
-    start_min = random.choice(valid_slots)
+    start_min = rng.choice(valid_slots)
     hour = start_min // 60
     minute = start_min % 60
     return f"{hour:02d}:{minute:02d}"
 
-def generate_schedule(any_date_str, total_hours_per_week, total_days, output_filename, start_week, 
-                     export_txt=True, export_xlsx=True, export_docx=True):
-    start_date = get_monday(any_date_str)
-    total_minutes_per_week = round(total_hours_per_week * 60 / 30) * 30  # Round to 30-minute units
-    weekdays = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+# Working window for split shifts, as a bitmap of 30-minute slots from 09:00 to 18:00
+WORK_START = 9 * 60
+SLOT_MINUTES = 30
+WORK_SLOTS = (18 * 60 - WORK_START) // SLOT_MINUTES
+ALL_SLOTS = (1 << WORK_SLOTS) - 1
 
-    text_lines = []
-    excel_data = []
-    docx_data = []  # For .docx table format
-    current_date = start_date
-    end_date = start_date + timedelta(days=total_days - 1)
-    week_num = start_week - 1
-    total_minutes_accumulated = 0
+def split_day_minutes(minutes, sessions_per_day, min_gap, rng=random):
+    """Split one day's minutes into up to `sessions_per_day` sessions of at least 30 minutes.
 
-    while current_date <= end_date:
-        week_num += 1
-        week_start = current_date
-        week_end = min(current_date + timedelta(days=6), end_date)
-        text_lines.append(f"Week {week_num}: {week_start.strftime('%d %B')} – {week_end.strftime('%d %B')}")
+    Fewer sessions are used when the day is too short, or when the sessions and
+    the gaps between them would not fit between 09:00 and 18:00.
+    """
+    units = minutes // SLOT_MINUTES
+    gap_units = -(-min_gap // SLOT_MINUTES)
+    count = max(1, min(sessions_per_day, units))
+    while count > 1 and units + gap_units * (count - 1) > WORK_SLOTS:
+        count -= 1
+    if count == 1:
+        return [minutes]
 
-        # Generate daily work minutes
-        week_minutes = split_weekly_minutes(total_minutes_per_week)
-        
-        # Collect weekly schedule details for .docx table
-        week_schedule_details = []
-
-        # Adjust to fit remaining days if not a full week
-        days_in_this_week = min(7, (end_date - current_date).days + 1)
-        current_sum = sum(week_minutes[:days_in_this_week])
-        difference = total_minutes_per_week - current_sum
-        week_minutes[days_in_this_week - 1] += difference
-        total_minutes_accumulated += sum(week_minutes[:days_in_this_week])
-
-        for i in range(days_in_this_week):
-            minutes = week_minutes[i]
-            if minutes == 0:
-                current_date += timedelta(days=1)
-                continue
-
-            hours = minutes // 60
-            mins = minutes % 60
+    # Random cut points between 30-minute units; any odd remainder goes to the last session
+    cuts = sorted(rng.sample(range(1, units), count - 1))
+    bounds = [0] + cuts + [units]
+    sessions = [(end - start) * SLOT_MINUTES for start, end in zip(bounds, bounds[1:])]
+    sessions[-1] += minutes - units * SLOT_MINUTES
+    return sessions
+
+def _reserve_slots(free, start, length, gap_units):
+    """Clear a session's slots, plus the minimum gap on both sides, from a free-slot bitmap."""
+    low = max(0, start - gap_units)
+    high = min(WORK_SLOTS, start + length + gap_units)
+    return free & ~(((1 << (high - low)) - 1) << low)
+
+@functools.lru_cache(maxsize=65536)
+def _can_fit(lengths, free, gap_units):
+    """Whether sessions of `lengths` slots (a tuple, longest first) can all be placed in `free`.
+
+    Tries every free start for the first session and backtracks over the rest;
+    a greedy earliest-start pass rejects days that do fit. A day has only 18
+    slots, and results are cached by the bitmap that is left, so this stays cheap.
+    """
+    if not lengths:
+        return True
+    length, rest = lengths[0], lengths[1:]
+    block = (1 << length) - 1
+    return any(
+        _can_fit(rest, _reserve_slots(free, start, length, gap_units), gap_units)
+        for start in range(WORK_SLOTS - length + 1) if (free >> start) & block == block
+    )
+
+def place_sessions(session_minutes, min_gap, rng=random, busy=0, choose=None):
+    """Choose non-overlapping start times for one day's sessions.
+
+    Free time is a bitmap of the 30-minute slots between 09:00 and 18:00, with
+    `busy` marking slots that are already taken. Each session draws its start
+    from the free positions that still leave room for the sessions after it,
+    so placement never retries. `choose(candidates, length)` can replace the
+    random pick, e.g. to favour slots nobody else covers. Returns the
+    sessions in time order as dicts with start, end and minutes; raises
+    ValueError if they cannot fit.
+    """
+    gap_units = -(-min_gap // SLOT_MINUTES)
+    lengths = [-(-minutes // SLOT_MINUTES) for minutes in session_minutes]
+    free = ALL_SLOTS & ~busy
+    placed = []
+    for index, length in enumerate(lengths):
+        block = (1 << length) - 1
+        rest = tuple(sorted(lengths[index + 1:], reverse=True))
+        candidates = [
+            start for start in range(WORK_SLOTS - length + 1)
+            if (free >> start) & block == block
+            and _can_fit(rest, _reserve_slots(free, start, length, gap_units), gap_units)
+        ]
+        if not candidates:
+            raise ValueError(f"Sessions of {session_minutes} min do not fit between 09:00 and 18:00.")
+        start = rng.choice(candidates) if choose is None else choose(candidates, length)
+        free = _reserve_slots(free, start, length, gap_units)
+        placed.append((start, session_minutes[index]))
+
+    sessions = []
+    for start, minutes in sorted(placed):
+        start_min = WORK_START + start * SLOT_MINUTES
+        sessions.append({
+            "start": f"{start_min // 60:02d}:{start_min % 60:02d}",
+            "end": f"{(start_min + minutes) // 60:02d}:{(start_min + minutes) % 60:02d}",
+            "minutes": minutes,
+        })
+    return sessions
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+TRAILER_RULE = "=============================="
+
+def format_minutes(minutes):
+    """Format minutes as the "1h 30m" string used in every export."""
+    return f"{minutes // 60}h {minutes % 60}m"
+
+def parse_minutes(time_str):
+    """Parse a "1h 30m" string back into minutes."""
+    hours, mins = time_str.replace("h", "").replace("m", "").split()
+    return int(hours) * 60 + int(mins)
+
+def plan_week_minutes(total_minutes_per_week, days_in_week, rng=random):
+    """Minutes per day for one (possibly partial) week, summing to the weekly total.
+
+    A partial week gets its shortfall added to its last day.
+    """
+    week_minutes = split_weekly_minutes(total_minutes_per_week, rng)
+    week_minutes[days_in_week - 1] += total_minutes_per_week - sum(week_minutes[:days_in_week])
+    return week_minutes[:days_in_week]
+
+def day_time_slots(day):
+    """The "09:00–10:00, 13:00–14:00" time slot text of one day."""
+    return ", ".join(f"{session['start']}–{session['end']}" for session in day["sessions"])
+
+def week_rng(seed, week_index):
+    """Random stream for week `week_index` (0-based) of a run with `seed`.
+
+    Derived by hashing (seed, week index), so any week can be generated on
+    its own, in any order or process, and still match a sequential run.
+    """
+    digest = hashlib.sha256(f"{seed}:{week_index}".encode()).digest()
+    return random.Random(int.from_bytes(digest[:8], "big"))
+
+def schedule_week(start_date, total_minutes_per_week, total_days, start_week, week_index, rng=random,
+                  sessions_per_day=1, min_gap=30, busy=None):
+    """Generate week `week_index` (0-based) of a schedule, as yielded by `iter_schedule_weeks`."""
+    week_start = start_date + timedelta(days=7 * week_index)
+    # Generate daily work minutes, adjusted to fit the remaining days if not a full week
+    days_in_this_week = min(7, total_days - 7 * week_index)
+    week_minutes = plan_week_minutes(total_minutes_per_week, days_in_this_week, rng)
+
+    days = []
+    for i in range(days_in_this_week):
+        minutes = week_minutes[i]
+        if minutes == 0:
+            continue
+
+        current_date = week_start + timedelta(days=i)
+        day_busy = busy.busy_slots(current_date.date()) if busy is not None else 0
+        conflict = False
+        sessions = None
+        if sessions_per_day > 1:
+            session_minutes = split_day_minutes(minutes, sessions_per_day, min_gap, rng)
+            if len(session_minutes) > 1:
+                try:
+                    sessions = place_sessions(session_minutes, min_gap, rng, day_busy)
+                except ValueError:
+                    pass  # Try a single session instead
+        if sessions is None:
             try:
-                start_time = random_start_time(minutes)
-                end_time = (datetime.strptime(start_time, "%H:%M") + timedelta(minutes=minutes)).strftime("%H:%M")
+                start_time = random_start_time(minutes, rng, day_busy)
             except ValueError:
-                start_time = "09:00"
-                end_time = (datetime.strptime(start_time, "%H:%M") + timedelta(minutes=minutes)).strftime("%H:%M")
-
-            date_str = current_date.strftime("%d %b %Y")
-            weekday = weekdays[current_date.weekday()]
-            time_str = f"{hours}h {mins}m"
-            text_lines.append(f"{date_str} ({weekday}) - {time_str} | {start_time}–{end_time}")
-            excel_data.append({
-                "Week": f"Week {week_num}",
-                "Date": date_str,
-                "Day": weekday,
-                "Work Time": time_str,
-                "Time Slot": f"{start_time}–{end_time}"
-            })
-            
-            # Collect for .docx table
-            week_schedule_details.append(f"{date_str} ({weekday}): {time_str} | {start_time}–{end_time}")
-            current_date += timedelta(days=1)
-
-        text_lines.append(f"Total hours this week: {total_hours_per_week:.2f}h\n")
-        
-        # Add weekly data to .docx table - all days in one row per week
-        # Extract date and time parts for each column
-        date_parts = []
-        schedule_times = []
-        hours_parts = []
-        
-        for day_detail in week_schedule_details:
-            # Format: "15 Jan 2024 (Monday): 1h 25m | 13:00–14:25"
-            parts = day_detail.split(": ")
-            date_part = parts[0]  # "15 Jan 2024 (Monday)"
-            time_part = parts[1].split(" | ")[1]  # "13:00–14:25"
-            hours_part = parts[1].split(" | ")[0]  # "1h 25m"
-            
-            date_parts.append(date_part)
-            schedule_times.append(time_part)
-            hours_parts.append(hours_part)
-        
-        docx_data.append({
-            "Week": f"Week {week_num}",
-            "Date": "\n".join(date_parts),
-            "Schedule": "\n".join(schedule_times),
-            "Hours": "\n".join(hours_parts)
-        })
+                conflict = bool(day_busy)
+                try:
+                    start_time = random_start_time(minutes, rng)
+                except ValueError:
+                    start_time = "09:00"
+            end_time = (datetime.strptime(start_time, "%H:%M") + timedelta(minutes=minutes)).strftime("%H:%M")
+            sessions = [{"start": start_time, "end": end_time, "minutes": minutes}]
+
+        day = {
+            "date": current_date,
+            "weekday": WEEKDAYS[current_date.weekday()],
+            "minutes": minutes,
+            "start": sessions[0]["start"],
+            "end": sessions[-1]["end"],
+            "sessions": sessions,
+        }
+        if conflict:
+            day["conflict"] = True
+        days.append(day)
+
+    return {
+        "week": start_week + week_index,
+        "start": week_start,
+        "end": week_start + timedelta(days=days_in_this_week - 1),
+        "minutes": sum(week_minutes),
+        "days": days,
+    }
+
+# Weeks handed to a worker process at a time when generating in parallel
+PARALLEL_CHUNK_WEEKS = 52
+# Below this many weeks starting worker processes costs more than it saves
+PARALLEL_MIN_WEEKS = 520
+
+_week_worker_args = None
+
+def _init_week_worker(args):
+    global _week_worker_args
+    _week_worker_args = args
+
+def _schedule_week_chunk(first_index, count):
+    start_date, total_minutes_per_week, total_days, start_week, seed, sessions_per_day, min_gap, busy = \
+        _week_worker_args
+    return [schedule_week(start_date, total_minutes_per_week, total_days, start_week, index,
+                          week_rng(seed, index), sessions_per_day, min_gap, busy)
+            for index in range(first_index, first_index + count)]
+
+def default_workers(total_days):
+    """Worker processes to use for a schedule of `total_days`: every core for long horizons."""
+    if (total_days + 6) // 7 < PARALLEL_MIN_WEEKS:
+        return 1
+    return os.cpu_count() or 1
+
+def iter_schedule_weeks(start_date, total_minutes_per_week, total_days, start_week, rng=random,
+                        sessions_per_day=1, min_gap=30, busy=None, seed=None, workers=1):
+    """Yield one dict per week with its number, date range and worked days.
+
+    Each day is a dict with the date, weekday, minutes, its sessions and the
+    start/end times of its first and last session. With `sessions_per_day`
+    above 1 a day's minutes are split into up to that many sessions at least
+    `min_gap` minutes apart. Days that end up with zero minutes are skipped,
+    as in the exports.
 
-    total_hours_final = total_minutes_accumulated / 60
-    text_lines.append("==============================")
-    text_lines.append(f"Total work time: {total_hours_final:.2f} hours")
-    text_lines.append("==============================")
+    `busy` is a `BusyCalendar` of existing commitments that sessions avoid.
+    A day with no free window long enough keeps a clashing slot and is
+    marked with "conflict".
 
-    excel_data.append({
+    With a `seed`, every week draws from its own `week_rng(seed, index)`
+    instead of `rng`, and `workers` above 1 generates chunks of weeks in
+    that many processes. The weeks are identical either way.
+    """
+    weeks_total = (total_days + 6) // 7
+    if seed is None or workers <= 1 or weeks_total <= PARALLEL_CHUNK_WEEKS:
+        for index in range(weeks_total):
+            week_random = rng if seed is None else week_rng(seed, index)
+            yield schedule_week(start_date, total_minutes_per_week, total_days, start_week, index, week_random,
+                                sessions_per_day, min_gap, busy)
+        return
+
+    args = (start_date, total_minutes_per_week, total_days, start_week, seed, sessions_per_day, min_gap, busy)
+    chunks = collections.deque(range(0, weeks_total, PARALLEL_CHUNK_WEEKS))
+    pending = collections.deque()
+    # Spawned, not forked: callers such as the web app's worker threads may hold locks that a
+    # forked child would inherit in their locked state
+    executor = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"),
+                                   initializer=_init_week_worker, initargs=(args,))
+    try:
+        while chunks or pending:
+            # Keep a couple of chunks per worker in flight so memory stays bounded
+            while chunks and len(pending) < 2 * workers:
+                first_index = chunks.popleft()
+                count = min(PARALLEL_CHUNK_WEEKS, weeks_total - first_index)
+                pending.append(executor.submit(_schedule_week_chunk, first_index, count))
+            yield from pending.popleft().result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def week_text_lines(week, total_hours_per_week):
+    """Text lines for one week, including the weekly total line."""
+    lines = [f"Week {week['week']}: {week['start'].strftime('%d %B')} – {week['end'].strftime('%d %B')}"]
+    for day in week["days"]:
+        lines.append(f"{day['date'].strftime('%d %b %Y')} ({day['weekday']}) - "
+                     f"{format_minutes(day['minutes'])} | {day_time_slots(day)}")
+    lines.append(f"Total hours this week: {total_hours_per_week:.2f}h\n")
+    return lines
+
+def week_excel_rows(week):
+    """Excel rows (one per worked day) for one week."""
+    return [{
+        "Week": f"Week {week['week']}",
+        "Date": day["date"].strftime("%d %b %Y"),
+        "Day": day["weekday"],
+        "Work Time": format_minutes(day["minutes"]),
+        "Time Slot": day_time_slots(day)
+    } for day in week["days"]]
+
+def week_docx_row(week):
+    """The single .docx table row for one week - all days in one row."""
+    return {
+        "Week": f"Week {week['week']}",
+        "Date": "\n".join(f"{day['date'].strftime('%d %b %Y')} ({day['weekday']})" for day in week["days"]),
+        "Schedule": "\n".join(day_time_slots(day) for day in week["days"]),
+        "Hours": "\n".join(format_minutes(day["minutes"]) for day in week["days"])
+    }
+
+def text_trailer_lines(total_hours):
+    return [TRAILER_RULE, f"Total work time: {total_hours:.2f} hours", TRAILER_RULE]
+
+def excel_total_row(total_hours):
+    return {
         "Week": "",
         "Date": "",
         "Day": "Total work time (hours)",
-        "Work Time": f"{total_hours_final:.2f}",
+        "Work Time": f"{total_hours:.2f}",
         "Time Slot": ""
-    })
+    }
 
-    # Output
-    created_files = []
-    
-    if export_txt:
-        txt_file = f"{output_filename}.txt"
-        with open(txt_file, "w") as f:
-            f.write("\n".join(text_lines))
-        created_files.append(txt_file)
-    
-    if export_xlsx:
-        xlsx_file = f"{output_filename}.xlsx"
-        pd.DataFrame(excel_data).to_excel(xlsx_file, index=False)
-        created_files.append(xlsx_file)
-    
-    if export_docx:
-        docx_file = f"{output_filename}.docx"
-        # Create .docx table
-        doc = Document()
-        doc.add_heading('Weekly Work Schedule', 0)
-        
-        # Create table
-        table = doc.add_table(rows=1, cols=4)
-        table.style = 'Table Grid'
-        
-        # Add header row
-        header_cells = table.rows[0].cells
-        header_cells[0].text = 'Week'
-        header_cells[1].text = 'Date'
-        header_cells[2].text = 'Schedule'
-        header_cells[3].text = 'Hours'
-        
-        # Add data rows
-        for week_data in docx_data:
-            row_cells = table.add_row().cells
-            row_cells[0].text = week_data['Week']
-            row_cells[1].text = week_data['Date']
-            row_cells[2].text = week_data['Schedule']
-            row_cells[3].text = week_data['Hours']
-        
-        # Add total row
-        total_row = table.add_row().cells
-        total_row[0].text = ''
-        total_row[1].text = ''
-        total_row[2].text = 'Total work time (hours)'
-        total_row[3].text = f"{total_hours_final:.2f}"
-        
-        # Set column widths
-        for row in table.rows:
-            row.cells[0].width = Inches(1.0)  # Week
-            row.cells[1].width = Inches(2.5)  # Date (more space for individual days)
-            row.cells[2].width = Inches(2.5)  # Schedule (time ranges)
-            row.cells[3].width = Inches(1.0)  # Hours
-        
-        doc.save(docx_file)
-        created_files.append(docx_file)
+def set_docx_row_widths(row):
+    row.cells[0].width = Inches(1.0)  # Week
+    row.cells[1].width = Inches(2.5)  # Date (more space for individual days)
+    row.cells[2].width = Inches(2.5)  # Schedule (time ranges)
+    row.cells[3].width = Inches(1.0)  # Hours
 
-    print(f"\n✅ Schedule created from {start_date.strftime('%Y-%m-%d')} for {total_days} days.")
+def add_docx_rows(table, docx_data, total_hours):
+    """Append week rows and the total row to a schedule table, then fix column widths."""
+    first_new_row = len(table.rows)
+    for week_data in docx_data:
+        row_cells = table.add_row().cells
+        row_cells[0].text = week_data['Week']
+        row_cells[1].text = week_data['Date']
+        row_cells[2].text = week_data['Schedule']
+        row_cells[3].text = week_data['Hours']
+
+    # Add total row
+    total_row = table.add_row().cells
+    total_row[0].text = ''
+    total_row[1].text = ''
+    total_row[2].text = 'Total work time (hours)'
+    total_row[3].text = f"{total_hours:.2f}"
+
+    # Set column widths on the rows just added
+    for row in table.rows[first_new_row:]:
+        set_docx_row_widths(row)
+
+def open_output(target):
+    """Open a path for binary writing, or pass an already open binary file object through.
+
+    A callable target is called to open the output lazily, e.g. a ZIP archive entry.
+    """
+    if hasattr(target, "write"):
+        return contextlib.nullcontext(target)
+    if callable(target):
+        return target()
+    return open(target, "wb")
+
+def write_txt(text_lines, target):
+    with open_output(target) as f:
+        f.write("\n".join(text_lines).encode("utf-8"))
+
+def write_xlsx(excel_data, target):
+    with open_output(target) as f:
+        pd.DataFrame(excel_data).to_excel(f, index=False)
+
+def write_docx(docx_data, total_hours, target):
+    # Create .docx table
+    doc = Document()
+    doc.add_heading('Weekly Work Schedule', 0)
+
+    # Create table
+    table = doc.add_table(rows=1, cols=4)
+    table.style = 'Table Grid'
+
+    # Add header row
+    header_cells = table.rows[0].cells
+    header_cells[0].text = 'Week'
+    header_cells[1].text = 'Date'
+    header_cells[2].text = 'Schedule'
+    header_cells[3].text = 'Hours'
+    set_docx_row_widths(table.rows[0])
+
+    add_docx_rows(table, docx_data, total_hours)
+    with open_output(target) as f:
+        doc.save(f)
+
+ARROW_COLUMNS = ("date", "weekday", "minutes", "start_minute", "end_minute", "week")
+
+def time_to_minutes(time_str):
+    """Convert an "HH:MM" string to minutes after midnight."""
+    hour, minute = time_str.split(":")
+    return int(hour) * 60 + int(minute)
+
+def week_arrow_columns(week, columns):
+    """Append one week's work sessions to the typed column lists used for the Arrow export."""
+    for day in week["days"]:
+        for session in day["sessions"]:
+            start_minute = time_to_minutes(session["start"])
+            columns["date"].append(day["date"].date())
+            columns["weekday"].append(day["date"].weekday())
+            columns["minutes"].append(session["minutes"])
+            columns["start_minute"].append(start_minute)
+            columns["end_minute"].append(start_minute + session["minutes"])
+            columns["week"].append(week["week"])
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("Arrow export needs pyarrow. Install it with: pip install pyarrow")
+    return pyarrow
+
+def write_arrow(columns, target):
+    """Write the schedule as an uncompressed Arrow IPC file with typed columns.
+
+    There is one row per work session. weekday is 0 for Monday;
+    start_minute/end_minute are minutes after midnight.
+    """
+    pa = _import_pyarrow()
+    schema = pa.schema([
+        ("date", pa.date32()),
+        ("weekday", pa.int8()),
+        ("minutes", pa.int16()),
+        ("start_minute", pa.int16()),
+        ("end_minute", pa.int16()),
+        ("week", pa.int32()),
+    ])
+    table = pa.table({name: columns[name] for name in ARROW_COLUMNS}, schema=schema)
+    with open_output(target) as sink:
+        with pa.ipc.new_file(sink, schema) as writer:
+            writer.write_table(table)
+
+def read_arrow(path):
+    """Load an Arrow schedule file as a pyarrow Table backed by a memory map (zero-copy).
+
+    Call `.to_pandas()` on the result for a DataFrame.
+    """
+    pa = _import_pyarrow()
+    return pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+
+class ExportSink:
+    """Base class for an export format, fed the schedule day by day in a single pass.
+
+    render_schedule calls `begin()`, then `on_day(week, day)` for every worked
+    day and `on_week(week)` once each week is complete, then `end(total_hours)`.
+    `target` is a path, an open binary file object or a callable opener (see
+    `open_output`); `options` holds the run's "name" and "hours_per_week".
+    Streaming sinks keep their output open for the whole pass.
+    """
+
+    streaming = False
+    saved_label = "💾 Saved to"
+
+    def __init__(self, target, options):
+        self.target = target
+        self.options = options
+        self.output = None
+        self.file = None
+        self.wrote_path = False
+
+    def open(self):
+        """Open the target for writing and return the binary file object."""
+        self.wrote_path = isinstance(self.target, str)
+        self.output = open_output(self.target)
+        self.file = self.output.__enter__()
+        return self.file
+
+    def write_with(self, writer, *args):
+        """Hand the target to one of the write_* functions."""
+        self.wrote_path = isinstance(self.target, str)
+        writer(*args, self.target)
+
+    def close(self):
+        """Close the output if it is still open; safe to call more than once."""
+        if self.output is not None:
+            output, self.output = self.output, None
+            output.__exit__(None, None, None)
+
+    def begin(self):
+        pass
+
+    def on_day(self, week, day):
+        pass
+
+    def on_week(self, week):
+        pass
+
+    def end(self, total_hours):
+        pass
+
+class TxtSink(ExportSink):
+    """Streams the text schedule week by week."""
+
+    streaming = True
+    saved_label = "📄 Text saved to"
+
+    def begin(self):
+        self.open()
+        self.separator = ""
+
+    def write_lines(self, lines):
+        self.file.write((self.separator + "\n".join(lines)).encode("utf-8"))
+        self.separator = "\n"
+
+    def on_week(self, week):
+        self.write_lines(week_text_lines(week, self.options["hours_per_week"]))
+
+    def end(self, total_hours):
+        self.write_lines(text_trailer_lines(total_hours))
+        self.close()
+
+class XlsxSink(ExportSink):
+    saved_label = "📊 Excel saved to"
+
+    def begin(self):
+        self.rows = []
+
+    def on_week(self, week):
+        self.rows.extend(week_excel_rows(week))
+
+    def end(self, total_hours):
+        self.rows.append(excel_total_row(total_hours))
+        self.write_with(write_xlsx, self.rows)
+
+class DocxSink(ExportSink):
+    saved_label = "📝 Word document saved to"
+
+    def begin(self):
+        self.rows = []
+
+    def on_week(self, week):
+        self.rows.append(week_docx_row(week))
+
+    def end(self, total_hours):
+        self.write_with(write_docx, self.rows, total_hours)
+
+class ArrowSink(ExportSink):
+    saved_label = "🏹 Arrow table saved to"
+
+    def begin(self):
+        self.columns = {name: [] for name in ARROW_COLUMNS}
+
+    def on_week(self, week):
+        week_arrow_columns(week, self.columns)
+
+    def end(self, total_hours):
+        self.write_with(write_arrow, self.columns)
+
+class JsonlSink(ExportSink):
+    """Streams one JSON object per worked day.
+
+    Days split into several sessions also list them under "sessions".
+    """
+
+    streaming = True
+    saved_label = "🗂 JSON Lines saved to"
+
+    def begin(self):
+        self.open()
+
+    def on_day(self, week, day):
+        record = {
+            "week": week["week"],
+            "date": day["date"].strftime("%Y-%m-%d"),
+            "weekday": day["weekday"],
+            "minutes": day["minutes"],
+            "start": day["start"],
+            "end": day["end"],
+        }
+        if len(day["sessions"]) > 1:
+            record["sessions"] = day["sessions"]
+        self.file.write((json.dumps(record) + "\n").encode("utf-8"))
+
+    def end(self, total_hours):
+        self.close()
+
+class IcsSink(ExportSink):
+    """Streams an iCalendar file with one VEVENT per work session."""
+
+    streaming = True
+    saved_label = "📆 Calendar saved to"
+
+    def begin(self):
+        self.open()
+        self.uid_prefix = self.options["name"]
+        self.stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        self._write_lines([
+            "BEGIN:VCALENDAR",
+            "VERSION:2.0",
+            "PRODID:-//Hello Kitty Schedule Generator//EN",
+            "CALSCALE:GREGORIAN",
+        ])
+
+    def _write_lines(self, lines):
+        # RFC 5545 requires CRLF line endings
+        self.file.write("".join(f"{line}\r\n" for line in lines).encode("utf-8"))
+
+    def on_day(self, week, day):
+        for session in day["sessions"]:
+            start = day["date"] + timedelta(minutes=time_to_minutes(session["start"]))
+            end = start + timedelta(minutes=session["minutes"])
+            self._write_lines([
+                "BEGIN:VEVENT",
+                f"UID:{self.uid_prefix}-{start.strftime('%Y%m%dT%H%M')}@hello-kitty-schedule",
+                f"DTSTAMP:{self.stamp}",
+                f"DTSTART:{start.strftime('%Y%m%dT%H%M%S')}",
+                f"DTEND:{end.strftime('%Y%m%dT%H%M%S')}",
+                f"SUMMARY:Work session (Week {week['week']}\\, {format_minutes(session['minutes'])})",
+                "END:VEVENT",
+            ])
+
+    def end(self, total_hours):
+        self._write_lines(["END:VCALENDAR"])
+        self.close()
+
+# Export formats by name; files get the name as their extension
+EXPORTERS = {}
+
+def register_exporter(fmt, sink_class):
+    """Add an ExportSink subclass as export format `fmt`, or replace a built-in one."""
+    EXPORTERS[fmt] = sink_class
+    return sink_class
+
+for _fmt, _sink_class in (("txt", TxtSink), ("xlsx", XlsxSink), ("docx", DocxSink), ("arrow", ArrowSink),
+                          ("jsonl", JsonlSink), ("ics", IcsSink)):
+    register_exporter(_fmt, _sink_class)
+
+# The built-in formats, in the order generate_schedule writes them
+EXPORT_FORMATS = ("txt", "xlsx", "docx", "arrow", "jsonl", "ics")
+
+def report_created_files(created_files):
     for file in created_files:
-        if file.endswith('.txt'):
-            print(f"📄 Text saved to: {file}")
-        elif file.endswith('.xlsx'):
-            print(f"📊 Excel saved to: {file}")
-        elif file.endswith('.docx'):
-            print(f"📝 Word document saved to: {file}")
-    print(f"🕒 Total work time: {total_hours_final:.2f} hours\n")
+        fmt = os.path.splitext(file)[1][1:]
+        if fmt == "zip":
+            print(f"🗜 Bundle saved to: {file}")
+        elif fmt in EXPORTERS:
+            print(f"{EXPORTERS[fmt].saved_label}: {file}")
 
-    if export_txt and created_files:
-        txt_file = next((f for f in created_files if f.endswith('.txt')), None)
-        if txt_file:
-            with open(txt_file, "r") as f:
-                print(f.read())
+def profile_stage(profiler, name):
+    """`profiler.stage(name)`, or a no-op context when not profiling."""
+    if profiler is None:
+        return contextlib.nullcontext()
+    return profiler.stage(name)
 
-def generate_schedule_total_hours(any_date_str, total_overall_hours, output_filename, start_week,
-                                 export_txt=True, export_xlsx=True, export_docx=True):
+def render_schedule(start_date, total_hours_per_week, total_days, start_week, targets, rng=random,
+                    progress=None, cancel_event=None, keep_weeks=False, name="schedule", sessions_per_day=1,
+                    min_gap=30, busy=None, seed=None, workers=1, profiler=None):
+    """Generate a schedule starting on Monday `start_date` and render it into `targets`.
+
+    `targets` maps names from EXPORTERS to a file path or an open binary
+    file object, so schedules can be rendered to disk or into memory. Every
+    day is pushed through all selected sinks in one pass; streaming formats
+    write as they go and the others only keep the rows they need.
+    `progress(weeks_done, weeks_total)` is called after every week, and
+    setting `cancel_event` stops the run with ScheduleCancelled at the next
+    week or export step. Files written to paths are removed again if the run
+    does not complete. See `iter_schedule_weeks` for `sessions_per_day`,
+    `min_gap`, `busy`, `seed` and `workers`. With a `RunProfiler` as
+    `profiler`, week generation and exporting are profiled as the
+    "generate" and "export" stages.
+
+    Returns the total hours, the number of days that clash with `busy` and,
+    with `keep_weeks`, the generated weeks.
+    """
+    unknown = set(targets) - set(EXPORTERS)
+    if unknown:
+        raise ValueError(f"Unknown export format(s): {', '.join(sorted(unknown))}")
+
+    total_minutes_per_week = round(total_hours_per_week * 60 / 30) * 30  # Round to 30-minute units
+    options = {"name": name, "hours_per_week": total_hours_per_week}
+    sinks = [EXPORTERS[fmt](target, options) for fmt, target in targets.items()]
+
+    kept_weeks = []
+    total_minutes_accumulated = 0
+    conflicts = 0
+    weeks_total = (total_days + 6) // 7
+    weeks_done = 0
+
+    def check_cancelled():
+        if cancel_event is not None and cancel_event.is_set():
+            raise ScheduleCancelled("Schedule generation was cancelled.")
+
+    completed = False
+    try:
+        with profile_stage(profiler, "export"):
+            for sink in sinks:
+                sink.begin()
+        weeks = iter_schedule_weeks(start_date, total_minutes_per_week, total_days, start_week, rng,
+                                    sessions_per_day, min_gap, busy, seed, workers)
+        if profiler is not None:
+            weeks = profiler.profiled("generate", weeks)
+        for week in weeks:
+            check_cancelled()
+            total_minutes_accumulated += week["minutes"]
+            conflicts += sum(1 for day in week["days"] if day.get("conflict"))
+            with profile_stage(profiler, "export"):
+                for day in week["days"]:
+                    for sink in sinks:
+                        sink.on_day(week, day)
+                for sink in sinks:
+                    sink.on_week(week)
+            if keep_weeks:
+                kept_weeks.append(week)
+            weeks_done += 1
+            if progress is not None:
+                progress(weeks_done, weeks_total)
+
+        total_hours_final = total_minutes_accumulated / 60
+        # Streaming sinks finish and release their output first, so in a ZIP archive
+        # no entry is still open when a batch sink starts writing its own
+        for sink in sorted(sinks, key=lambda sink: not sink.streaming):
+            check_cancelled()
+            with profile_stage(profiler, "export"):
+                sink.end(total_hours_final)
+                sink.close()
+        completed = True
+    finally:
+        for sink in sinks:
+            sink.close()
+        if not completed:
+            # Don't leave a half-finished set of files behind
+            for sink in sinks:
+                if sink.wrote_path and os.path.exists(sink.target):
+                    os.remove(sink.target)
+
+    return {"total_hours": total_hours_final, "conflicts": conflicts, "weeks": kept_weeks}
+
+def write_zip_bundle(start_date, total_hours_per_week, total_days, start_week, formats, target, seed,
+                     name="schedule", progress=None, cancel_event=None, keep_weeks=False, sessions_per_day=1,
+                     min_gap=30, busy=None, workers=1, profiler=None):
+    """Render `formats` straight into the entries of a ZIP archive written to `target`.
+
+    Each exporter writes directly into its archive entry, so no intermediate
+    files or extra copies are made. zipfile allows only one entry open for
+    writing at a time, so every streaming format after the first gets its
+    own pass that regenerates the same schedule from `seed` instead of
+    buffering it. Returns the result of the first pass.
+    """
+    streamed = [fmt for fmt in formats if EXPORTERS[fmt].streaming]
+    passes = [[fmt for fmt in formats if fmt not in streamed[1:]]] + [[fmt] for fmt in streamed[1:]]
+
+    first_result = None
+    with zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED) as bundle:
+        for pass_formats in passes:
+            targets = {fmt: functools.partial(bundle.open, f"{name}.{fmt}", "w") for fmt in pass_formats}
+            result = render_schedule(start_date, total_hours_per_week, total_days, start_week, targets,
+                                     progress=progress if first_result is None else None, cancel_event=cancel_event,
+                                     keep_weeks=keep_weeks and first_result is None, name=name,
+                                     sessions_per_day=sessions_per_day, min_gap=min_gap, busy=busy, seed=seed,
+                                     workers=workers, profiler=profiler)
+            first_result = first_result or result
+    return first_result
+
+def generate_schedule(any_date_str, total_hours_per_week, total_days, output_filename, start_week, 
+                     export_txt=True, export_xlsx=True, export_docx=True, seed=None, store=None, employee=None,
+                     export_arrow=False, export_jsonl=False, export_ics=False, progress=None,
+                     cancel_event=None, export_zip=False, cache=None, sessions_per_day=1, min_gap=30,
+                     busy=None, keep_weeks=False, extra_formats=(), workers=None, profile=False):
+    """Generate a schedule and write the selected formats next to `output_filename`.
+
+    With `export_zip` the selected formats are bundled into a single
+    `output_filename.zip` instead of separate files. `extra_formats` names
+    further formats added with `register_exporter`.
+    Weeks are generated in `workers` processes (see `default_workers` for
+    the default); the result does not depend on the number of workers.
+
+    With `profile` the run is captured with cProfile, stage by stage (see
+    `schedule_profiler`), in a single process so every week is included.
+    The merged profile is written to `output_filename.pstats`, and a top-N
+    summary per stage to `output_filename.profile.txt`. The summary is also
+    returned as "profile".
+
+    Every run is driven by a seed (drawn at random when not given) so it can
+    be reproduced. When a `ScheduleStore` is passed as `store`, the
+    parameters, seed and per-day rows are also saved to it under `employee`
+    (defaults to the output filename). See `render_schedule` for `progress`,
+    `cancel_event`, `sessions_per_day`, `min_gap` and `busy`. Returns a
+    summary dict, which also holds the generated weeks with `keep_weeks`.
+
+    With an `ArtifactCache` passed as `cache` and an explicit `seed`, files
+    rendered before for the same parameters are copied from the cache instead
+    of being rendered again. Random-seed runs never repeat, so they skip it.
+
+    Requests that cannot be generated raise `feasibility.InfeasibleRequest`
+    (a ValueError) before any work starts.
+    """
+    from feasibility import require_feasible
+    check = require_feasible(hours_per_week=total_hours_per_week, total_days=total_days, start_week=start_week,
+                             sessions_per_day=sessions_per_day, min_gap=min_gap)
+    for warning in check["warnings"]:
+        print(f"⚠️ {warning['message']}")
+
+    use_cache = cache is not None and seed is not None
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    if workers is None:
+        workers = default_workers(total_days)
+    profiler = None
+    if profile:
+        from schedule_profiler import RunProfiler
+        profiler = RunProfiler()
+        workers = 1
+
+    start_date = get_monday(any_date_str)
+    selected = {
+        "txt": export_txt, "xlsx": export_xlsx, "docx": export_docx,
+        "arrow": export_arrow, "jsonl": export_jsonl, "ics": export_ics,
+    }
+    formats = [fmt for fmt in EXPORT_FORMATS if selected[fmt]]
+    formats += [fmt for fmt in extra_formats if fmt not in formats]
+    unknown = set(formats) - set(EXPORTERS)
+    if unknown:
+        raise ValueError(f"Unknown export format(s): {', '.join(sorted(unknown))}")
+    name = os.path.basename(output_filename)
+    keep_weeks = keep_weeks or store is not None
+    shifts = {"sessions_per_day": sessions_per_day, "min_gap": min_gap, "busy": busy, "seed": seed,
+              "profiler": profiler}
+
+    def cache_key(fmt, names_output):
+        params = {
+            "start_date": start_date.strftime("%Y-%m-%d"),
+            "hours_per_week": round(total_hours_per_week, 6),
+            "total_days": total_days,
+            "start_week": start_week,
+        }
+        if sessions_per_day > 1:
+            params.update(sessions_per_day=sessions_per_day, min_gap=min_gap)
+        if busy is not None:
+            params["busy"] = busy.fingerprint()
+        # Only the calendar UIDs and zip entry names depend on the output name
+        if names_output:
+            params["name"] = name
+        return cache.key(params, seed, fmt)
+
+    cached_files = []
+    if export_zip:
+        zip_file = f"{output_filename}.zip"
+        zip_key = cache_key("zip:" + ",".join(formats), True) if use_cache else None
+        with profile_stage(profiler, "cache"):
+            cache_hit = bool(zip_key) and cache.fetch(zip_key, zip_file)
+        if cache_hit:
+            # Generating without exports is cheap and gives the totals (and weeks for the store)
+            result = render_schedule(start_date, total_hours_per_week, total_days, start_week, {},
+                                     keep_weeks=keep_weeks, workers=workers, **shifts)
+            cached_files.append(zip_file)
+        else:
+            try:
+                result = write_zip_bundle(start_date, total_hours_per_week, total_days, start_week, formats,
+                                          zip_file, seed, name, progress, cancel_event, keep_weeks=keep_weeks,
+                                          sessions_per_day=sessions_per_day, min_gap=min_gap, busy=busy,
+                                          workers=workers, profiler=profiler)
+            except BaseException:
+                if os.path.exists(zip_file):
+                    os.remove(zip_file)
+                raise
+            if zip_key:
+                with profile_stage(profiler, "cache"):
+                    cache.store(zip_key, zip_file)
+        created_files = [zip_file]
+    else:
+        targets = {fmt: f"{output_filename}.{fmt}" for fmt in formats}
+        keys = {fmt: cache_key(fmt, fmt == "ics") for fmt in formats} if use_cache else {}
+        to_render = {}
+        with profile_stage(profiler, "cache"):
+            for fmt, path in targets.items():
+                if fmt in keys and cache.fetch(keys[fmt], path):
+                    cached_files.append(path)
+                else:
+                    to_render[fmt] = path
+        try:
+            result = render_schedule(start_date, total_hours_per_week, total_days, start_week, to_render,
+                                     progress=progress, cancel_event=cancel_event, keep_weeks=keep_weeks,
+                                     name=name, workers=workers, **shifts)
+        except BaseException:
+            for path in cached_files:
+                os.remove(path)
+            raise
+        with profile_stage(profiler, "cache"):
+            for fmt, path in to_render.items():
+                if fmt in keys:
+                    cache.store(keys[fmt], path)
+        created_files = list(targets.values())
+    total_hours_final = result["total_hours"]
+
+    print(f"\n✅ Schedule created from {start_date.strftime('%Y-%m-%d')} for {total_days} days.")
+    report_created_files(created_files)
+    if cached_files:
+        print(f"♻️ Served from cache: {', '.join(cached_files)}")
+    print(f"🕒 Total work time: {total_hours_final:.2f} hours")
+    if result["conflicts"]:
+        print(f"⚠️ {result['conflicts']} day(s) had no free window and overlap a busy time")
+    print(f"🎲 Seed: {seed}\n")
+
+    if store is not None:
+        params = {
+            "any_date": any_date_str,
+            "total_hours_per_week": total_hours_per_week,
+            "total_days": total_days,
+            "output_filename": output_filename,
+            "start_week": start_week,
+        }
+        if sessions_per_day > 1:
+            params.update(sessions_per_day=sessions_per_day, min_gap=min_gap)
+        with profile_stage(profiler, "store"):
+            store.save_schedule(params, seed, result["weeks"], employee or output_filename)
+
+    if export_txt and not export_zip:
+        with profile_stage(profiler, "report"), open(f"{output_filename}.txt", "r", encoding="utf-8") as f:
+            print(f.read())
+
+    summary = {
+        "seed": seed,
+        "start_date": start_date,
+        "start_week": start_week,
+        "hours_per_week": total_hours_per_week,
+        "total_days": total_days,
+        "total_hours": total_hours_final,
+        "conflicts": result["conflicts"],
+        "formats": formats,
+        "files": created_files,
+        "weeks": result["weeks"],
+    }
+    if profiler is not None:
+        stats_file, report_file, report = profiler.dump(output_filename)
+        print(f"🔬 Profile saved to: {stats_file} (top functions per stage in {report_file})")
+        summary["profile"] = {"stats_file": stats_file, "report_file": report_file, "report": report}
+    return summary
+
+def plan_total_hours(total_overall_hours):
+    """Split total overall hours into (weeks_required, hours_per_week, total_days)."""
     max_weekly_hours = 15
     min_weekly_hours = 0.5  # Minimum 30 minutes per week
     
@@ -283,37 +1028,379 @@ def generate_schedule_total_hours(any_date_str, total_overall_hours, output_file
     
     # Calculate total days needed
     total_days = weeks_required * 7
+    return weeks_required, hours_per_week, total_days
+
+def generate_schedule_total_hours(any_date_str, total_overall_hours, output_filename, start_week,
+                                 export_txt=True, export_xlsx=True, export_docx=True, seed=None, store=None,
+                                 employee=None, export_arrow=False, export_jsonl=False, export_ics=False,
+                                 progress=None, cancel_event=None, export_zip=False, cache=None,
+                                 sessions_per_day=1, min_gap=30, busy=None, keep_weeks=False, extra_formats=(),
+                                 workers=None, profile=False):
+    from feasibility import require_feasible
+    require_feasible(total_overall_hours=total_overall_hours, start_week=start_week,
+                     sessions_per_day=sessions_per_day, min_gap=min_gap)
+    weeks_required, hours_per_week, total_days = plan_total_hours(total_overall_hours)
     
     print(f"📊 Distribution: {total_overall_hours:.2f} hours over {weeks_required} weeks")
     print(f"⏰ {hours_per_week:.2f} hours per week")
     print(f"📅 {total_days} days total\n")
     
-    generate_schedule(any_date_str, hours_per_week, total_days, output_filename, start_week,
-                     export_txt, export_xlsx, export_docx)
+    return generate_schedule(any_date_str, hours_per_week, total_days, output_filename, start_week,
+                             export_txt, export_xlsx, export_docx, seed, store, employee, export_arrow,
+                             export_jsonl, export_ics, progress, cancel_event, export_zip, cache,
+                             sessions_per_day, min_gap, busy, keep_weeks, extra_formats, workers, profile)
+
+def _schedule_plan(params):
+    """(start date, minutes per week, total days, start week) for generate_schedule arguments in `params`."""
+    if "total_hours_per_week" in params:
+        hours_per_week, total_days = params["total_hours_per_week"], params["total_days"]
+    else:
+        _, hours_per_week, total_days = plan_total_hours(params["total_overall_hours"])
+    total_minutes_per_week = round(hours_per_week * 60 / 30) * 30  # Same rounding as render_schedule
+    return get_monday(params["any_date"]), total_minutes_per_week, total_days, params.get("start_week", 1)
+
+def schedule_for_week(params, seed, week_number, busy=None):
+    """Week `week_number` exactly as `generate_schedule` would produce it, without generating the others.
+
+    `params` holds the generate_schedule arguments as saved by ScheduleStore:
+    "any_date", "total_hours_per_week" and "total_days" (or
+    "total_overall_hours" for Mode 2), "start_week", and optionally
+    "sessions_per_day" and "min_gap". Pass the same `busy` calendar as the
+    original run. Returns None for week numbers outside the schedule.
+    """
+    start_date, total_minutes_per_week, total_days, start_week = _schedule_plan(params)
+    week_index = week_number - start_week
+    if week_index < 0 or 7 * week_index >= total_days:
+        return None
+    return schedule_week(start_date, total_minutes_per_week, total_days, start_week, week_index,
+                         week_rng(seed, week_index), params.get("sessions_per_day", 1), params.get("min_gap", 30),
+                         busy)
+
+def schedule_for_date(params, seed, date, busy=None):
+    """The worked day on `date` (YYYY-MM-DD or datetime) of a schedule, or None if nothing is scheduled.
+
+    Only the week containing `date` is generated; see `schedule_for_week`.
+    """
+    if isinstance(date, str):
+        date = datetime.strptime(date, "%Y-%m-%d")
+    date = datetime.combine(date.date(), datetime.min.time())
+    start_date, _, _, start_week = _schedule_plan(params)
+    week = schedule_for_week(params, seed, start_week + (date - start_date).days // 7, busy)
+    if week is None:
+        return None
+    return next((day for day in week["days"] if day["date"] == date), None)
+
+# Patterns for reading back the tail of an existing schedule
+WEEK_LINE_RE = re.compile(r"^Week (\d+): \d{2} \w+ – (\d{2} \w+)")
+DAY_LINE_RE = re.compile(r"^(\d{2} \w{3} \d{4}) \(\w+\) - (\d+h \d+m) \|")
+TOTAL_LINE_RE = re.compile(r"^Total work time: ([\d.]+) hours")
+SCHEDULE_EXTENSIONS = (".txt", ".xlsx", ".docx")
+
+def read_txt_tail(txt_file, tail_bytes=8192):
+    """Read the last week of a .txt schedule without loading the whole file.
+
+    Returns the schedule state plus the byte offset where the closing
+    trailer starts, so new weeks can be written over it. "last_date" is the
+    last scheduled day from the week header, which may come after the last
+    worked day when the week ends in days without work.
+    """
+    with open(txt_file, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        tail_start = max(0, size - tail_bytes)
+        f.seek(tail_start)
+        tail = f.read()
+
+    trailer_at = tail.rfind(f"\n{TRAILER_RULE}\nTotal work time".encode())
+    if trailer_at == -1:
+        raise ValueError(f"{txt_file} does not end with a schedule total.")
+
+    last_week = None
+    week_end = None
+    week_days = []
+    total_hours = None
+    for line in tail.decode("utf-8", errors="ignore").splitlines():
+        week_match = WEEK_LINE_RE.match(line)
+        day_match = DAY_LINE_RE.match(line)
+        total_match = TOTAL_LINE_RE.match(line)
+        if week_match:
+            last_week = int(week_match.group(1))
+            week_end = week_match.group(2)
+            week_days = []
+        elif day_match:
+            week_days.append((datetime.strptime(day_match.group(1), "%d %b %Y"),
+                              parse_minutes(day_match.group(2))))
+        elif total_match:
+            total_hours = float(total_match.group(1))
+
+    if last_week is None or not week_days or total_hours is None:
+        raise ValueError(f"Could not find the last week in {txt_file}.")
+
+    # The header has no year: the week ends within six days of its last worked day
+    last_worked = week_days[-1][0]
+    last_date = datetime.strptime(f"{week_end} {last_worked.year}", "%d %B %Y")
+    if last_date < last_worked:
+        last_date = datetime.strptime(f"{week_end} {last_worked.year + 1}", "%d %B %Y")
+
+    state = {
+        "last_week": last_week,
+        "last_date": last_date,
+        "week_minutes": sum(minutes for _, minutes in week_days),
+        "total_hours": total_hours,
+    }
+    return state, tail_start + trailer_at + 1
+
+def read_xlsx_tail(xlsx_file):
+    """Read the last week and the total row of an .xlsx schedule.
+
+    The rows only list worked days, so "last_date" is the last worked day:
+    days without work at the very end of the schedule are not seen, and an
+    extension counts them as its own. `extend_schedule` reads the .txt
+    header instead whenever the .txt file exists.
+    """
+    from openpyxl import load_workbook
+
+    ws = load_workbook(xlsx_file, read_only=True).active
+    rows = list(ws.iter_rows(min_row=2, values_only=True))
+    if len(rows) < 2:
+        raise ValueError(f"{xlsx_file} does not contain any scheduled days.")
+
+    total_hours = float(rows[-1][3])
+    last_week_label = rows[-2][0]
+    week_days = []
+    for row in reversed(rows[:-1]):
+        if row[0] != last_week_label:
+            break
+        week_days.append((datetime.strptime(row[1], "%d %b %Y"), parse_minutes(row[3])))
+
+    return {
+        "last_week": int(last_week_label.split()[1]),
+        "last_date": max(date for date, _ in week_days),
+        "week_minutes": sum(minutes for _, minutes in week_days),
+        "total_hours": total_hours,
+    }
+
+def read_docx_tail(docx_file):
+    """Read the last week row and the total row of a .docx schedule.
+
+    Like `read_xlsx_tail`, "last_date" is the last worked day.
+    """
+    table = Document(docx_file).tables[0]
+    if len(table.rows) < 3:
+        raise ValueError(f"{docx_file} does not contain any scheduled weeks.")
+
+    total_hours = float(table.rows[-1].cells[3].text)
+    last_row = table.rows[-2].cells
+    dates = [datetime.strptime(line.split(" (")[0], "%d %b %Y") for line in last_row[1].text.split("\n")]
+    return {
+        "last_week": int(last_row[0].text.split()[1]),
+        "last_date": dates[-1],
+        "week_minutes": sum(parse_minutes(line) for line in last_row[3].text.split("\n")),
+        "total_hours": total_hours,
+    }
+
+def append_txt(txt_file, trailer_offset, text_lines):
+    """Overwrite the trailer of a .txt schedule with new weeks and a new trailer."""
+    with open(txt_file, "r+b") as f:
+        f.seek(trailer_offset)
+        f.truncate()
+        f.write("\n".join(text_lines).encode())
+
+def append_xlsx(xlsx_file, excel_data, total_hours):
+    """Replace the total row of an .xlsx schedule with new rows and a new total.
+
+    openpyxl cannot append to a saved workbook, so the whole file is loaded
+    and written again: the cost grows with the existing schedule, not only
+    the new weeks. Earlier rows keep their content.
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(xlsx_file)
+    ws = wb.active
+    ws.delete_rows(ws.max_row)
+    for row in excel_data + [excel_total_row(total_hours)]:
+        ws.append([value if value != "" else None for value in row.values()])
+    wb.save(xlsx_file)
+
+def append_docx(docx_file, docx_data, total_hours):
+    """Replace the total row of a .docx schedule with new week rows and a new total.
+
+    Like `append_xlsx`, this loads and saves the whole document.
+    """
+    doc = Document(docx_file)
+    table = doc.tables[0]
+    table._tbl.remove(table.rows[-1]._tr)
+    add_docx_rows(table, docx_data, total_hours)
+    doc.save(docx_file)
+
+def extend_schedule(existing_path, extra_days, total_hours_per_week=None, seed=None):
+    """Append `extra_days` more days to an existing schedule, keeping earlier weeks untouched.
+
+    `existing_path` may be the base filename or any of its .txt/.xlsx/.docx files;
+    every format that exists for that base name is extended. The `extra_days`
+    are counted from the day after the last scheduled day and week numbering
+    continues from the last week. A short last week already holds its full
+    weekly hours, so its remaining days get no new work and the new weeks
+    start on the following Monday. The weekly hours default to those of the
+    last existing week. The last scheduled day comes from the .txt week
+    header; with only .xlsx/.docx files it is the last worked day (see
+    `read_xlsx_tail`).
+
+    Only the .txt file is extended in place, at a cost proportional to the
+    new weeks. The .xlsx and .docx formats have no in-place append, so those
+    files are loaded and saved whole (see `append_xlsx`).
+    """
+    base, ext = os.path.splitext(existing_path)
+    if ext not in SCHEDULE_EXTENSIONS:
+        base = existing_path
+
+    txt_file, xlsx_file, docx_file = (f"{base}{ext}" for ext in SCHEDULE_EXTENSIONS)
+    existing = [f for f in (txt_file, xlsx_file, docx_file) if os.path.exists(f)]
+    if not existing:
+        raise FileNotFoundError(f"No schedule files found for '{base}'.")
+    if extra_days < 1:
+        raise ValueError("Extra days must be at least 1.")
+
+    # The .txt tail is the cheapest to read, so prefer it as the source of truth
+    trailer_offset = None
+    if txt_file in existing:
+        state, trailer_offset = read_txt_tail(txt_file)
+    elif xlsx_file in existing:
+        state = read_xlsx_tail(xlsx_file)
+    else:
+        state = read_docx_tail(docx_file)
+
+    if total_hours_per_week is None:
+        total_minutes_per_week = state["week_minutes"]
+        total_hours_per_week = total_minutes_per_week / 60
+    else:
+        total_minutes_per_week = round(total_hours_per_week * 60 / 30) * 30
+
+    first_day = state["last_date"] + timedelta(days=1)
+    start_date = get_monday(state["last_date"].strftime("%Y-%m-%d")) + timedelta(days=7)
+    rest_of_week = (start_date - first_day).days
+    new_days = extra_days - rest_of_week
+    if new_days < 1:
+        raise ValueError(f"Week {state['last_week']} already holds its full weekly hours, so the "
+                         f"{rest_of_week} day(s) left in it get no new work. Extend by more than "
+                         f"{rest_of_week} days to add weeks.")
+    from feasibility import require_feasible
+    check = require_feasible(hours_per_week=total_hours_per_week, total_days=new_days,
+                             start_week=state["last_week"] + 1)
+    for warning in check["warnings"]:
+        print(f"⚠️ {warning['message']}")
+    rng = random.Random(seed)
+
+    text_lines = []
+    excel_data = []
+    docx_data = []
+    added_minutes = 0
+    for week in iter_schedule_weeks(start_date, total_minutes_per_week, new_days, state["last_week"] + 1, rng):
+        added_minutes += week["minutes"]
+        text_lines.extend(week_text_lines(week, total_hours_per_week))
+        excel_data.extend(week_excel_rows(week))
+        docx_data.append(week_docx_row(week))
+
+    total_hours_final = state["total_hours"] + added_minutes / 60
+
+    if txt_file in existing:
+        if trailer_offset is None:
+            _, trailer_offset = read_txt_tail(txt_file)
+        append_txt(txt_file, trailer_offset, text_lines + text_trailer_lines(total_hours_final))
+    if xlsx_file in existing:
+        append_xlsx(xlsx_file, excel_data, total_hours_final)
+    if docx_file in existing:
+        append_docx(docx_file, docx_data, total_hours_final)
+
+    print(f"\n✅ Schedule extended from {first_day.strftime('%Y-%m-%d')} by {extra_days} days.")
+    report_created_files(existing)
+    print(f"🕒 Total work time: {total_hours_final:.2f} hours\n")
+    return existing
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="🗓 Weekly Work Schedule Generator")
+    parser.add_argument("--zip", action="store_true",
+                        help="Bundle all formats into a single <filename>.zip instead of separate files")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Seed for a reproducible schedule; repeat runs are served from the artifact cache")
+    parser.add_argument("--no-cache", action="store_true", help="Always render, never use the artifact cache")
+    parser.add_argument("--sessions-per-day", type=int, default=1,
+                        help="Split each day into up to this many work sessions (split shifts)")
+    parser.add_argument("--min-gap", type=int, default=30, help="Minimum minutes between sessions on the same day")
+    parser.add_argument("--busy", nargs="+", default=None, metavar="FILE",
+                        help="Existing commitments (.ics or .csv) that work sessions must avoid")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Processes generating weeks (default: every core for schedules over 10 years)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Profile the run with cProfile: writes <filename>.pstats and a per-stage summary")
+    parser.add_argument("--jsonl", action="store_true",
+                        help="Keep running and answer one JSON request per stdin line on stdout (see jsonl_worker.py)")
+    args = parser.parse_args()
+
+    cache = None
+    if not args.no_cache:
+        from artifact_cache import ArtifactCache
+        cache = ArtifactCache()
+
+    busy = None
+    if args.busy:
+        from busy_calendar import load_busy_calendar
+        busy = load_busy_calendar(args.busy)
+
+    if args.jsonl:
+        from jsonl_worker import serve
+        serve(cache=cache, workers=args.workers, busy=busy)
+        raise SystemExit(0)
+
     print("🗓 Weekly Work Schedule Generator")
     print("Choose a mode:")
     print("1. Input total **weekly** hours")
     print("2. Input total **overall** hours (system will split into weeks)")
-    mode = input("Enter 1 or 2: ").strip()
+    print("3. Extend an existing schedule")
+    mode = input("Enter 1, 2 or 3: ").strip()
+
+    if mode == "3":
+        existing = input("Enter the existing schedule filename (no extension): ").strip()
+        extra_days = int(input("Enter number of days to add (e.g. 30): ").strip())
+        from feasibility import InfeasibleRequest
+        try:
+            extend_schedule(existing, extra_days)
+        except InfeasibleRequest as e:
+            for reason in e.reasons:
+                print(f"❌ {reason['message']}")
+            raise SystemExit(1)
+
+    elif mode in ("1", "2"):
+        any_date = input("Enter any date within the starting week (YYYY-MM-DD): ").strip()
+        start_week = int(input("Enter the starting week number (e.g. 1): ").strip())
+        filename = input("Enter output filename (no extension): ").strip()
 
-    any_date = input("Enter any date within the starting week (YYYY-MM-DD): ").strip()
-    start_week = int(input("Enter the starting week number (e.g. 1): ").strip())
-    filename = input("Enter output filename (no extension): ").strip()
+        if mode == "1":
+            total_hours = float(input("Enter total weekly work hours (≤ 15): ").strip())
+            total_days = int(input("Enter total number of days to generate (e.g. 60): ").strip())
+            request = {"hours_per_week": total_hours, "total_days": total_days}
+        else:
+            total_overall_hours = float(input("Enter total overall work hours (e.g. 50): ").strip())
+            request = {"total_overall_hours": total_overall_hours}
+
+        from feasibility import check_schedule
+        check = check_schedule(start_week=start_week, sessions_per_day=args.sessions_per_day, min_gap=args.min_gap,
+                               **request)
+        if not check["ok"]:
+            for reason in check["reasons"]:
+                print(f"❌ {reason['message']}")
+            raise SystemExit(1)
 
-    if mode == "1":
-        total_hours = float(input("Enter total weekly work hours (≤ 15): ").strip())
-        if total_hours > 15:
-            raise ValueError("Weekly hours cannot exceed 15.")
-        total_days = int(input("Enter total number of days to generate (e.g. 60): ").strip())
-        generate_schedule(any_date, total_hours, total_days, filename, start_week)
+        if mode == "1":
+            generate_schedule(any_date, total_hours, total_days, filename, start_week, seed=args.seed,
+                              export_zip=args.zip, cache=cache, sessions_per_day=args.sessions_per_day,
+                              min_gap=args.min_gap, busy=busy, workers=args.workers, profile=args.profile)
 
-    elif mode == "2":
-        total_overall_hours = float(input("Enter total overall work hours (e.g. 50): ").strip())
-        if total_overall_hours <= 0:
-            raise ValueError("Total overall hours must be greater than 0.")
-        generate_schedule_total_hours(any_date, total_overall_hours, filename, start_week)
+        else:
+            generate_schedule_total_hours(any_date, total_overall_hours, filename, start_week, seed=args.seed,
+                                          export_zip=args.zip, cache=cache, sessions_per_day=args.sessions_per_day,
+                                          min_gap=args.min_gap, busy=busy, workers=args.workers,
+                                          profile=args.profile)
 
     else:
-        print("❌ Invalid mode selected.")
\ No newline at end of file
+        print("❌ Invalid mode selected.")
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+SQLite-backed job queue and worker for batch schedule generation
+Any number of worker processes, on one machine or several sharing a filesystem, drain the same queue
+
+A worker claims a job with a lease, renews the lease while the schedule is generated and
+marks the job done with its result. If a worker dies, its lease runs out and another
+worker picks the job up. Failed jobs are retried with a growing delay. Invalid requests
+fail at once, without retries.
+
+The queue uses SQLite's rollback journal rather than WAL, which needs shared memory, so
+the database also works on a network filesystem with working file locks. Leases use
+wall-clock time, so machines sharing a queue need synchronised clocks.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import random
+import socket
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+
+import generate_schedule_cli_copy as core
+from bulk_generation import BULK_FORMATS, generate_parameter_set, read_parameter_file, validate_parameter_sets
+
+DEFAULT_QUEUE_PATH = "schedule_jobs.db"
+DEFAULT_LEASE_SECONDS = 300
+DEFAULT_MAX_ATTEMPTS = 3
+RETRY_DELAY_SECONDS = 30  # Doubles with every failed attempt
+POLL_SECONDS = 2.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    params TEXT NOT NULL,
+    formats TEXT NOT NULL,
+    output_filename TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    created_at TEXT NOT NULL,
+    finished_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status_available ON jobs(status, available_at);
+"""
+
+
+class LeaseLost(Exception):
+    """Raised when a worker no longer holds the lease of the job it is running."""
+
+
+class JobQueue:
+    def __init__(self, path=DEFAULT_QUEUE_PATH):
+        self.path = path
+        # Autocommit mode, so claims can take the write lock with BEGIN IMMEDIATE
+        self.conn = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=DELETE")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    def enqueue(self, params, output_filename, formats=("txt", "xlsx", "docx"), max_attempts=DEFAULT_MAX_ATTEMPTS):
+        """Queue one validated parameter set (see bulk_generation.validate_parameter_sets). Returns the job id.
+
+        A missing seed is drawn now, so retries regenerate the same schedule.
+        """
+        params = dict(params)
+        if params.get("seed") is None:
+            params["seed"] = random.randrange(2 ** 32)
+        with self._transaction():
+            cursor = self.conn.execute(
+                "INSERT INTO jobs (params, formats, output_filename, max_attempts, available_at, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (json.dumps(params), json.dumps(list(formats)), output_filename, max_attempts, time.time(),
+                 datetime.now().isoformat(timespec="seconds"))
+            )
+        return cursor.lastrowid
+
+    def claim(self, worker_id, lease_seconds=DEFAULT_LEASE_SECONDS):
+        """Lease the next runnable job to `worker_id`, or return None when there is none.
+
+        Queued jobs that are due come first, then jobs whose worker let the
+        lease run out. A job that used up its attempts that way is failed.
+        """
+        now = time.time()
+        with self._transaction():
+            self.conn.execute(
+                "UPDATE jobs SET status = 'failed', error = 'Lease expired after the last attempt', "
+                "finished_at = ? WHERE status = 'running' AND lease_expires < ? AND attempts >= max_attempts",
+                (datetime.now().isoformat(timespec="seconds"), now)
+            )
+            row = self.conn.execute(
+                "SELECT * FROM jobs WHERE (status = 'queued' AND available_at <= ?) "
+                "OR (status = 'running' AND lease_expires < ?) ORDER BY id LIMIT 1",
+                (now, now)
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, lease_owner = ?, lease_expires = ? "
+                "WHERE id = ?",
+                (worker_id, now + lease_seconds, row["id"])
+            )
+        job = dict(row)
+        job["attempts"] += 1
+        job["params"] = json.loads(job["params"])
+        job["formats"] = json.loads(job["formats"])
+        return job
+
+    def _update_leased(self, job_id, worker_id, assignments, values):
+        with self._transaction():
+            cursor = self.conn.execute(
+                f"UPDATE jobs SET {assignments} WHERE id = ? AND status = 'running' AND lease_owner = ?",
+                (*values, job_id, worker_id)
+            )
+        if cursor.rowcount == 0:
+            raise LeaseLost(f"Job {job_id} is no longer leased to {worker_id}.")
+
+    def renew(self, job_id, worker_id, lease_seconds=DEFAULT_LEASE_SECONDS):
+        """Extend the lease of a running job; raises LeaseLost if another worker took it over."""
+        self._update_leased(job_id, worker_id, "lease_expires = ?", (time.time() + lease_seconds,))
+
+    def complete(self, job_id, worker_id, result):
+        self._update_leased(job_id, worker_id,
+                            "status = 'done', result = ?, error = NULL, lease_owner = NULL, finished_at = ?",
+                            (json.dumps(result), datetime.now().isoformat(timespec="seconds")))
+
+    def fail(self, job_id, worker_id, error, retry=True):
+        """Record a failed attempt: retried after a growing delay, or failed for good."""
+        row = self.conn.execute("SELECT attempts, max_attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if retry and row["attempts"] < row["max_attempts"]:
+            delay = RETRY_DELAY_SECONDS * 2 ** (row["attempts"] - 1)
+            self._update_leased(job_id, worker_id,
+                                "status = 'queued', error = ?, lease_owner = NULL, available_at = ?",
+                                (error, time.time() + delay))
+        else:
+            self._update_leased(job_id, worker_id,
+                                "status = 'failed', error = ?, lease_owner = NULL, finished_at = ?",
+                                (error, datetime.now().isoformat(timespec="seconds")))
+
+    def requeue_failed(self):
+        """Give every failed job a fresh set of attempts. Returns how many were requeued."""
+        with self._transaction():
+            cursor = self.conn.execute(
+                "UPDATE jobs SET status = 'queued', attempts = 0, available_at = ?, finished_at = NULL "
+                "WHERE status = 'failed'",
+                (time.time(),)
+            )
+        return cursor.rowcount
+
+    def counts(self):
+        """Number of jobs per status."""
+        rows = self.conn.execute("SELECT status, COUNT(*) AS count FROM jobs GROUP BY status")
+        return {row["status"]: row["count"] for row in rows}
+
+    def failed_jobs(self):
+        return [dict(row) for row in self.conn.execute(
+            "SELECT id, output_filename, attempts, error FROM jobs WHERE status = 'failed' ORDER BY id")]
+
+
+def run_job(queue, job, worker_id, lease_seconds=DEFAULT_LEASE_SECONDS, store=None):
+    """Generate one claimed job, renewing its lease as weeks are generated, and record the outcome."""
+    cancel_event = threading.Event()
+    last_renewal = time.monotonic()
+
+    def progress(weeks_done, weeks_total):
+        nonlocal last_renewal
+        if time.monotonic() - last_renewal > lease_seconds / 3:
+            try:
+                queue.renew(job["id"], worker_id, lease_seconds)
+            except LeaseLost:
+                # Another worker has taken over; stop instead of racing it for the same files
+                cancel_event.set()
+            last_renewal = time.monotonic()
+
+    os.makedirs(os.path.dirname(job["output_filename"]) or ".", exist_ok=True)
+    try:
+        # The generator prints every schedule; keep the worker log to one line per job
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = generate_parameter_set(job["params"], job["output_filename"], job["formats"],
+                                            progress=progress, cancel_event=cancel_event, store=store,
+                                            employee=job["params"]["filename"])
+    except core.ScheduleCancelled:
+        print(f"🎀 Job {job['id']}: lease lost, left to the other worker")
+        return False
+    except ValueError as e:
+        # Invalid requests fail the same way every time
+        queue.fail(job["id"], worker_id, str(e), retry=False)
+        print(f"❌ Job {job['id']}: {e}")
+        return False
+    except Exception as e:
+        queue.fail(job["id"], worker_id, f"{type(e).__name__}: {e}")
+        print(f"⚠️ Job {job['id']} attempt {job['attempts']} failed: {e}")
+        return False
+
+    queue.complete(job["id"], worker_id, {
+        "seed": result["seed"],
+        "total_hours": result["total_hours"],
+        "conflicts": result["conflicts"],
+        "files": result["files"],
+    })
+    print(f"✅ Job {job['id']}: {', '.join(result['files'])}")
+    return True
+
+
+def run_worker(queue_path=DEFAULT_QUEUE_PATH, worker_id=None, lease_seconds=DEFAULT_LEASE_SECONDS,
+               drain=True, store_path=None):
+    """Claim and run jobs until the queue is drained (or forever with `drain=False`).
+
+    Draining waits while other workers still hold leases, so jobs whose
+    worker died are picked up. Returns the number of jobs completed.
+    """
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    completed = 0
+    store = None
+    if store_path:
+        from schedule_store import ScheduleStore
+        store = ScheduleStore(store_path)
+    try:
+        with JobQueue(queue_path) as queue:
+            while True:
+                job = queue.claim(worker_id, lease_seconds)
+                if job is None:
+                    counts = queue.counts()
+                    if drain and not counts.get("queued") and not counts.get("running"):
+                        break
+                    time.sleep(POLL_SECONDS)
+                    continue
+                try:
+                    completed += run_job(queue, job, worker_id, lease_seconds, store)
+                except LeaseLost:
+                    print(f"🎀 Job {job['id']}: lease ran out before the result was saved; it will run again")
+    finally:
+        if store is not None:
+            store.close()
+    return completed
+
+
+def _enqueue_file(args):
+    parameter_sets, errors = validate_parameter_sets(read_parameter_file(args.parameters, args.parameters))
+    if errors:
+        for error in errors:
+            print(f"❌ {error}")
+        sys.exit(1)
+    with JobQueue(args.queue) as queue:
+        for params in parameter_sets:
+            queue.enqueue(params, os.path.join(args.output_dir, params["filename"]), args.formats, args.max_attempts)
+    print(f"📥 Queued {len(parameter_sets)} jobs in {args.queue}")
+
+
+def _work(args):
+    worker_args = (args.queue, None, args.lease, not args.forever, args.db)
+    if args.processes == 1:
+        completed = run_worker(*worker_args)
+    else:
+        with multiprocessing.get_context("spawn").Pool(args.processes) as pool:
+            completed = sum(pool.starmap(run_worker, [worker_args] * args.processes))
+    print(f"🌸 {completed} jobs completed")
+
+
+def _status(args):
+    with JobQueue(args.queue) as queue:
+        counts = queue.counts()
+        print("📋 " + ", ".join(f"{status}: {counts.get(status, 0)}"
+                               for status in ("queued", "running", "done", "failed")))
+        for job in queue.failed_jobs():
+            print(f"   ❌ #{job['id']} {job['output_filename']} after {job['attempts']} attempt(s): {job['error']}")
+
+
+def _requeue(args):
+    with JobQueue(args.queue) as queue:
+        print(f"🔁 Requeued {queue.requeue_failed()} failed jobs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="🎀 Queue schedule jobs and drain them with any number of workers")
+    parser.add_argument("--queue", default=DEFAULT_QUEUE_PATH, help="Queue database (on a shared filesystem "
+                                                                    "for several machines)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    enqueue = commands.add_parser("enqueue", help="Queue one job per row of a CSV/XLSX parameter file")
+    enqueue.add_argument("parameters", help="Parameter file, as for bulk_generation.py")
+    enqueue.add_argument("--formats", nargs="+", default=["txt", "xlsx", "docx"], choices=BULK_FORMATS)
+    enqueue.add_argument("--output-dir", default=".", help="Directory the workers write the files to")
+    enqueue.add_argument("--max-attempts", type=int, default=DEFAULT_MAX_ATTEMPTS)
+    enqueue.set_defaults(handler=_enqueue_file)
+
+    work = commands.add_parser("work", help="Run jobs until the queue is drained")
+    work.add_argument("--processes", type=int, default=1, help="Worker processes to start on this machine")
+    work.add_argument("--lease", type=int, default=DEFAULT_LEASE_SECONDS,
+                      help="Seconds a job stays leased without a renewal")
+    work.add_argument("--forever", action="store_true", help="Keep polling for new jobs instead of exiting")
+    work.add_argument("--db", default=None, help="Also save every schedule to this ScheduleStore database")
+    work.set_defaults(handler=_work)
+
+    status = commands.add_parser("status", help="Show job counts and failures")
+    status.set_defaults(handler=_status)
+    requeue = commands.add_parser("requeue-failed", help="Retry every failed job")
+    requeue.set_defaults(handler=_requeue)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
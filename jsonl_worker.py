@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Persistent JSON Lines worker for batch callers
+Reads one request per line on stdin and writes one result per line on stdout, so the
+interpreter start-up and the pandas/python-docx imports are paid once per process
+
+Requests use the same fields as the HTTP service:
+    Mode 1: {"date", "hours_per_week", "days"}    Mode 2: {"date", "total_hours"}
+    optional: "id" (echoed back), "start_week", "seed", "formats", "sessions_per_day", "min_gap"
+
+With "output" (a filename without extension) the files are written to disk, as by the
+interactive CLI, and their paths come back under "files"; "zip", "busy" (a list of
+.ics/.csv files) and "employee" are honoured too. Without it the formats are rendered in
+memory and returned base64-encoded, as by the HTTP service.
+
+Every response carries "ok"; failed requests get "error" (and "reasons" when the
+feasibility check rejected them) and the worker moves on to the next line.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+
+import generate_schedule_cli_copy as core
+from feasibility import InfeasibleRequest, require_feasible
+from schedule_server import _formats, _number, render_request
+
+DEFAULT_FORMATS = ("txt", "xlsx", "docx")
+
+
+def write_request(payload, cache=None, store=None, workers=None, busy=None):
+    """Generate a request with an "output" filename to disk and return its paths and totals.
+
+    A request's own "busy" files replace the worker-wide `busy` calendar.
+    """
+    output = payload["output"]
+    if not isinstance(output, str) or not output.strip():
+        raise ValueError("'output' must be a filename.")
+    date_str = payload.get("date")
+    if not isinstance(date_str, str):
+        raise ValueError("'date' (YYYY-MM-DD) is required.")
+    formats = _formats(payload, DEFAULT_FORMATS)
+
+    seed = payload.get("seed")
+    if seed is not None and (isinstance(seed, bool) or not isinstance(seed, int)):
+        raise ValueError("'seed' must be an integer.")
+
+    start_week = _number(payload, "start_week", 1)
+    sessions_per_day = _number(payload, "sessions_per_day", 1)
+    min_gap = _number(payload, "min_gap", 30)
+    weekly = "total_hours" not in payload
+    if weekly:
+        request = {"hours_per_week": _number(payload, "hours_per_week"), "total_days": _number(payload, "days")}
+    else:
+        request = {"total_overall_hours": _number(payload, "total_hours")}
+    check = require_feasible(start_week=start_week, sessions_per_day=sessions_per_day, min_gap=min_gap, **request)
+
+    if payload.get("busy") is not None:
+        paths = payload["busy"]
+        if not isinstance(paths, list) or not paths or not all(isinstance(path, str) for path in paths):
+            raise ValueError("'busy' must be a non-empty list of .ics/.csv file paths.")
+        from busy_calendar import load_busy_calendar
+        busy = load_busy_calendar(paths)
+
+    options = {f"export_{fmt}": fmt in formats for fmt in core.EXPORT_FORMATS}
+    options.update(
+        extra_formats=[fmt for fmt in formats if fmt not in core.EXPORT_FORMATS], seed=seed,
+        export_zip=bool(payload.get("zip")), cache=cache, store=store, employee=payload.get("employee"),
+        sessions_per_day=int(sessions_per_day), min_gap=int(min_gap), busy=busy, workers=workers
+    )
+    if weekly:
+        result = core.generate_schedule(date_str, request["hours_per_week"], int(request["total_days"]),
+                                        output.strip(), int(start_week), **options)
+    else:
+        result = core.generate_schedule_total_hours(date_str, request["total_overall_hours"], output.strip(),
+                                                    int(start_week), **options)
+    return {
+        "seed": result["seed"],
+        "start_date": result["start_date"].strftime("%Y-%m-%d"),
+        "total_days": result["total_days"],
+        "hours_per_week": result["hours_per_week"],
+        "total_hours": result["total_hours"],
+        "conflicts": result["conflicts"],
+        "warnings": check["warnings"],
+        "files": result["files"],
+    }
+
+
+def handle_line(line, cache=None, store=None, workers=None, busy=None):
+    """Answer one request line with a response dict; never raises for a bad request."""
+    try:
+        payload = json.loads(line)
+    except ValueError:
+        return {"ok": False, "error": "Request is not valid JSON."}
+    if not isinstance(payload, dict):
+        return {"ok": False, "error": "Request must be a JSON object."}
+
+    response = {"id": payload["id"]} if "id" in payload else {}
+    try:
+        if "output" in payload:
+            response.update(write_request(payload, cache, store, workers, busy))
+        else:
+            response.update(render_request("total" if "total_hours" in payload else "weekly", payload))
+    except InfeasibleRequest as e:
+        return {"ok": False, **response, "error": str(e), "reasons": e.reasons}
+    except Exception as e:
+        return {"ok": False, **response, "error": str(e)}
+    return {"ok": True, **response}
+
+
+def serve(stdin=None, stdout=None, cache=None, store=None, workers=None, busy=None):
+    """Answer requests from `stdin` until it is closed. Returns the number of requests handled.
+
+    The generator's progress output goes to /dev/null, so `stdout` only
+    carries one JSON response per request, flushed as soon as it is ready.
+    """
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    handled = 0
+    with open(os.devnull, "w") as devnull:
+        for line in stdin:
+            if not line.strip():
+                continue
+            with contextlib.redirect_stdout(devnull):
+                response = handle_line(line, cache, store, workers, busy)
+            stdout.write(json.dumps(response) + "\n")
+            stdout.flush()
+            handled += 1
+    return handled
+
+
+def main():
+    parser = argparse.ArgumentParser(description="🎀 Answer JSON Lines schedule requests from stdin on stdout")
+    parser.add_argument("--no-cache", action="store_true", help="Always render, never use the artifact cache")
+    parser.add_argument("--db", default=None, help="Also save every schedule written to disk to this database")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Processes generating weeks (default: every core for schedules over 10 years)")
+    args = parser.parse_args()
+
+    cache = None
+    if not args.no_cache:
+        from artifact_cache import ArtifactCache
+        cache = ArtifactCache()
+    store = None
+    if args.db:
+        from schedule_store import ScheduleStore
+        store = ScheduleStore(args.db)
+    try:
+        serve(cache=cache, store=store, workers=args.workers)
+    finally:
+        if store is not None:
+            store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Memory budget check for long schedules
+Runs generate_schedule on multi-year horizons under tracemalloc, once with no export,
+once per format and once for a ZIP bundle, and fails when the peak traced memory of a
+run goes over its case's budget
+
+Each run makes the web app's call: weeks kept for the preview and files stored in an
+(empty) artifact cache. Weeks are generated in-process (workers=1) so that tracemalloc
+sees them.
+
+Each case runs in a fresh process so peak RSS is reported per case as well.
+tracemalloc only sees Python allocations; native buffers (lxml trees behind
+python-docx, Arrow arrays) only show up in the RSS column.
+"""
+
+import argparse
+import contextlib
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import tracemalloc
+
+import generate_schedule_cli_copy
+
+# Per-case budgets for the traced peak, in MB: (fixed, per year of schedule)
+# Every case keeps the generated weeks, about 0.3 MB per year
+BUDGETS_MB = {
+    "generate": (0.5, 0.3),
+    "txt": (0.5, 0.5),
+    "xlsx": (2.0, 1.3),
+    "docx": (3.0, 0.5),
+    "arrow": (0.5, 0.4),
+    "jsonl": (0.5, 0.3),
+    "ics": (0.5, 0.3),
+    "zip": (3.0, 1.3),
+}
+DEFAULT_YEARS = (1, 5, 10)
+HOURS_PER_WEEK = 15  # Worst case: the most sessions per week
+
+
+def budget_mb(fmt, years):
+    fixed, per_year = BUDGETS_MB[fmt]
+    return fixed + per_year * years
+
+
+def _peak_rss_mb():
+    # ru_maxrss is KB on Linux and bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+def measure_case(fmt, years, top):
+    """Run one case through generate_schedule in this process and return peak memory plus the top allocation sites."""
+    from artifact_cache import ArtifactCache
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        cache = ArtifactCache(os.path.join(output_dir, "cache"))
+
+        def generate(total_days, seed, progress=None):
+            # The web app's call: weeks kept for the preview, files stored in the artifact cache
+            options = {f"export_{name}": False for name in generate_schedule_cli_copy.EXPORT_FORMATS}
+            if fmt == "zip":
+                options.update(export_txt=True, export_xlsx=True, export_docx=True, export_zip=True)
+            elif fmt != "generate":
+                options[f"export_{fmt}"] = True
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                generate_schedule_cli_copy.generate_schedule(
+                    "2024-01-01", HOURS_PER_WEEK, total_days, os.path.join(output_dir, f"schedule_{seed}"), 1,
+                    seed=seed, cache=cache, keep_weeks=True, progress=progress, workers=1, **options
+                )
+
+        # Warm up so lazy imports and caches are not counted against the budget
+        generate(7, 0)
+
+        total_weeks = (years * 365 + 6) // 7
+        snapshots = []
+
+        def progress(weeks_done, weeks_total):
+            # Once every week is buffered, the schedule data is at its largest
+            if weeks_done == weeks_total:
+                snapshots.append(tracemalloc.take_snapshot())
+
+        rss_before = _peak_rss_mb()
+        tracemalloc.start()
+        # Whole weeks: a 15-hour week cannot be squeezed into a short final week
+        generate(total_weeks * 7, 1, progress)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        rss_after = _peak_rss_mb()
+
+    sites = []
+    if snapshots:
+        snapshot = snapshots[0].filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ])
+        for stat in snapshot.statistics("lineno")[:top]:
+            frame = stat.traceback[0]
+            sites.append((f"{os.path.basename(frame.filename)}:{frame.lineno}", stat.size / 2 ** 20, stat.count))
+
+    return {
+        "format": fmt,
+        "years": years,
+        "weeks": total_weeks,
+        "peak_mb": peak / 2 ** 20,
+        "rss_growth_mb": max(0.0, rss_after - rss_before),
+        "budget_mb": budget_mb(fmt, years),
+        "sites": sites,
+    }
+
+
+def run_case(fmt, years, top):
+    """Measure one case in a fresh process so RSS and import state don't leak between cases."""
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(measure_case, (fmt, years, top))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="🎀 Check peak memory of schedule generation and exports")
+    parser.add_argument("--years", type=int, nargs="+", default=list(DEFAULT_YEARS))
+    parser.add_argument("--formats", nargs="+", default=list(BUDGETS_MB), choices=list(BUDGETS_MB))
+    parser.add_argument("--top", type=int, default=5, help="Allocation sites to show per case")
+    args = parser.parse_args()
+
+    failures = []
+    for fmt in args.formats:
+        for years in args.years:
+            result = run_case(fmt, years, args.top)
+            ok = result["peak_mb"] <= result["budget_mb"]
+            if not ok:
+                failures.append(result)
+            print(f"{'✅' if ok else '❌'} {fmt:<8} {years:>2}y ({result['weeks']} weeks): "
+                  f"peak {result['peak_mb']:.2f} MB / budget {result['budget_mb']:.2f} MB, "
+                  f"RSS +{result['rss_growth_mb']:.1f} MB")
+            for site, size_mb, count in result["sites"]:
+                print(f"      {size_mb:8.3f} MB {count:>8} blocks  {site}")
+
+    if failures:
+        print(f"\n❌ {len(failures)} case(s) over budget")
+        sys.exit(1)
+    print("\n🌸 All cases within budget 🌸")
+
+
+if __name__ == "__main__":
+    main()
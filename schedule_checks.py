@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Consistency checks for the schedule generator
+Runs scenarios that earlier bugs got wrong and exits non-zero when any of them fails
+
+    python schedule_checks.py            # every check
+    python schedule_checks.py sessions   # only the named checks
+"""
+
+import argparse
+import contextlib
+import itertools
+import os
+import random
+import sys
+import tempfile
+from datetime import timedelta
+
+import generate_schedule_cli_copy as core
+
+
+def check_extend_after_idle_days():
+    """A week ending in days without work still extends by exactly `extra_days`."""
+    failures = []
+    with tempfile.TemporaryDirectory() as output_dir, open(os.devnull, "w") as devnull, \
+            contextlib.redirect_stdout(devnull):
+        base = os.path.join(output_dir, "schedule")
+        # 2 hours a week leaves some days without work; with seed 0 week 2 has none on Sunday 14 Jan
+        core.generate_schedule("2024-01-01", 2, 14, base, 1, export_xlsx=False, export_docx=False, seed=0)
+        state, _ = core.read_txt_tail(f"{base}.txt")
+        if state["last_date"].strftime("%Y-%m-%d") != "2024-01-14":
+            failures.append(f"last scheduled day read as {state['last_date']:%Y-%m-%d}, not 2024-01-14")
+        for extra_days in (1, 7, 10):
+            before, _ = core.read_txt_tail(f"{base}.txt")
+            try:
+                core.extend_schedule(base, extra_days, seed=extra_days)
+            except ValueError as e:
+                failures.append(f"extending by {extra_days} days failed: {e}")
+                break
+            after, _ = core.read_txt_tail(f"{base}.txt")
+            expected = before["last_date"] + timedelta(days=extra_days)
+            if after["last_date"] != expected:
+                failures.append(f"extending by {extra_days} days ended on {after['last_date']:%Y-%m-%d}, "
+                                f"not {expected:%Y-%m-%d}")
+    return failures
+
+
+def _fits_by_brute_force(lengths, busy, gap_units):
+    """Whether some choice of starts places every session clear of `busy` and of each other."""
+    ranges = [range(core.WORK_SLOTS - length + 1) for length in lengths]
+    for starts in itertools.product(*ranges):
+        spans = sorted(zip(starts, lengths))
+        if any((busy >> start) & ((1 << length) - 1) for start, length in spans):
+            continue
+        if all(start + length + gap_units <= next_start
+               for (start, length), (next_start, _) in zip(spans, spans[1:])):
+            return True
+    return False
+
+
+def check_session_placement(cases=300):
+    """Split-shift placement accepts exactly the days a brute-force search can fit."""
+    failures = []
+    rng = random.Random(0)
+    # The first case is a day the old greedy first-fit check rejected
+    days = [([60, 30, 90], 30, 0b11010101000010001)]
+    for _ in range(cases):
+        sessions = [rng.choice((30, 60, 90, 120)) for _ in range(rng.randint(2, 3))]
+        busy = sum(1 << slot for slot in range(core.WORK_SLOTS) if rng.random() < 0.4)
+        days.append((sessions, rng.choice((0, 30, 60)), busy))
+
+    for sessions, min_gap, busy in days:
+        lengths = [minutes // core.SLOT_MINUTES for minutes in sessions]
+        gap_units = min_gap // core.SLOT_MINUTES
+        expected = _fits_by_brute_force(lengths, busy, gap_units)
+        try:
+            placed = core.place_sessions(sessions, min_gap, random.Random(0), busy)
+        except ValueError:
+            placed = None
+        if (placed is not None) != expected:
+            failures.append(f"{sessions} min, gap {min_gap}, busy {busy:#020b}: "
+                            f"{'placed' if placed is not None else 'rejected'}, but brute force "
+                            f"{'fits' if expected else 'does not fit'}")
+    return failures
+
+
+CHECKS = {
+    "extend": check_extend_after_idle_days,
+    "sessions": check_session_placement,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="🎀 Run the schedule generator's consistency checks")
+    parser.add_argument("checks", nargs="*", help=f"Checks to run (default: all of {', '.join(CHECKS)})")
+    args = parser.parse_args()
+    unknown = set(args.checks) - set(CHECKS)
+    if unknown:
+        parser.error(f"unknown check(s): {', '.join(sorted(unknown))}")
+
+    failed = 0
+    for name in args.checks or list(CHECKS):
+        failures = CHECKS[name]()
+        print(f"{'✅' if not failures else '❌'} {name}: {CHECKS[name].__doc__}")
+        for failure in failures:
+            print(f"      {failure}")
+        failed += bool(failures)
+
+    if failed:
+        print(f"\n❌ {failed} check(s) failed")
+        sys.exit(1)
+    print("\n🌸 All checks passed 🌸")
+
+
+if __name__ == "__main__":
+    main()
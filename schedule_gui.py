@@ -7,9 +7,14 @@ import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from datetime import datetime, timedelta
 import generate_schedule_cli_copy
+from artifact_cache import ArtifactCache
+from feasibility import check_schedule
 import os
 from PIL import Image, ImageTk
 
+# Weeks inserted into the preview per batch; more are added as the list is scrolled
+PREVIEW_BATCH_WEEKS = 50
+
 class ScheduleGeneratorGUI:
     def __init__(self, root):
         self.root = root
@@ -26,6 +31,9 @@ class ScheduleGeneratorGUI:
         # Configure Hello Kitty style
         self.setup_styles()
         
+        # Reuse files from earlier runs with the same seed
+        self.cache = ArtifactCache()
+        
         self.create_widgets()
         
     def load_hello_kitty_element(self):
@@ -293,6 +301,21 @@ class ScheduleGeneratorGUI:
                                  bg='white')
         self.days_entry.grid(row=3, column=1, sticky=tk.W, pady=5)
         
+        # Seed input (optional, makes the schedule reproducible)
+        tk.Label(input_grid, text="🎲 Seed (optional):", 
+                font=("Comic Sans MS", 11, "bold"),
+                fg='#ff1493',
+                bg='#fff8fa').grid(row=4, column=0, sticky=tk.W, pady=5, padx=(0, 20))
+        
+        self.seed_var = tk.StringVar(value="")
+        self.seed_entry = tk.Entry(input_grid, textvariable=self.seed_var, 
+                                 font=("Comic Sans MS", 10),
+                                 width=16,
+                                 relief='solid',
+                                 bd=1,
+                                 bg='white')
+        self.seed_entry.grid(row=4, column=1, sticky=tk.W, pady=5)
+        
         # Output settings with Hello Kitty card design
         output_frame = tk.Frame(main_frame, bg='#fff8fa', relief='solid', bd=2, padx=25, pady=15)
         output_frame.pack(fill=tk.X, pady=(0, 10))
@@ -349,6 +372,8 @@ class ScheduleGeneratorGUI:
         self.export_txt = tk.BooleanVar(value=True)
         self.export_xlsx = tk.BooleanVar(value=True)
         self.export_docx = tk.BooleanVar(value=True)
+        self.export_jsonl = tk.BooleanVar(value=False)
+        self.export_ics = tk.BooleanVar(value=False)
         
         # Export checkboxes in a more compact layout
         txt_cb = tk.Checkbutton(export_frame, text="📄 Text", 
@@ -376,7 +401,25 @@ class ScheduleGeneratorGUI:
                                 bg='#fff8fa',
                                 selectcolor='#ff69b4',
                                 activebackground='#fff8fa')
-        docx_cb.pack(side=tk.LEFT)
+        docx_cb.pack(side=tk.LEFT, padx=(0, 25))
+        
+        jsonl_cb = tk.Checkbutton(export_frame, text="🗂 JSON Lines", 
+                                 variable=self.export_jsonl,
+                                 font=("Comic Sans MS", 10),
+                                 fg='#c71585',
+                                 bg='#fff8fa',
+                                 selectcolor='#ff69b4',
+                                 activebackground='#fff8fa')
+        jsonl_cb.pack(side=tk.LEFT, padx=(0, 25))
+        
+        ics_cb = tk.Checkbutton(export_frame, text="📆 Calendar", 
+                               variable=self.export_ics,
+                               font=("Comic Sans MS", 10),
+                               fg='#c71585',
+                               bg='#fff8fa',
+                               selectcolor='#ff69b4',
+                               activebackground='#fff8fa')
+        ics_cb.pack(side=tk.LEFT)
         
         # Action buttons with Hello Kitty styling
         button_frame = tk.Frame(main_frame, bg='#ffe6f2')
@@ -472,6 +515,9 @@ class ScheduleGeneratorGUI:
                                bg='#ffe6f2')
         status_label.pack(pady=5)
         
+        # Schedule preview with Hello Kitty card design
+        self.create_preview(main_frame)
+        
         # Add mouse wheel scrolling to canvas
         def _on_mousewheel(event):
             self.canvas.yview_scroll(int(-1*(event.delta/120)), "units")
@@ -480,6 +526,111 @@ class ScheduleGeneratorGUI:
         # Initial mode setup
         self.on_mode_change()
         
+    def create_preview(self, parent):
+        """Preview pane: weeks are inserted in batches as the list scrolls, days only when a week is opened"""
+        preview_frame = tk.Frame(parent, bg='#fff8fa', relief='solid', bd=2, padx=15, pady=10)
+        preview_frame.pack(fill=tk.BOTH, expand=True, pady=(5, 10))
+        
+        header = tk.Frame(preview_frame, bg='#fff8fa')
+        header.pack(fill=tk.X, pady=(0, 5))
+        tk.Label(header, text="📊 Schedule Preview 📊", 
+                font=("Comic Sans MS", 12, "bold"),
+                fg='#ff69b4',
+                bg='#fff8fa').pack(side=tk.LEFT)
+        tk.Button(header, text="Collapse all", 
+                 command=self.collapse_preview,
+                 font=("Comic Sans MS", 9),
+                 bg='#ff69b4',
+                 fg='white',
+                 activebackground='#ff1493',
+                 activeforeground='white',
+                 relief='raised',
+                 bd=1,
+                 padx=10,
+                 pady=2,
+                 cursor='hand2').pack(side=tk.RIGHT)
+        
+        self.preview_info_var = tk.StringVar(value="Generate a schedule to see it here 🌸")
+        tk.Label(preview_frame, textvariable=self.preview_info_var, 
+                font=("Comic Sans MS", 9),
+                fg='#c71585',
+                bg='#fff8fa').pack(anchor=tk.W, pady=(0, 5))
+        
+        tree_frame = tk.Frame(preview_frame, bg='#fff8fa')
+        tree_frame.pack(fill=tk.BOTH, expand=True)
+        
+        self.preview_tree = ttk.Treeview(tree_frame, columns=("day", "work_time", "time_slot"), height=12)
+        self.preview_tree.heading("#0", text="Week / Date")
+        self.preview_tree.heading("day", text="Day")
+        self.preview_tree.heading("work_time", text="Work Time")
+        self.preview_tree.heading("time_slot", text="Time Slot")
+        self.preview_tree.column("#0", width=200)
+        self.preview_tree.column("day", width=90)
+        self.preview_tree.column("work_time", width=80)
+        self.preview_tree.column("time_slot", width=170)
+        
+        self.preview_scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.preview_tree.yview)
+        self.preview_tree.configure(yscrollcommand=self.on_preview_scroll)
+        self.preview_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.preview_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.preview_tree.bind("<<TreeviewOpen>>", self.on_preview_week_open)
+        
+        self.preview_weeks = []
+        self.preview_week_items = {}  # Tree item -> index into preview_weeks
+        self.preview_loading = False
+    
+    def show_preview(self, weeks):
+        """Replace the preview with a new schedule, inserting only the first batch of weeks"""
+        self.preview_tree.delete(*self.preview_tree.get_children())
+        self.preview_weeks = weeks
+        self.preview_week_items = {}
+        self.load_more_preview_weeks()
+    
+    def load_more_preview_weeks(self):
+        """Insert the next batch of (collapsed) week rows"""
+        self.preview_loading = False
+        loaded = len(self.preview_week_items)
+        for index in range(loaded, min(loaded + PREVIEW_BATCH_WEEKS, len(self.preview_weeks))):
+            week = self.preview_weeks[index]
+            item = self.preview_tree.insert(
+                "", "end",
+                text=f"Week {week['week']}: {week['start'].strftime('%d %b')} – {week['end'].strftime('%d %b %Y')}",
+                values=(f"{len(week['days'])} days", generate_schedule_cli_copy.format_minutes(week["minutes"]), "")
+            )
+            # Placeholder so the week can be opened; replaced by its days on first open
+            self.preview_tree.insert(item, "end", text="…", tags=("placeholder",))
+            self.preview_week_items[item] = index
+        self.preview_info_var.set(f"Showing {len(self.preview_week_items)} of {len(self.preview_weeks)} weeks "
+                                  f"- scroll for more, open a week for its days")
+    
+    def on_preview_scroll(self, first, last):
+        """Scrollbar callback; loads the next batch when the view nears the end of the inserted rows"""
+        self.preview_scrollbar.set(first, last)
+        more = len(self.preview_week_items) < len(self.preview_weeks)
+        if more and float(last) > 0.9 and not self.preview_loading:
+            self.preview_loading = True
+            self.root.after_idle(self.load_more_preview_weeks)
+    
+    def on_preview_week_open(self, event):
+        """Insert a week's days the first time it is opened"""
+        item = self.preview_tree.focus()
+        if item not in self.preview_week_items:
+            return
+        children = self.preview_tree.get_children(item)
+        if not children or "placeholder" not in self.preview_tree.item(children[0], "tags"):
+            return
+        self.preview_tree.delete(*children)
+        for day in self.preview_weeks[self.preview_week_items[item]]["days"]:
+            self.preview_tree.insert(item, "end", text=day["date"].strftime("%d %b %Y"), values=(
+                day["weekday"],
+                generate_schedule_cli_copy.format_minutes(day["minutes"]),
+                generate_schedule_cli_copy.day_time_slots(day),
+            ))
+    
+    def collapse_preview(self):
+        for item in self.preview_tree.get_children():
+            self.preview_tree.item(item, open=False)
+    
     def on_mode_change(self):
         """Handle mode change"""
         mode = self.mode_var.get()
@@ -511,23 +662,25 @@ class ScheduleGeneratorGUI:
             # Validate date
             datetime.strptime(self.date_var.get(), "%Y-%m-%d")
             
-            # Validate week number
             week = int(self.week_var.get())
-            if week < 1:
-                raise ValueError("Week number must be at least 1")
-            
-            # Validate hours
             hours = float(self.hours_var.get())
-            if hours <= 0:
-                raise ValueError("Hours must be greater than 0")
-            if hours > 15:
-                raise ValueError("Hours cannot exceed 15")
             
-            # Validate days (for mode 1)
+            # The weekly cap applies to Mode 1 only; Mode 2 hours are the overall total
             if self.mode_var.get() == "1":
-                days = int(self.days_var.get())
-                if days < 1:
-                    raise ValueError("Days must be at least 1")
+                check = check_schedule(hours, int(self.days_var.get()), start_week=week)
+            else:
+                check = check_schedule(total_overall_hours=hours, start_week=week)
+            if not check["ok"]:
+                raise ValueError("\n".join(reason["message"] for reason in check["reasons"]))
+            if check["warnings"]:
+                messagebox.showwarning("Check Schedule", "\n".join(warning["message"] for warning in check["warnings"]))
+            
+            # Validate seed
+            if self.seed_var.get().strip():
+                try:
+                    int(self.seed_var.get())
+                except ValueError:
+                    raise ValueError("Seed must be a whole number")
             
             # Validate filename
             if not self.filename_var.get().strip():
@@ -555,26 +708,33 @@ class ScheduleGeneratorGUI:
             start_week = int(self.week_var.get())
             filename = self.filename_var.get().strip()
             mode = self.mode_var.get()
+            seed = int(self.seed_var.get()) if self.seed_var.get().strip() else None
             
             if mode == "1":
                 total_hours = float(self.hours_var.get())
                 total_days = int(self.days_var.get())
                 
                 # Call the original function with export format selections
-                generate_schedule_cli_copy.generate_schedule(
+                result = generate_schedule_cli_copy.generate_schedule(
                     start_date, total_hours, total_days, filename, start_week,
-                    self.export_txt.get(), self.export_xlsx.get(), self.export_docx.get()
+                    self.export_txt.get(), self.export_xlsx.get(), self.export_docx.get(), seed=seed,
+                    export_jsonl=self.export_jsonl.get(), export_ics=self.export_ics.get(), cache=self.cache,
+                    keep_weeks=True
                 )
                 
             else:  # mode 2
                 total_overall_hours = float(self.hours_var.get())
                 
                 # Call the total hours function with export format selections
-                generate_schedule_cli_copy.generate_schedule_total_hours(
+                result = generate_schedule_cli_copy.generate_schedule_total_hours(
                     start_date, total_overall_hours, filename, start_week,
-                    self.export_txt.get(), self.export_xlsx.get(), self.export_docx.get()
+                    self.export_txt.get(), self.export_xlsx.get(), self.export_docx.get(), seed=seed,
+                    export_jsonl=self.export_jsonl.get(), export_ics=self.export_ics.get(), cache=self.cache,
+                    keep_weeks=True
                 )
             
+            self.show_preview(result["weeks"])
+            
             # Check which files were created
             created_files = []
             if self.export_txt.get() and os.path.exists(f"{filename}.txt"):
@@ -583,6 +743,10 @@ class ScheduleGeneratorGUI:
                 created_files.append(".xlsx")
             if self.export_docx.get() and os.path.exists(f"{filename}.docx"):
                 created_files.append(".docx")
+            if self.export_jsonl.get() and os.path.exists(f"{filename}.jsonl"):
+                created_files.append(".jsonl")
+            if self.export_ics.get() and os.path.exists(f"{filename}.ics"):
+                created_files.append(".ics")
             
             # Show success message
             files_text = ", ".join(created_files) if created_files else "No files"
@@ -607,9 +771,12 @@ class ScheduleGeneratorGUI:
         self.hours_var.set("10")
         self.days_var.set("7")
         self.filename_var.set("hello_kitty_schedule")
+        self.seed_var.set("")
         self.export_txt.set(True)
         self.export_xlsx.set(True)
         self.export_docx.set(True)
+        self.export_jsonl.set(False)
+        self.export_ics.set(False)
         self.status_var.set("🌸 Ready to create your magical Hello Kitty schedule! 🌸")
 
 def main():
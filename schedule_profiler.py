@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Per-stage cProfile capture of a schedule generation
+Used by generate_schedule(profile=True), the --profile CLI flag and the Streamlit Settings toggle
+
+Each stage (cache lookups, week generation, exporting, saving to the store, reporting) has
+its own profile. Only one is enabled at a time, so time spent in a nested stage is not
+counted twice.
+
+From Python 3.12 cProfile is process-wide: enabling a second profile raises ValueError,
+and an enabled profile records every thread. Profiled runs sharing a process (the web
+app's generation pool) therefore take turns: a run holds PROFILE_LOCK from entering its
+first stage until it leaves its outermost one, and its report warns that other threads'
+work may be included.
+"""
+
+import contextlib
+import cProfile
+import io
+import pstats
+import sys
+import threading
+
+PROFILE_TOP_N = 15
+PROFILE_LOCK = threading.Lock()
+PROFILES_ALL_THREADS = sys.version_info >= (3, 12)
+
+
+class RunProfiler:
+    def __init__(self):
+        self.profiles = {}
+        self.active = []
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Profile the body of the `with` block as stage `name`, pausing the enclosing stage.
+
+        The outermost stage waits for PROFILE_LOCK, so profiles of concurrent runs
+        are never enabled at the same time.
+        """
+        if self.active:
+            self.active[-1].disable()
+        else:
+            PROFILE_LOCK.acquire()
+        profile = self.profiles.setdefault(name, cProfile.Profile())
+        self.active.append(profile)
+        try:
+            profile.enable()
+            yield
+        finally:
+            profile.disable()
+            self.active.pop()
+            if self.active:
+                self.active[-1].enable()
+            else:
+                PROFILE_LOCK.release()
+
+    def profiled(self, name, iterable):
+        """Iterate `iterable`, profiling the work done for each item as stage `name`."""
+        iterator = iter(iterable)
+        while True:
+            with self.stage(name):
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def stats(self, name=None):
+        """pstats.Stats of one stage, or of every stage merged."""
+        profiles = [self.profiles[name]] if name is not None else list(self.profiles.values())
+        stats = pstats.Stats(profiles[0], stream=io.StringIO())
+        for profile in profiles[1:]:
+            stats.add(profile)
+        return stats
+
+    def report(self, top=PROFILE_TOP_N):
+        """Text summary: time per stage, then each stage's top functions by cumulative time."""
+        totals = {name: self.stats(name).total_tt for name in self.profiles}
+        overall = sum(totals.values()) or 1.0
+        lines = [f"Profiled {overall:.3f}s: " +
+                 ", ".join(f"{name} {seconds:.3f}s ({seconds / overall:.0%})"
+                           for name, seconds in sorted(totals.items(), key=lambda item: -item[1]))]
+        if PROFILES_ALL_THREADS:
+            lines.append("Note: on Python 3.12+ cProfile records every thread, so these stages also include "
+                         "work done by other threads (e.g. concurrent unprofiled generations) while they ran.")
+        for name, _ in sorted(totals.items(), key=lambda item: -item[1]):
+            stream = io.StringIO()
+            stats = self.stats(name)
+            stats.stream = stream
+            stats.strip_dirs().sort_stats("cumulative").print_stats(top)
+            lines.append(f"\n===== {name} =====")
+            lines.append(stream.getvalue().strip("\n"))
+        return "\n".join(lines) + "\n"
+
+    def dump(self, prefix, top=PROFILE_TOP_N):
+        """Write `prefix.pstats` (every stage merged) and the text report to `prefix.profile.txt`.
+
+        Returns (pstats path, report path, report text).
+        """
+        stats_file = f"{prefix}.pstats"
+        report_file = f"{prefix}.profile.txt"
+        self.stats().dump_stats(stats_file)
+        report = self.report(top)
+        with open(report_file, "w", encoding="utf-8") as f:
+            f.write(report)
+        return stats_file, report_file, report
+
+
+def main():
+    if len(sys.argv) not in (2, 3):
+        print("Usage: schedule_profiler.py FILE.pstats [TOP_N]")
+        sys.exit(1)
+    top = int(sys.argv[2]) if len(sys.argv) == 3 else PROFILE_TOP_N
+    pstats.Stats(sys.argv[1]).strip_dirs().sort_stats("cumulative").print_stats(top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Headless HTTP service for the Weekly Work Schedule Generator
+Pure-stdlib asyncio server; rendering runs in a process pool so the event loop stays responsive
+
+Endpoints:
+    GET  /health               -> {"status": "ok"}
+    POST /generate             -> Mode 1: {"date", "hours_per_week", "days", "start_week", "formats", "seed"}
+    POST /generate-total-hours -> Mode 2: {"date", "total_hours", "start_week", "formats", "seed"}
+
+Both also accept "sessions_per_day" and "min_gap" for split shifts.
+
+Rendered files are returned base64-encoded under "files", keyed by format.
+"""
+
+import argparse
+import asyncio
+import base64
+import io
+import json
+import multiprocessing
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import generate_schedule_cli_copy
+from feasibility import InfeasibleRequest, require_feasible
+
+MAX_BODY_BYTES = 64 * 1024
+MAX_DAYS = 3660  # ~10 years per request
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+def _number(payload, key, default=None):
+    value = payload.get(key, default)
+    if value is None:
+        raise ValueError(f"'{key}' is required.")
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"'{key}' must be a number.")
+    return value
+
+
+def _formats(payload, default=("txt",)):
+    formats = payload.get("formats", list(default))
+    if not isinstance(formats, list) or not formats:
+        raise ValueError("'formats' must be a non-empty list.")
+    if not all(isinstance(fmt, str) for fmt in formats):
+        raise ValueError("'formats' must be a list of format names.")
+    unknown = [fmt for fmt in formats if fmt not in generate_schedule_cli_copy.EXPORTERS]
+    if unknown:
+        raise ValueError(f"Unknown format(s): {', '.join(unknown)}")
+    return formats
+
+
+def render_request(mode, payload):
+    """Validate a request body and render the requested formats in memory.
+
+    Runs in a worker process. Raises ValueError for invalid requests.
+    """
+    if not isinstance(payload, dict):
+        raise ValueError("Request body must be a JSON object.")
+
+    date_str = payload.get("date")
+    if not isinstance(date_str, str):
+        raise ValueError("'date' (YYYY-MM-DD) is required.")
+    start_date = generate_schedule_cli_copy.get_monday(date_str)
+
+    start_week = _number(payload, "start_week", 1)
+
+    formats = _formats(payload)
+
+    seed = payload.get("seed")
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    elif isinstance(seed, bool) or not isinstance(seed, int):
+        raise ValueError("'seed' must be an integer.")
+
+    sessions_per_day = _number(payload, "sessions_per_day", 1)
+    min_gap = _number(payload, "min_gap", 30)
+    if mode == "weekly":
+        request = {"hours_per_week": _number(payload, "hours_per_week"), "total_days": _number(payload, "days")}
+    else:
+        request = {"total_overall_hours": _number(payload, "total_hours")}
+    check = require_feasible(start_week=start_week, sessions_per_day=sessions_per_day, min_gap=min_gap, **request)
+    hours_per_week, total_days = check["hours_per_week"], check["total_days"]
+    if total_days > MAX_DAYS:
+        raise ValueError(f"A schedule must cover between 1 and {MAX_DAYS} days.")
+    start_week, sessions_per_day, min_gap = int(start_week), int(sessions_per_day), int(min_gap)
+
+    buffers = {fmt: io.BytesIO() for fmt in formats}
+    result = generate_schedule_cli_copy.render_schedule(
+        start_date, hours_per_week, total_days, start_week, buffers, seed=seed,
+        name=payload.get("name", "schedule"), sessions_per_day=sessions_per_day, min_gap=min_gap
+    )
+    return {
+        "seed": seed,
+        "start_date": start_date.strftime("%Y-%m-%d"),
+        "total_days": total_days,
+        "hours_per_week": hours_per_week,
+        "total_hours": result["total_hours"],
+        "warnings": check["warnings"],
+        "files": {fmt: base64.b64encode(buffer.getvalue()).decode("ascii") for fmt, buffer in buffers.items()},
+    }
+
+
+class ScheduleServer:
+    ROUTES = {"/generate": "weekly", "/generate-total-hours": "total"}
+
+    def __init__(self, host="127.0.0.1", port=8080, workers=None):
+        self.host = host
+        self.port = port
+        # Workers start lazily, once the listener and the first connection are open. Spawned
+        # workers don't inherit those sockets, which forked ones would keep open.
+        self.pool = ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                                        mp_context=multiprocessing.get_context("spawn"))
+        self.server = None
+        self.connections = set()
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self):
+        self.server.close()
+        for task in self.connections:
+            task.cancel()
+        await asyncio.gather(*self.connections, return_exceptions=True)
+        await self.server.wait_closed()
+        self.pool.shutdown(cancel_futures=True)
+
+    async def dispatch(self, method, path, body):
+        if path == "/health":
+            return 200, {"status": "ok"}
+        mode = self.ROUTES.get(path)
+        if mode is None:
+            return 404, {"error": f"No such endpoint: {path}"}
+        if method != "POST":
+            return 405, {"error": "Use POST with a JSON body."}
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            return 400, {"error": "Request body is not valid JSON."}
+        try:
+            loop = asyncio.get_running_loop()
+            return 200, await loop.run_in_executor(self.pool, render_request, mode, payload)
+        except InfeasibleRequest as e:
+            return 400, {"error": str(e), "reasons": e.reasons}
+        except ValueError as e:
+            return 400, {"error": str(e)}
+        except Exception as e:
+            return 500, {"error": str(e)}
+
+    async def handle_connection(self, reader, writer):
+        """Serve HTTP/1.1 requests on one connection, honouring keep-alive."""
+        task = asyncio.current_task()
+        self.connections.add(task)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, version = request_line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY_BYTES:
+                    status, response = 413, {"error": "Request body too large."}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    status, response = await self.dispatch(method, path.split("?")[0], body)
+                    connection = headers.get("connection", "").lower()
+                    keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+
+                data = json.dumps(response).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            # Server shutting down; the connection is closed below
+            pass
+        finally:
+            self.connections.discard(task)
+            writer.close()
+
+
+async def serve(host, port, workers):
+    server = await ScheduleServer(host, port, workers).start()
+    print(f"🎀 Schedule service listening on http://{server.host}:{server.port} 🎀")
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.close()
+
+
+async def _client_worker(host, port, path, body, count, latencies, failures):
+    reader, writer = await asyncio.open_connection(host, port)
+    request = (f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+               f"Content-Length: {len(body)}\r\n\r\n").encode() + body
+    try:
+        for _ in range(count):
+            started = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status_line = await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - started)
+            if b" 200 " not in status_line:
+                failures.append(status_line.decode().strip())
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def load_test(requests, concurrency, payload, path="/generate", host=None, port=None, workers=None):
+    """Fire `requests` requests over `concurrency` keep-alive connections and report latency percentiles.
+
+    Without a host/port an in-process server on a free local port is started and stopped.
+    """
+    server = None
+    if port is None:
+        server = await ScheduleServer("127.0.0.1", 0, workers).start()
+        host, port = server.host, server.port
+    body = json.dumps(payload).encode()
+    latencies, failures = [], []
+    try:
+        # Warm the worker processes so imports are not counted
+        await asyncio.gather(*(_client_worker(host, port, path, body, 1, [], [])
+                               for _ in range(concurrency)))
+        started = time.perf_counter()
+        per_connection = [requests // concurrency + (1 if i < requests % concurrency else 0)
+                          for i in range(concurrency)]
+        await asyncio.gather(*(_client_worker(host, port, path, body, count, latencies, failures)
+                               for count in per_connection if count))
+        elapsed = time.perf_counter() - started
+    finally:
+        if server is not None:
+            await server.close()
+
+    cuts = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {
+        "requests": len(latencies),
+        "failures": len(failures),
+        "seconds": elapsed,
+        "requests_per_second": len(latencies) / elapsed,
+        "p50_ms": cuts[49] * 1000,
+        "p95_ms": cuts[94] * 1000,
+        "p99_ms": cuts[98] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="🎀 Hello Kitty schedule HTTP service")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="Run the HTTP service")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8080)
+    serve_parser.add_argument("--workers", type=int, default=None, help="Renderer processes (default: CPU count)")
+
+    bench_parser = commands.add_parser("bench", help="Load-test the service locally")
+    bench_parser.add_argument("--requests", type=int, default=2000)
+    bench_parser.add_argument("--concurrency", type=int, default=32)
+    bench_parser.add_argument("--days", type=int, default=7)
+    bench_parser.add_argument("--formats", default="txt", help="Comma-separated formats to render")
+    bench_parser.add_argument("--host", default="127.0.0.1")
+    bench_parser.add_argument("--port", type=int, default=None, help="Target a running server instead of an in-process one")
+    bench_parser.add_argument("--workers", type=int, default=None)
+
+    args = parser.parse_args()
+    if args.command == "serve":
+        try:
+            asyncio.run(serve(args.host, args.port, args.workers))
+        except KeyboardInterrupt:
+            print("\n👋 Goodbye!")
+    else:
+        payload = {"date": datetime.now().strftime("%Y-%m-%d"), "hours_per_week": 10,
+                   "days": args.days, "formats": args.formats.split(",")}
+        report = asyncio.run(load_test(args.requests, args.concurrency, payload,
+                                       host=args.host, port=args.port, workers=args.workers))
+        print(f"🌸 {report['requests']} requests ({report['failures']} failed) in {report['seconds']:.2f}s")
+        print(f"⚡ {report['requests_per_second']:.0f} requests/second")
+        print(f"⏱ p50 {report['p50_ms']:.1f} ms | p95 {report['p95_ms']:.1f} ms | p99 {report['p99_ms']:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
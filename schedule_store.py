@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+SQLite-backed store for generated schedules
+Keeps parameters, seed and per-day rows so schedules can be queried across runs
+"""
+
+import json
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+
+DEFAULT_DB_PATH = "schedules.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS schedules (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    employee TEXT NOT NULL,
+    params TEXT NOT NULL,
+    seed INTEGER NOT NULL,
+    start_date TEXT NOT NULL,
+    total_hours REAL NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS schedule_days (
+    schedule_id INTEGER NOT NULL REFERENCES schedules(id) ON DELETE CASCADE,
+    employee TEXT NOT NULL,
+    week INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    weekday TEXT NOT NULL,
+    minutes INTEGER NOT NULL,
+    start_time TEXT NOT NULL,
+    end_time TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_schedules_employee ON schedules(employee);
+CREATE INDEX IF NOT EXISTS idx_schedules_created_at ON schedules(created_at);
+CREATE INDEX IF NOT EXISTS idx_days_date ON schedule_days(date);
+CREATE INDEX IF NOT EXISTS idx_days_employee_date ON schedule_days(employee, date);
+CREATE INDEX IF NOT EXISTS idx_days_schedule_week ON schedule_days(schedule_id, week);
+"""
+
+# Queries about "who works when" only look at each employee's latest schedule,
+# so regenerating a schedule replaces the old one instead of double counting it.
+LATEST_SCHEDULES = "SELECT MAX(id) FROM schedules GROUP BY employee"
+
+
+class ScheduleStore:
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def save_schedule(self, params, seed, weeks, employee):
+        """Save one generated schedule and all its work sessions in a single transaction. Returns its id.
+
+        Split-shift days get one row per session.
+        """
+        total_minutes = sum(week["minutes"] for week in weeks)
+        start_date = weeks[0]["start"] if weeks else datetime.now()
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO schedules (employee, params, seed, start_date, total_hours, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (employee, json.dumps(params), seed, start_date.strftime("%Y-%m-%d"),
+                 total_minutes / 60, datetime.now().isoformat(timespec="seconds"))
+            )
+            schedule_id = cursor.lastrowid
+            self.conn.executemany(
+                "INSERT INTO schedule_days "
+                "(schedule_id, employee, week, date, weekday, minutes, start_time, end_time) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                ((schedule_id, employee, week["week"], day["date"].strftime("%Y-%m-%d"),
+                  day["weekday"], session["minutes"], session["start"], session["end"])
+                 for week in weeks for day in week["days"] for session in day["sessions"])
+            )
+        return schedule_id
+
+    def get_schedule(self, schedule_id):
+        """Return the stored parameters and seed of a schedule, or None."""
+        row = self.conn.execute("SELECT * FROM schedules WHERE id = ?", (schedule_id,)).fetchone()
+        if row is None:
+            return None
+        schedule = dict(row)
+        schedule["params"] = json.loads(schedule["params"])
+        return schedule
+
+    def schedule_days(self, schedule_id, week=None):
+        """All days of a schedule, optionally limited to one week number."""
+        query = "SELECT * FROM schedule_days WHERE schedule_id = ?"
+        args = [schedule_id]
+        if week is not None:
+            query += " AND week = ?"
+            args.append(week)
+        return [dict(row) for row in self.conn.execute(query + " ORDER BY date", args)]
+
+    def who_works_on(self, date):
+        """Employees working on `date` (YYYY-MM-DD) with their time slots."""
+        rows = self.conn.execute(
+            "SELECT employee, start_time, end_time, minutes, schedule_id FROM schedule_days "
+            f"WHERE date = ? AND schedule_id IN ({LATEST_SCHEDULES}) ORDER BY start_time, employee",
+            (date,)
+        )
+        return [dict(row) for row in rows]
+
+    def hours_per_employee(self, year, month):
+        """Total scheduled hours per employee for one calendar month."""
+        first_day = datetime(year, month, 1)
+        next_month = (first_day + timedelta(days=32)).replace(day=1)
+        rows = self.conn.execute(
+            "SELECT employee, SUM(minutes) AS minutes FROM schedule_days "
+            f"WHERE date >= ? AND date < ? AND schedule_id IN ({LATEST_SCHEDULES}) "
+            "GROUP BY employee ORDER BY employee",
+            (first_day.strftime("%Y-%m-%d"), next_month.strftime("%Y-%m-%d"))
+        )
+        return {row["employee"]: row["minutes"] / 60 for row in rows}
+
+    def schedules_generated_this_week(self, today=None):
+        """Schedules created since Monday of the current (or given) week."""
+        today = today or datetime.now()
+        monday = (today - timedelta(days=today.weekday())).strftime("%Y-%m-%d")
+        rows = self.conn.execute(
+            "SELECT id, employee, seed, start_date, total_hours, created_at FROM schedules "
+            "WHERE created_at >= ? ORDER BY created_at",
+            (monday,)
+        )
+        return [dict(row) for row in rows]
+
+
+def main():
+    usage = ("Usage: schedule_store.py who-works YYYY-MM-DD | hours YYYY-MM | this-week "
+             "[--db PATH]")
+    args = sys.argv[1:]
+    db_path = DEFAULT_DB_PATH
+    if "--db" in args:
+        index = args.index("--db")
+        db_path = args[index + 1]
+        del args[index:index + 2]
+
+    if not args:
+        print(usage)
+        sys.exit(1)
+
+    with ScheduleStore(db_path) as store:
+        command = args[0]
+        if command == "who-works" and len(args) == 2:
+            for row in store.who_works_on(args[1]):
+                print(f"🎀 {row['employee']}: {row['start_time']}–{row['end_time']} ({row['minutes']} min)")
+        elif command == "hours" and len(args) == 2:
+            year, month = (int(part) for part in args[1].split("-"))
+            for employee, hours in store.hours_per_employee(year, month).items():
+                print(f"🌸 {employee}: {hours:.2f} hours")
+        elif command == "this-week":
+            for row in store.schedules_generated_this_week():
+                print(f"📅 #{row['id']} {row['employee']} from {row['start_date']} "
+                      f"({row['total_hours']:.2f}h, seed {row['seed']}) at {row['created_at']}")
+        else:
+            print(usage)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
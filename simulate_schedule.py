@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo simulation of the schedule generator
+Draws millions of weekly splits and start times with NumPy, following the same steps as
+split_weekly_minutes, random_start_time and the weekly adjustment in generate_schedule,
+and reports how the results are distributed
+"""
+
+import argparse
+
+import numpy as np
+
+# Mirrors the constants in split_weekly_minutes / random_start_time
+UNIT = 30
+MIN_DAY_UNITS = 1     # 30 minutes
+MAX_DAY_UNITS = 4     # 120 minutes
+MAX_WEEKLY_MINUTES = 15 * 60
+MAX_ATTEMPTS = 100
+EARLIEST_START = 9 * 60
+LATEST_END = 18 * 60
+
+
+def simulate_weekly_splits(total_minutes, samples, rng):
+    """Vectorised split_weekly_minutes: returns (minutes per day, attempts cap hit, fallback used, minutes left over).
+
+    Works in 30-minute units on a (samples, 7) array, running each step of the scalar
+    algorithm for all samples at once.
+    """
+    if total_minutes > MAX_WEEKLY_MINUTES:
+        raise ValueError("Total weekly minutes must not exceed 900 (15 hours).")
+    if total_minutes < UNIT:
+        raise ValueError("Total weekly minutes must be at least 30.")
+
+    units = round(total_minutes / UNIT)
+    rows = np.arange(samples)[:, None]
+    result = np.zeros((samples, 7), dtype=np.int8)
+
+    # Step 2: pre-fill the first days of a random order with the 30-minute minimum
+    prefill_order = np.argsort(rng.random((samples, 7)), axis=1)
+    prefilled = min(7, units // MIN_DAY_UNITS)
+    result[rows, prefill_order[:, :prefilled]] = MIN_DAY_UNITS
+    remaining = np.full(samples, units - prefilled * MIN_DAY_UNITS, dtype=np.int16)
+
+    # Step 3: rounds of shuffled 30-minute blocks capped at 120 per day
+    attempts = np.zeros(samples, dtype=np.int16)
+    active = remaining >= 1
+    while active.any():
+        attempts[active] += 1
+        order = np.argsort(rng.random((samples, 7)), axis=1)
+        distributed = np.zeros(samples, dtype=bool)
+        for position in range(7):
+            day = order[:, position]
+            current = result[np.arange(samples), day]
+            add = active & (remaining >= 1) & (current + 1 <= MAX_DAY_UNITS)
+            result[np.arange(samples)[add], day[add]] += 1
+            remaining[add] -= 1
+            distributed |= add
+        active &= distributed & (remaining >= 1) & (attempts < MAX_ATTEMPTS)
+
+    cap_hit = (attempts >= MAX_ATTEMPTS) & (remaining >= 1)
+
+    # Final fallback: put all leftover units on the first day that can take them
+    fallback = np.zeros(samples, dtype=bool)
+    for day in range(7):
+        fits = (remaining > 0) & (result[:, day] + remaining <= MAX_DAY_UNITS)
+        result[fits, day] += remaining[fits].astype(np.int8)
+        remaining[fits] = 0
+        fallback |= fits
+
+    return result.astype(np.int16) * UNIT, cap_hit, fallback, remaining.astype(np.int16) * UNIT
+
+
+def adjust_full_week(week_minutes, total_minutes):
+    """The adjustment in generate_schedule: any shortfall against the weekly total lands on the last day."""
+    scheduled = week_minutes.copy()
+    scheduled[:, 6] += total_minutes - scheduled.sum(axis=1)
+    return scheduled
+
+
+def simulate_start_times(day_minutes, rng):
+    """Vectorised random_start_time for every worked day; returns (start minutes, 09:00 fallback used)."""
+    durations = day_minutes[day_minutes > 0]
+    latest_start = LATEST_END - durations
+    fallback = latest_start < EARLIEST_START
+    slot_count = np.where(fallback, 1, (latest_start - EARLIEST_START) // UNIT + 1)
+    starts = EARLIEST_START + UNIT * np.floor(rng.random(durations.size) * slot_count).astype(np.int32)
+    starts[fallback] = EARLIEST_START
+    return starts, fallback
+
+
+def histogram(values):
+    keys, counts = np.unique(values, return_counts=True)
+    return dict(zip(keys.tolist(), (counts / values.size).tolist()))
+
+
+def simulate(weekly_minutes, samples, seed=None):
+    """Simulate `samples` full weeks at `weekly_minutes` and return the distribution report."""
+    rng = np.random.default_rng(seed)
+    split, cap_hit, fallback, leftover = simulate_weekly_splits(weekly_minutes, samples, rng)
+    scheduled = adjust_full_week(split, round(weekly_minutes / UNIT) * UNIT)
+    starts, start_fallback = simulate_start_times(scheduled, rng)
+    worked_days = scheduled[scheduled > 0]
+    return {
+        "weekly_minutes": weekly_minutes,
+        "samples": samples,
+        "daily_minutes": histogram(worked_days),
+        "start_times": histogram(starts),
+        "mean_minutes_by_weekday": scheduled.mean(axis=0).tolist(),
+        "attempt_cap_rate": cap_hit.mean(),
+        "split_fallback_rate": fallback.mean(),
+        "leftover_rate": (leftover > 0).mean(),
+        "over_max_day_rate": (scheduled > MAX_DAY_UNITS * UNIT).any(axis=1).mean(),
+        "start_fallback_rate": start_fallback.size and start_fallback.mean(),
+    }
+
+
+def print_report(report):
+    weekdays = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+    print(f"\n🎀 {report['weekly_minutes']} min/week over {report['samples']:,} simulated weeks 🎀")
+    print("📊 Daily minutes (worked days):")
+    for minutes, share in report["daily_minutes"].items():
+        print(f"   {minutes:>4} min  {share:7.2%}  {'█' * round(share * 50)}")
+    print("⏰ Start times:")
+    for start, share in report["start_times"].items():
+        print(f"   {start // 60:02d}:{start % 60:02d}  {share:7.2%}  {'█' * round(share * 100)}")
+    print("📅 Mean minutes by weekday: " + ", ".join(
+        f"{day} {mean:.1f}" for day, mean in zip(weekdays, report["mean_minutes_by_weekday"])))
+    print(f"🔁 100-attempt cap hit:          {report['attempt_cap_rate']:.4%}")
+    print(f"🧩 Leftover-minutes fallback:    {report['split_fallback_rate']:.4%}")
+    print(f"⚠️ Minutes the split could not place: {report['leftover_rate']:.4%} of weeks")
+    print(f"⚠️ Weeks with a day over 120 min: {report['over_max_day_rate']:.4%}")
+    print(f"🕘 09:00 start fallback:          {report['start_fallback_rate']:.4%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="🎀 Monte Carlo analysis of generated schedules")
+    parser.add_argument("--weekly-hours", type=float, nargs="+", default=[10, 14, 14.5, 15],
+                        help="Weekly totals to simulate")
+    parser.add_argument("--samples", type=int, default=1_000_000, help="Simulated weeks per total")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    for hours in args.weekly_hours:
+        print_report(simulate(round(hours * 60), args.samples, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -8,9 +8,14 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
 import generate_schedule_cli_copy
+import bulk_generation
+from artifact_cache import ArtifactCache
+from feasibility import check_schedule
 import os
 import io
 import base64
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # Page configuration
 st.set_page_config(
@@ -20,212 +25,24 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for Hello Kitty theme with improved UX
-st.markdown("""
-<style>
-    /* Make sidebar wider and collapsible */
-    section[data-testid="stSidebar"] {
-        min-width: 350px !important;
-        max-width: 400px !important;
-    }
-    
-    /* Main container styling */
-    .main-header {
-        background: linear-gradient(135deg, #ffe6f2 0%, #fff0f5 50%, #ffe6f2 100%);
-        padding: 1.5rem 1rem;
-        border-radius: 15px;
-        border: 3px solid #ff69b4;
-        margin-bottom: 1.5rem;
-        box-shadow: 0 6px 24px rgba(255, 105, 180, 0.2);
-    }
-    
-    /* Smaller card styling */
-    .card {
-        background: linear-gradient(135deg, #fff8fa 0%, #fff0f5 100%);
-        padding: 0.75rem 1rem;
-        border-radius: 10px;
-        border: 2px solid #ffb6c1;
-        margin-bottom: 1rem;
-        box-shadow: 0 2px 8px rgba(255, 182, 193, 0.10);
-        transition: transform 0.2s ease, box-shadow 0.2s ease;
-        font-size: 1rem;
-    }
-    
-    .card:hover {
-        transform: translateY(-1px);
-        box-shadow: 0 4px 12px rgba(255, 182, 193, 0.20);
-    }
-    
-    .card h3 {
-        margin-bottom: 0.5rem;
-        font-size: 1.15rem;
-    }
-    
-    /* Sidebar tips styling */
-    .kitty-tips-list {
-        color: #c71585;
-        font-family: 'Comic Sans MS', cursive;
-        font-size: 1.05rem;
-        line-height: 1.7;
-        margin-left: 0.5rem;
-        margin-bottom: 0.5rem;
-    }
-    
-    .kitty-tips-list li {
-        margin-bottom: 0.3rem;
-    }
-    
-    .success-message {
-        background: linear-gradient(135deg, #e8f5e8 0%, #f0fff0 100%);
-        padding: 1rem;
-        border-radius: 10px;
-        border: 2px solid #90ee90;
-        margin: 1rem 0;
-        box-shadow: 0 2px 8px rgba(144, 238, 144, 0.2);
-    }
-    
-    .error-message {
-        background: linear-gradient(135deg, #ffe6e6 0%, #fff0f0 100%);
-        padding: 1rem;
-        border-radius: 10px;
-        border: 2px solid #ff6b6b;
-        margin: 1rem 0;
-        box-shadow: 0 2px 8px rgba(255, 107, 107, 0.2);
-    }
-    
-    /* Button styling */
-    .stButton > button {
-        background: linear-gradient(135deg, #ff1493 0%, #ff69b4 100%);
-        color: white;
-        border: none;
-        border-radius: 20px;
-        padding: 0.6rem 1.5rem;
-        font-weight: bold;
-        font-size: 1rem;
-        transition: all 0.3s ease;
-        box-shadow: 0 3px 12px rgba(255, 20, 147, 0.3);
-    }
-    
-    .stButton > button:hover {
-        background: linear-gradient(135deg, #dc143c 0%, #ff1493 100%);
-        transform: translateY(-2px);
-        box-shadow: 0 6px 20px rgba(255, 20, 147, 0.4);
-    }
-    
-    .secondary-button {
-        background: linear-gradient(135deg, #98fb98 0%, #90ee90 100%) !important;
-        color: #006400 !important;
-    }
-    
-    .secondary-button:hover {
-        background: linear-gradient(135deg, #90ee90 0%, #7cfc00 100%) !important;
-    }
-    
-    .exit-button {
-        background: linear-gradient(135deg, #87ceeb 0%, #87cefa 100%) !important;
-        color: #000080 !important;
-    }
-    
-    .exit-button:hover {
-        background: linear-gradient(135deg, #87cefa 0%, #00bfff 100%) !important;
-    }
-    
-    /* Form styling */
-    .stTextInput > div > div > input {
-        border-radius: 8px;
-        border: 2px solid #ffb6c1;
-        padding: 0.4rem;
-    }
-    
-    .stNumberInput > div > div > input {
-        border-radius: 8px;
-        border: 2px solid #ffb6c1;
-        padding: 0.4rem;
-    }
-    
-    .stDateInput > div > div > input {
-        border-radius: 8px;
-        border: 2px solid #ffb6c1;
-        padding: 0.4rem;
-    }
-    
-    /* Radio button styling */
-    .stRadio > div > div > label {
-        background: linear-gradient(135deg, #fff8fa 0%, #ffe6f2 100%);
-        border: 2px solid #ffb6c1;
-        border-radius: 8px;
-        padding: 0.6rem;
-        margin: 0.2rem 0;
-        transition: all 0.2s ease;
-    }
-    
-    .stRadio > div > div > label:hover {
-        background: linear-gradient(135deg, #ffe6f2 0%, #ffb6c1 100%);
-        transform: translateX(3px);
-    }
-    
-    /* Checkbox styling */
-    .stCheckbox > div > div > label {
-        background: linear-gradient(135deg, #fff8fa 0%, #ffe6f2 100%);
-        border: 2px solid #ffb6c1;
-        border-radius: 6px;
-        padding: 0.4rem;
-        margin: 0.2rem 0;
-        transition: all 0.2s ease;
-    }
-    
-    .stCheckbox > div > div > label:hover {
-        background: linear-gradient(135deg, #ffe6f2 0%, #ffb6c1 100%);
-    }
-    
-    /* Download button styling */
-    .stDownloadButton > button {
-        background: linear-gradient(135deg, #ff69b4 0%, #ff1493 100%);
-        color: white;
-        border: none;
-        border-radius: 15px;
-        padding: 0.4rem 1.2rem;
-        font-weight: bold;
-        margin: 0.4rem 0;
-        transition: all 0.3s ease;
-        box-shadow: 0 3px 12px rgba(255, 105, 180, 0.3);
-    }
-    
-    .stDownloadButton > button:hover {
-        background: linear-gradient(135deg, #ff1493 0%, #dc143c 100%);
-        transform: translateY(-1px);
-        box-shadow: 0 4px 16px rgba(255, 105, 180, 0.4);
-    }
-    
-    /* Responsive design */
-    @media (max-width: 768px) {
-        .main-header {
-            padding: 1rem;
-            margin-bottom: 1rem;
-        }
-        
-        .card {
-            padding: 0.6rem 0.8rem;
-            margin-bottom: 0.8rem;
-        }
-        
-        .stButton > button {
-            padding: 0.4rem 1.2rem;
-            font-size: 0.9rem;
-        }
-        
-        section[data-testid="stSidebar"] {
-            min-width: 280px !important;
-            max-width: 320px !important;
-        }
-    }
-    
-    /* Hide Streamlit default elements */
-    #MainMenu {visibility: hidden;}
-    footer {visibility: hidden;}
-    header {visibility: hidden;}
-</style>
-""", unsafe_allow_html=True)
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+@st.cache_data
+def load_theme_css():
+    """The Hello Kitty stylesheet, read from disk once per server process"""
+    with open(os.path.join(APP_DIR, "hello_kitty_theme.css"), encoding="utf-8") as f:
+        return f"<style>\n{f.read()}</style>"
+
+@st.cache_data
+def load_sidebar_image():
+    """Bytes of hello_kitty.png or hello_kitty.jpg, read once per server process; None when neither exists"""
+    for path in ("hello_kitty.png", "hello_kitty.jpg"):
+        if os.path.exists(path):
+            return read_file_bytes(path)
+    return None
+
+# Custom CSS for Hello Kitty theme; fragment reruns skip this, so it is only sent on full page runs
+st.markdown(load_theme_css(), unsafe_allow_html=True)
 
 def main():
     # Main header with Hello Kitty theme
@@ -258,10 +75,9 @@ def main():
         """, unsafe_allow_html=True)
         
         # Add Hello Kitty image if available
-        if os.path.exists("hello_kitty.png"):
-            st.image("hello_kitty.png", width=150)
-        elif os.path.exists("hello_kitty.jpg"):
-            st.image("hello_kitty.jpg", width=150)
+        sidebar_image = load_sidebar_image()
+        if sidebar_image is not None:
+            st.image(sidebar_image, width=150)
         
         # Quick start guide
         with st.expander("🚀 Quick Start Guide", expanded=False):
@@ -279,251 +95,326 @@ def main():
     
     # Main content area with improved layout
     # Use tabs for better organization
-    tab1, tab2, tab3 = st.tabs(["🎀 Schedule Generator", "📊 Preview", "⚙️ Settings"])
+    tab1, tab2, tab_bulk, tab3 = st.tabs(["🎀 Schedule Generator", "📊 Preview", "📦 Bulk Generation", "⚙️ Settings"])
     
     with tab1:
-        # Mode selection with better visual separation
+        show_generator_form()
+    
+    with tab2:
         st.markdown("""
         <div class="card">
             <h3 style="color: #ff69b4; font-family: 'Comic Sans MS', cursive; text-align: center;">
-                🎀 Choose Your Magic Mode 🎀
+                📊 Schedule Preview
             </h3>
         </div>
         """, unsafe_allow_html=True)
-        
-        mode = st.radio(
-            "Select Generation Mode:",
-            ["🌸 Mode 1: Input total weekly hours", "🎀 Mode 2: Input total overall hours"],
-            format_func=lambda x: x.split(": ")[1] if ": " in x else x,
-            help="Mode 1: Set weekly hours and days. Mode 2: Set total hours (auto-distributed)"
-        )
-        
-        # Initialize variables to avoid UnboundLocalError
-        total_hours = 0
-        total_days = 0
-        total_overall_hours = 0
-        
-        # Schedule parameters in a more organized layout
+        show_preview()
+        show_downloads()
+    
+    with tab_bulk:
         st.markdown("""
         <div class="card">
             <h3 style="color: #ff69b4; font-family: 'Comic Sans MS', cursive; text-align: center;">
-                🌸 Schedule Parameters 🌸
+                📦 Bulk Generation
             </h3>
         </div>
         """, unsafe_allow_html=True)
-        
-        # Use columns for better input organization
-        col_date, col_week = st.columns(2)
-        
-        with col_date:
-            start_date = st.date_input(
-                "🎀 Start Date:",
-                value=datetime.now(),
-                format="YYYY-MM-DD",
-                help="Choose the starting date for your schedule"
-            )
-        
-        with col_week:
-            start_week = st.number_input(
-                "🎀 Starting Week Number:",
-                min_value=1,
-                value=1,
-                step=1,
-                help="Set the week number to start from"
-            )
-        
-        # Mode-specific inputs with better spacing
-        if "weekly" in mode:
-            st.markdown("### 📅 Mode 1: Weekly Schedule")
-            col_hours, col_days = st.columns(2)
-            
-            with col_hours:
-                total_hours = st.number_input(
-                    "🌸 Total Weekly Hours:",
-                    min_value=0.5,
-                    max_value=15.0,
-                    value=10.0,
-                    step=0.5,
-                    help="Maximum 15 hours per week"
-                )
-            
-            with col_days:
-                total_days = st.number_input(
-                    "🎀 Total Days:",
-                    min_value=1,
-                    value=7,
-                    step=1,
-                    help="Number of days to generate schedule for"
-                )
-        else:
-            st.markdown("### 📅 Mode 2: Total Hours Schedule")
-            total_overall_hours = st.number_input(
-                "🌸 Total Overall Hours:",
-                min_value=0.5,
-                value=50.0,
-                step=0.5,
-                help="Total hours to distribute across weeks"
-            )
-        
-        # Output settings with better organization
+        show_bulk_generation()
+    
+    with tab3:
         st.markdown("""
         <div class="card">
             <h3 style="color: #ff69b4; font-family: 'Comic Sans MS', cursive; text-align: center;">
-                🎀 Output Settings 🎀
+                ⚙️ App Settings
             </h3>
         </div>
         """, unsafe_allow_html=True)
-        
-        filename = st.text_input(
-            "🌸 Filename:",
-            value="hello_kitty_schedule",
-            help="Files will be saved with this name (no spaces recommended)"
+        show_settings()
+
+@st.fragment
+def show_generator_form():
+    """Schedule form; editing it reruns only this fragment, not the whole page"""
+    # Mode selection with better visual separation
+    st.markdown("""
+    <div class="card">
+        <h3 style="color: #ff69b4; font-family: 'Comic Sans MS', cursive; text-align: center;">
+            🎀 Choose Your Magic Mode 🎀
+        </h3>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    mode = st.radio(
+        "Select Generation Mode:",
+        ["🌸 Mode 1: Input total weekly hours", "🎀 Mode 2: Input total overall hours"],
+        format_func=lambda x: x.split(": ")[1] if ": " in x else x,
+        help="Mode 1: Set weekly hours and days. Mode 2: Set total hours (auto-distributed)"
+    )
+    
+    # Initialize variables to avoid UnboundLocalError
+    total_hours = 0
+    total_days = 0
+    total_overall_hours = 0
+    
+    # Schedule parameters in a more organized layout
+    st.markdown("""
+    <div class="card">
+        <h3 style="color: #ff69b4; font-family: 'Comic Sans MS', cursive; text-align: center;">
+            🌸 Schedule Parameters 🌸
+        </h3>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Use columns for better input organization
+    col_date, col_week = st.columns(2)
+    
+    with col_date:
+        start_date = st.date_input(
+            "🎀 Start Date:",
+            value=datetime.now(),
+            format="YYYY-MM-DD",
+            help="Choose the starting date for your schedule"
         )
-        
-        st.markdown("**📄 Export Formats:**")
-        col_export1, col_export2, col_export3 = st.columns(3)
-        with col_export1:
-            export_txt = st.checkbox("📄 Text File", value=True, help="Human-readable schedule")
-        with col_export2:
-            export_xlsx = st.checkbox("📊 Excel File", value=True, help="Spreadsheet format")
-        with col_export3:
-            export_docx = st.checkbox("📝 Word File", value=True, help="Document format")
-        
-        # Action buttons with better spacing
-        st.markdown("---")
-        st.markdown("### 🌸 Generate Your Schedule")
-        
-        col_generate, col_clear, col_exit = st.columns([2, 1, 1])
-        
-        with col_generate:
-            if st.button("🌸 Generate Magic Schedule 🌸", use_container_width=True, type="primary"):
-                generate_schedule_web(filename, mode, total_hours, total_days, total_overall_hours, start_date, start_week, export_txt, export_xlsx, export_docx)
-        
-        with col_clear:
-            if st.button("🎀 Clear Form", use_container_width=True, key="clear"):
-                st.rerun()
-        
-        with col_exit:
-            if st.button("🌸 Exit", use_container_width=True, key="exit"):
-                st.stop()
     
-    with tab2:
+    with col_week:
+        start_week = st.number_input(
+            "🎀 Starting Week Number:",
+            min_value=1,
+            value=1,
+            step=1,
+            help="Set the week number to start from"
+        )
+    
+    # Mode-specific inputs with better spacing
+    if "weekly" in mode:
+        st.markdown("### 📅 Mode 1: Weekly Schedule")
+        col_hours, col_days = st.columns(2)
+    
+        with col_hours:
+            total_hours = st.number_input(
+                "🌸 Total Weekly Hours:",
+                min_value=0.5,
+                max_value=15.0,
+                value=10.0,
+                step=0.5,
+                help="Maximum 15 hours per week"
+            )
+    
+        with col_days:
+            total_days = st.number_input(
+                "🎀 Total Days:",
+                min_value=1,
+                value=7,
+                step=1,
+                help="Number of days to generate schedule for"
+            )
+    else:
+        st.markdown("### 📅 Mode 2: Total Hours Schedule")
+        total_overall_hours = st.number_input(
+            "🌸 Total Overall Hours:",
+            min_value=0.5,
+            value=50.0,
+            step=0.5,
+            help="Total hours to distribute across weeks"
+        )
+    
+    # Output settings with better organization
+    st.markdown("""
+    <div class="card">
+        <h3 style="color: #ff69b4; font-family: 'Comic Sans MS', cursive; text-align: center;">
+            🎀 Output Settings 🎀
+        </h3>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    filename = st.text_input(
+        "🌸 Filename:",
+        value="hello_kitty_schedule",
+        help="Files will be saved with this name (no spaces recommended)"
+    )
+    
+    seed_text = st.text_input(
+        "🎲 Seed (optional):",
+        value="",
+        help="Reuse a seed to get the same schedule again - repeat runs are served from the cache"
+    )
+    
+    st.markdown("**📄 Export Formats:**")
+    col_export1, col_export2, col_export3 = st.columns(3)
+    with col_export1:
+        export_txt = st.checkbox("📄 Text File", value=True, help="Human-readable schedule")
+    with col_export2:
+        export_xlsx = st.checkbox("📊 Excel File", value=True, help="Spreadsheet format")
+    with col_export3:
+        export_docx = st.checkbox("📝 Word File", value=True, help="Document format")
+    col_export4, col_export5, _ = st.columns(3)
+    with col_export4:
+        export_jsonl = st.checkbox("🗂 JSON Lines", value=False, help="One JSON record per work day")
+    with col_export5:
+        export_ics = st.checkbox("📆 Calendar (.ics)", value=False, help="One calendar event per work session")
+    
+    # Action buttons with better spacing
+    st.markdown("---")
+    st.markdown("### 🌸 Generate Your Schedule")
+    
+    col_generate, col_clear, col_exit = st.columns([2, 1, 1])
+    
+    with col_generate:
+        if st.button("🌸 Generate Magic Schedule 🌸", use_container_width=True, type="primary"):
+            generate_schedule_web(filename, mode, total_hours, total_days, total_overall_hours, start_date, start_week, export_txt, export_xlsx, export_docx, export_jsonl, export_ics, seed_text)
+    
+    with col_clear:
+        if st.button("🎀 Clear Form", use_container_width=True, key="clear"):
+            st.rerun()
+    
+    with col_exit:
+        if st.button("🌸 Exit", use_container_width=True, key="exit"):
+            st.stop()
+    
+    # Progress of a running generation, then the outcome of the last one
+    if 'generation_job' in st.session_state:
+        show_generation_progress()
+    if 'generation_message' in st.session_state:
+        kind, message = st.session_state.pop('generation_message')
+        getattr(st, kind)(message)
+
+@st.fragment
+def show_preview():
+    """Preview of the last generated schedule; paging through it reruns only this fragment"""
+    if 'schedule_generated' not in st.session_state:
         st.markdown("""
         <div class="card">
-            <h3 style="color: #ff69b4; font-family: 'Comic Sans MS', cursive; text-align: center;">
-                📊 Schedule Preview
-            </h3>
+            <p style="text-align: center; color: #c71585;">
+                Generate a schedule first to see the preview here! 🌸
+            </p>
         </div>
         """, unsafe_allow_html=True)
-        
-        # Check if schedule has been generated
-        if 'schedule_generated' not in st.session_state:
-            st.markdown("""
-            <div class="card">
-                <p style="text-align: center; color: #c71585;">
-                    Generate a schedule first to see the preview here! 🌸
-                </p>
-            </div>
-            """, unsafe_allow_html=True)
-        else:
-            # Show the generated schedule preview
-            filename = st.session_state.get('last_filename', '')
-            
-            # Text file preview
-            if os.path.exists(f"{filename}.txt"):
-                st.markdown("### 📄 Text Schedule Preview")
-                with open(f"{filename}.txt", "r") as f:
-                    schedule_text = f.read()
-                    st.text_area("Schedule Content", schedule_text, height=400, disabled=True)
-            
-            # Excel file preview
-            if os.path.exists(f"{filename}.xlsx"):
-                st.markdown("### 📊 Excel Schedule Preview")
-                try:
-                    df = pd.read_excel(f"{filename}.xlsx")
-                    st.dataframe(df, use_container_width=True)
-                except Exception as e:
-                    st.error(f"Could not load Excel preview: {str(e)}")
-            
-            # Word file preview (show as text since we can't preview .docx directly)
-            if os.path.exists(f"{filename}.docx"):
-                st.markdown("### 📝 Word Document Created")
-                st.info("📄 Word document has been created and saved to your local directory.")
-            
-            # Clear preview button
-            if st.button("🎀 Clear Preview", key="clear_preview"):
-                if 'schedule_generated' in st.session_state:
-                    del st.session_state['schedule_generated']
-                if 'last_filename' in st.session_state:
-                    del st.session_state['last_filename']
-                st.rerun()
-            
-            # Download buttons for all formats
-        st.markdown("### ⬇️ Download Your Hello Kitty Schedule")
+        return
+    
+    filename = st.session_state.get('last_filename', '')
+    last_result = st.session_state.get('last_result')
+    if last_result is not None and last_result.get("weeks"):
+        show_schedule_preview(last_result)
+    if last_result is not None and "profile" in last_result:
+        show_profile_report(last_result["profile"])
+    
+    # Word file preview (show as text since we can't preview .docx directly)
+    if os.path.exists(f"{filename}.docx"):
+        st.markdown("### 📝 Word Document Created")
+        st.info("📄 Word document has been created and saved to your local directory.")
+    
+    # Clear preview button; the downloads below go too, so the whole page reruns
+    if st.button("🎀 Clear Preview", key="clear_preview"):
+        for key in ('schedule_generated', 'last_filename', 'last_result'):
+            st.session_state.pop(key, None)
+        st.rerun()
 
-        col1, col2, col3 = st.columns(3)
+# (extension, label, MIME type, help) of every per-format download button
+DOWNLOAD_BUTTONS = [
+    ("txt", "🌸 Download TXT", "text/plain", "Download as plain text"),
+    ("xlsx", "🎀 Download XLSX", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+     "Download as Excel"),
+    ("docx", "💖 Download DOCX", "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+     "Download as Word"),
+    ("jsonl", "🗂 Download JSONL", "application/jsonl", "Download as JSON Lines"),
+    ("ics", "📆 Download ICS", "text/calendar", "Download as calendar events"),
+]
 
-        with col1:
-            if os.path.exists(f"{filename}.txt"):
-                with open(f"{filename}.txt", "r") as f:
-                    st.download_button(
-                        label="🌸 Download TXT",
-                        data=f.read(),
-                        file_name=f"{filename}.txt",
-                        mime="text/plain",
-                        help="Download as plain text"
-                    )
-        with col2:
-            if os.path.exists(f"{filename}.xlsx"):
-                with open(f"{filename}.xlsx", "rb") as f:
-                    st.download_button(
-                        label="🎀 Download XLSX",
-                        data=f.read(),
-                        file_name=f"{filename}.xlsx",
-                        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                        help="Download as Excel"
-                    )
-        with col3:
-            if os.path.exists(f"{filename}.docx"):
-                with open(f"{filename}.docx", "rb") as f:
+@st.fragment
+def show_downloads():
+    """Download buttons for the last schedule; files are only read from disk when a button is clicked"""
+    st.markdown("### ⬇️ Download Your Hello Kitty Schedule")
+    filename = st.session_state.get('last_filename')
+    if not filename:
+        return
+    
+    for buttons in (DOWNLOAD_BUTTONS[:3], DOWNLOAD_BUTTONS[3:]):
+        for column, (extension, label, mime, help_text) in zip(st.columns(3), buttons):
+            path = f"{filename}.{extension}"
+            if os.path.exists(path):
+                with column:
                     st.download_button(
-                        label="💖 Download DOCX",
-                        data=f.read(),
-                        file_name=f"{filename}.docx",
-                        mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                        help="Download as Word"
+                        label=label,
+                        data=lambda path=path: read_file_bytes(path),
+                        file_name=path,
+                        mime=mime,
+                        help=help_text,
+                        on_click="ignore"
                     )
     
-    with tab3:
-        st.markdown("""
-        <div class="card">
-            <h3 style="color: #ff69b4; font-family: 'Comic Sans MS', cursive; text-align: center;">
-                ⚙️ App Settings
-            </h3>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        st.info("🌸 This is the Hello Kitty Schedule Generator - a magical tool for creating work schedules!")
-        
-        # App information
-        st.markdown("### 📋 App Information")
-        st.markdown("""
-        - **Version**: 2.0 (Web Edition)
-        - **Theme**: Hello Kitty Pink
-        - **Framework**: Streamlit
-        - **Features**: Multiple export formats, responsive design
-        """)
-        
-        # Contact/Support
-        st.markdown("### 🎀 Support")
-        st.markdown("""
-        If you love this app, please give it a ⭐ star on GitHub!
-        
-        **Repository**: [Weekly-Work-Schedule-Generator-Hello-Kitty-WEB](https://github.com/candyyetszyu/Weekly-Work-Schedule-Generator-Hello-Kitty-WEB)
-        """)
+    # One ZIP with every selected format, rendered in memory only when clicked
+    last_result = st.session_state.get('last_result')
+    if last_result is not None and last_result["formats"]:
+        st.download_button(
+            label="📦 Download All (ZIP)",
+            data=lambda: build_zip_bundle(last_result, filename),
+            file_name=f"{filename}.zip",
+            mime="application/zip",
+            help="Download every selected format in one ZIP file",
+            on_click="ignore"
+        )
+
+@st.fragment
+def show_settings():
+    """Settings tab; flipping the profiling toggle reruns only this fragment"""
+    st.info("🌸 This is the Hello Kitty Schedule Generator - a magical tool for creating work schedules!")
+    
+    st.markdown("### 🔬 Diagnostics")
+    st.toggle(
+        "🔬 Profile each generation",
+        key="profile_generation",
+        help="Capture a cProfile of every generation and show the slowest functions per stage in the Preview tab"
+    )
     
+    # App information
+    st.markdown("### 📋 App Information")
+    st.markdown("""
+    - **Version**: 2.0 (Web Edition)
+    - **Theme**: Hello Kitty Pink
+    - **Framework**: Streamlit
+    - **Features**: Multiple export formats, responsive design
+    """)
+    
+    # Contact/Support
+    st.markdown("### 🎀 Support")
+    st.markdown("""
+    If you love this app, please give it a ⭐ star on GitHub!
+    
+    **Repository**: [Weekly-Work-Schedule-Generator-Hello-Kitty-WEB](https://github.com/candyyetszyu/Weekly-Work-Schedule-Generator-Hello-Kitty-WEB)
+    """)
+
+# Shared worker pool so long generations never run on a session's script thread
+MAX_GENERATION_WORKERS = 4
+# A bulk job leaves at least one worker free for interactive generations
+BULK_ROWS_IN_FLIGHT = MAX_GENERATION_WORKERS - 1
+
+@st.cache_resource
+def get_generation_pool():
+    """Bounded pool shared by every session served by this process"""
+    return ThreadPoolExecutor(max_workers=MAX_GENERATION_WORKERS, thread_name_prefix="schedule-generator")
+
+@st.cache_resource
+def get_artifact_cache():
+    """On-disk cache of rendered files, shared with the CLI and desktop GUI"""
+    return ArtifactCache()
+
+class GenerationJob:
+    """Handle for a schedule generation running on the shared worker pool"""
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.cancel_event = threading.Event()
+        self.weeks_done = 0
+        self.weeks_total = 0
+        self.future = None
+
+    def update_progress(self, weeks_done, weeks_total):
+        # Called from the worker thread; plain attribute writes are enough for polling
+        self.weeks_done = weeks_done
+        self.weeks_total = weeks_total
+
 # Function to generate schedule
-def generate_schedule_web(filename, mode, total_hours, total_days, total_overall_hours, start_date, start_week, export_txt, export_xlsx, export_docx):
+def generate_schedule_web(filename, mode, total_hours, total_days, total_overall_hours, start_date, start_week, export_txt, export_xlsx, export_docx, export_jsonl=False, export_ics=False, seed_text=""):
+    """Validate the form and submit the generation to the worker pool"""
     try:
         # Validate inputs
         if not filename.strip():
@@ -531,63 +422,252 @@ def generate_schedule_web(filename, mode, total_hours, total_days, total_overall
             return
         
         if "weekly" in mode:
-            if total_hours <= 0 or total_hours > 15:
-                st.error("Weekly hours must be between 0.5 and 15")
-                return
-            if total_days < 1:
-                st.error("Total days must be at least 1")
-                return
+            check = check_schedule(total_hours, int(total_days), start_week=int(start_week))
         else:
-            if total_overall_hours <= 0:
-                st.error("Total overall hours must be greater than 0")
+            check = check_schedule(total_overall_hours=total_overall_hours, start_week=int(start_week))
+        if not check["ok"]:
+            st.error("🌸 This schedule can't be made:\n\n" +
+                     "\n".join(f"- {reason['message']}" for reason in check["reasons"]))
+            return
+        for warning in check["warnings"]:
+            st.warning(f"⚠️ {warning['message']}")
+        
+        seed = None
+        if seed_text.strip():
+            try:
+                seed = int(seed_text)
+            except ValueError:
+                st.error("Seed must be a whole number")
                 return
         
-        # Show progress with better styling
-        with st.spinner("🌸 Creating your magical Hello Kitty schedule... 🌸"):
-            start_date_str = start_date.strftime("%Y-%m-%d")
-            
-            if "weekly" in mode:
-                # Mode 1
-                generate_schedule_cli_copy.generate_schedule(
-                    start_date_str, total_hours, int(total_days), filename.strip(), start_week,
-                    export_txt, export_xlsx, export_docx
-                )
-            else:
-                # Mode 2
-                generate_schedule_cli_copy.generate_schedule_total_hours(
-                    start_date_str, total_overall_hours, filename.strip(), start_week,
-                    export_txt, export_xlsx, export_docx
-                )
-        
-        # Check which files were created (but don't show download buttons)
-        created_files = []
-        
-        if export_txt and os.path.exists(f"{filename.strip()}.txt"):
-            created_files.append(".txt")
-        
-        if export_xlsx and os.path.exists(f"{filename.strip()}.xlsx"):
-            created_files.append(".xlsx")
-        
-        if export_docx and os.path.exists(f"{filename.strip()}.docx"):
-            created_files.append(".docx")
+        running_job = st.session_state.get('generation_job')
+        if running_job is not None and not running_job.future.done():
+            st.warning("🌸 A schedule is already being created - cancel it or wait for it to finish 🌸")
+            return
         
-        # Success message with better styling
-        files_text = ", ".join(created_files) if created_files else "No files"
-        st.success(f"""
-        🌸 **Hello Kitty schedule created successfully!** 🌸
+        start_date_str = start_date.strftime("%Y-%m-%d")
+        job = GenerationJob(filename.strip())
+        export_options = dict(
+            seed=seed, export_jsonl=export_jsonl, export_ics=export_ics,
+            progress=job.update_progress, cancel_event=job.cancel_event, cache=get_artifact_cache()
+        )
         
-        **Files created:** {files_text}
-        **Location:** {os.getcwd()}
+        # Keep the generated weeks so the Preview tab never re-reads the files
+        export_options["keep_weeks"] = True
+        export_options["profile"] = st.session_state.get("profile_generation", False)
         
-        📊 **Check the Preview tab to see your schedule!** 🌸
-        """)
+        if "weekly" in mode:
+            # Mode 1
+            job.future = get_generation_pool().submit(
+                generate_schedule_cli_copy.generate_schedule,
+                start_date_str, total_hours, int(total_days), filename.strip(), start_week,
+                export_txt, export_xlsx, export_docx, **export_options
+            )
+        else:
+            # Mode 2
+            job.future = get_generation_pool().submit(
+                generate_schedule_cli_copy.generate_schedule_total_hours,
+                start_date_str, total_overall_hours, filename.strip(), start_week,
+                export_txt, export_xlsx, export_docx, **export_options
+            )
         
-        # Set session state to indicate schedule has been generated
-        st.session_state['schedule_generated'] = True
-        st.session_state['last_filename'] = filename.strip()
+        st.session_state['generation_job'] = job
                 
     except Exception as e:
         st.error(f"🌸 Oops! Something went wrong with the magic... 🌸\n\n**Error:** {str(e)}")
 
+@st.fragment(run_every=0.5)
+def show_generation_progress():
+    """Poll the running job; only this fragment reruns while the job is in progress"""
+    job = st.session_state.get('generation_job')
+    if job is None:
+        return
+    
+    if not job.future.done():
+        fraction = job.weeks_done / job.weeks_total if job.weeks_total else 0.0
+        weeks_text = f"week {job.weeks_done} of {job.weeks_total}" if job.weeks_total else "starting"
+        st.progress(fraction, text=f"🌸 Creating your magical Hello Kitty schedule... {weeks_text} 🌸")
+        if job.cancel_event.is_set():
+            st.info("🎀 Cancelling...")
+        elif st.button("🎀 Cancel", key="cancel_generation"):
+            job.cancel_event.set()
+        return
+    
+    finish_generation(job)
+    st.rerun()
+
+def finish_generation(job):
+    """Pick up a finished job's result and store the message for the next rerun"""
+    del st.session_state['generation_job']
+    try:
+        result = job.future.result()
+    except generate_schedule_cli_copy.ScheduleCancelled:
+        st.session_state['generation_message'] = ("info", "🎀 Schedule generation was cancelled.")
+        return
+    except Exception as e:
+        st.session_state['generation_message'] = (
+            "error", f"🌸 Oops! Something went wrong with the magic... 🌸\n\n**Error:** {str(e)}"
+        )
+        return
+    
+    created_files = [os.path.splitext(file)[1] for file in result["files"]]
+    
+    # Success message with better styling
+    files_text = ", ".join(created_files) if created_files else "No files"
+    st.session_state['generation_message'] = ("success", f"""
+    🌸 **Hello Kitty schedule created successfully!** 🌸
+    
+    **Files created:** {files_text}
+    **Location:** {os.getcwd()}
+    
+    📊 **Check the Preview tab to see your schedule!** 🌸
+    """)
+    
+    # Set session state to indicate schedule has been generated
+    st.session_state['schedule_generated'] = True
+    st.session_state['last_filename'] = job.filename
+    st.session_state['last_result'] = result
+    st.session_state.pop('preview_page', None)
+
+@st.fragment
+def show_bulk_generation():
+    """Upload a parameter file, validate every row and generate them all in the background"""
+    st.markdown("Upload a CSV or XLSX with one parameter set per row: `filename`, `start_date`, then "
+                "`hours_per_week` and `days` (Mode 1) or `total_hours` (Mode 2). "
+                "`start_week`, `seed`, `sessions_per_day` and `min_gap` are optional.")
+    st.download_button("🌸 Download CSV template", data=bulk_generation.TEMPLATE_CSV,
+                       file_name="schedule_parameters.csv", mime="text/csv")
+    
+    uploaded = st.file_uploader("📂 Parameter file:", type=["csv", "xlsx"], key="bulk_upload")
+    formats = st.multiselect("📄 Export Formats:", list(bulk_generation.BULK_FORMATS),
+                             default=["txt", "xlsx", "docx"], key="bulk_formats")
+    
+    if 'bulk_job' in st.session_state:
+        show_bulk_progress()
+    if uploaded is None:
+        return
+    
+    try:
+        frame = bulk_generation.read_parameter_file(uploaded, uploaded.name)
+    except Exception as e:
+        st.error(f"🌸 Could not read {uploaded.name}: {e}")
+        return
+    parameter_sets, errors = bulk_generation.validate_parameter_sets(frame)
+    if errors:
+        st.error("🌸 Please fix these rows before generating:\n\n" + "\n".join(f"- {error}" for error in errors))
+        return
+    
+    total_weeks = sum(params["weeks"] for params in parameter_sets)
+    st.success(f"✅ {len(parameter_sets)} parameter sets are valid ({total_weeks} weeks in total)")
+    with st.expander("📋 Parameter sets", expanded=False):
+        st.dataframe(frame, hide_index=True, use_container_width=True)
+    
+    job = st.session_state.get('bulk_job')
+    running = job is not None and not job.done()
+    if st.button("🌸 Generate All Schedules 🌸", type="primary", disabled=running or not formats,
+                 key="bulk_generate"):
+        if job is not None:
+            job.cleanup()
+        st.session_state['bulk_job'] = bulk_generation.BulkJob(
+            parameter_sets, formats, get_artifact_cache()
+        ).start(get_generation_pool(), max_in_flight=BULK_ROWS_IN_FLIGHT).bundle_when_done()
+        st.rerun(scope="fragment")
+
+@st.fragment(run_every=0.5)
+def show_bulk_progress():
+    """Aggregate progress of the bulk job, then its single ZIP download"""
+    job = st.session_state.get('bulk_job')
+    if job is None:
+        return
+    
+    count = len(job.parameter_sets)
+    if not job.bundled_or_failed:
+        st.progress(job.fraction, text=f"🌸 {job.finished_count} of {count} schedules done "
+                                       f"({sum(job.weeks_done)} of {job.weeks_total} weeks) 🌸")
+        if job.cancel_event.is_set():
+            st.info("🎀 Cancelling...")
+        elif st.button("🎀 Cancel", key="cancel_bulk"):
+            job.cancel()
+        return
+    
+    # The job bundled its ZIP in memory and removed its working directory when the last row finished
+    if job.bundle_error:
+        st.error(f"🌸 Could not bundle the schedules: {job.bundle_error}")
+        return
+    failed = [(params, error) for params, _, error in job.outcomes() if error]
+    st.success(f"🌸 {job.bundled} of {count} schedules created 🌸")
+    for params, error in failed:
+        st.warning(f"Row {params['row']} ({params['filename']}): {error}")
+    if job.bundled:
+        st.download_button("📦 Download All Schedules (ZIP)", data=job.zip_data,
+                           file_name="schedules.zip", mime="application/zip", key="bulk_download")
+
+def read_file_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+PREVIEW_PAGE_SIZES = [4, 8, 13, 26, 52]
+
+def weekly_summary_frame(weeks):
+    """One row per week: the collapsed overview of the whole schedule"""
+    return pd.DataFrame([{
+        "Week": week["week"],
+        "From": week["start"].strftime("%d %b %Y"),
+        "To": week["end"].strftime("%d %b %Y"),
+        "Days": len(week["days"]),
+        "Hours": week["minutes"] / 60,
+    } for week in weeks])
+
+def show_schedule_preview(result):
+    """Page through the in-memory schedule; only the weeks on the current page are sent to the browser"""
+    weeks = result["weeks"]
+    
+    with st.expander(f"📅 Weekly summary ({len(weeks)} weeks)", expanded=False):
+        st.dataframe(weekly_summary_frame(weeks), hide_index=True, use_container_width=True)
+    
+    st.markdown("### 📊 Schedule Preview")
+    col_size, col_page = st.columns(2)
+    with col_size:
+        page_size = st.selectbox("🎀 Weeks per page:", PREVIEW_PAGE_SIZES, key="preview_page_size")
+    page_count = (len(weeks) + page_size - 1) // page_size
+    # Keep the page in range when the page size or the schedule changes
+    if st.session_state.setdefault("preview_page", 1) > page_count:
+        st.session_state["preview_page"] = page_count
+    with col_page:
+        page = st.number_input("🌸 Page:", min_value=1, max_value=page_count, step=1, key="preview_page")
+    visible = weeks[(page - 1) * page_size:page * page_size]
+    st.caption(f"Weeks {visible[0]['week']}–{visible[-1]['week']} of "
+               f"{weeks[0]['week']}–{weeks[-1]['week']} (page {page} of {page_count})")
+    
+    rows = [row for week in visible for row in generate_schedule_cli_copy.week_excel_rows(week)]
+    st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+    with st.expander("📄 Text view of these weeks", expanded=False):
+        lines = [line for week in visible
+                 for line in generate_schedule_cli_copy.week_text_lines(week, result["hours_per_week"])]
+        st.text("\n".join(lines))
+
+def show_profile_report(profile):
+    """Per-stage hotspots of the last generation, with the raw .pstats file to download"""
+    with st.expander("🔬 Profile of this generation", expanded=False):
+        st.code(profile["report"], language=None)
+        if os.path.exists(profile["stats_file"]):
+            st.download_button(
+                label="🔬 Download .pstats",
+                data=lambda: read_file_bytes(profile["stats_file"]),
+                file_name=os.path.basename(profile["stats_file"]),
+                mime="application/octet-stream",
+                help="Open with pstats, snakeviz or schedule_profiler.py"
+            )
+
+def build_zip_bundle(result, filename):
+    """Render the last schedule's formats straight into an in-memory ZIP archive"""
+    buffer = io.BytesIO()
+    generate_schedule_cli_copy.write_zip_bundle(
+        result["start_date"], result["hours_per_week"], result["total_days"], result["start_week"],
+        result["formats"], buffer, result["seed"], filename
+    )
+    buffer.seek(0)
+    return buffer
+
 if __name__ == "__main__":
-    main() 
+    main()
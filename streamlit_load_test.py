@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Load test for the Streamlit app
+Drives N concurrent sessions of streamlit_app.py through streamlit.testing's AppTest:
+each session switches modes, generates a schedule and reruns the Preview tab
+
+Every session runs in its own process so CPU time, peak memory and disk I/O can be
+reported per session. Rerun latencies are pooled across sessions by step.
+"""
+
+import argparse
+import contextlib
+import multiprocessing
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(APP_DIR, "streamlit_app.py")
+MODE_WEEKLY = "🌸 Mode 1: Input total weekly hours"
+MODE_TOTAL = "🎀 Mode 2: Input total overall hours"
+GENERATE_LABEL = "🌸 Generate Magic Schedule 🌸"
+FORMAT_CHECKBOXES = (("📄 Text File", "txt"), ("📊 Excel File", "xlsx"), ("📝 Word File", "docx"),
+                     ("🗂 JSON Lines", "jsonl"), ("📆 Calendar (.ics)", "ics"))
+GENERATION_TIMEOUT = 120
+
+
+def _peak_rss_mb():
+    # ru_maxrss is KB on Linux and bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+def _cpu_seconds():
+    times = os.times()
+    return times.user + times.system
+
+
+def _io_bytes():
+    """(read, written) bytes of this process, or None where /proc/self/io is not available."""
+    try:
+        with open("/proc/self/io") as f:
+            counters = dict(line.split(": ") for line in f.read().splitlines())
+        return int(counters["read_bytes"]), int(counters["write_bytes"])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _widget(widgets, label):
+    return next(widget for widget in widgets if widget.label == label)
+
+
+def run_session(session, iterations, days, formats, barrier):
+    """Drive one session and return its rerun latencies by step plus its resource usage."""
+    sys.path.insert(0, APP_DIR)
+    from streamlit.testing.v1 import AppTest
+
+    # The generator prints every schedule; keep the report readable
+    with tempfile.TemporaryDirectory() as work_dir, open(os.devnull, "w") as devnull, \
+            contextlib.redirect_stdout(devnull):
+        os.chdir(work_dir)
+        os.environ["SCHEDULE_CACHE_DIR"] = os.path.join(work_dir, "cache")
+
+        # Warm up imports and caches so they are not counted against the session
+        AppTest.from_file(APP_PATH, default_timeout=GENERATION_TIMEOUT).run()
+        barrier.wait()
+
+        latencies = {}
+        generation_seconds = []
+        cpu_before, rss_before, io_before = _cpu_seconds(), _peak_rss_mb(), _io_bytes()
+
+        def rerun(step, action):
+            started = time.perf_counter()
+            action.run()
+            latencies.setdefault(step, []).append(time.perf_counter() - started)
+
+        for iteration in range(iterations):
+            at = AppTest.from_file(APP_PATH, default_timeout=GENERATION_TIMEOUT)
+            rerun("load", at)
+
+            # Look at Mode 2, then generate in Mode 1
+            rerun("switch mode", _widget(at.radio, "Select Generation Mode:").set_value(MODE_TOTAL))
+            rerun("switch mode", _widget(at.radio, "Select Generation Mode:").set_value(MODE_WEEKLY))
+            rerun("edit input", _widget(at.number_input, "🎀 Total Days:").set_value(days))
+            rerun("edit input", _widget(at.text_input, "🌸 Filename:").input(f"session_{session}_{iteration}"))
+            for label, fmt in FORMAT_CHECKBOXES:
+                checkbox = _widget(at.checkbox, label)
+                if checkbox.value != (fmt in formats):
+                    rerun("edit input", checkbox.set_value(fmt in formats))
+
+            started = time.perf_counter()
+            rerun("generate", _widget(at.button, GENERATE_LABEL).click())
+            while "generation_job" in at.session_state:
+                if time.perf_counter() - started > GENERATION_TIMEOUT:
+                    raise TimeoutError(f"Session {session} generation did not finish")
+                time.sleep(0.05)
+                rerun("progress poll", at)
+            generation_seconds.append(time.perf_counter() - started)
+            if at.exception:
+                raise RuntimeError(at.exception[0].message)
+
+            # The Preview tab pages through the weeks kept in session state; no files are read
+            rerun("preview", at)
+
+        io_after = _io_bytes()
+        io_mb = None
+        if io_before is not None and io_after is not None:
+            io_mb = [(after - before) / 2 ** 20 for before, after in zip(io_before, io_after)]
+        return {
+            "session": session,
+            "latencies": latencies,
+            "generation_seconds": generation_seconds,
+            "cpu_seconds": _cpu_seconds() - cpu_before,
+            "rss_growth_mb": max(0.0, _peak_rss_mb() - rss_before),
+            "peak_rss_mb": _peak_rss_mb(),
+            "io_mb": io_mb,
+        }
+
+
+def percentiles(values):
+    cuts = statistics.quantiles(values, n=100) if len(values) > 1 else values * 99
+    return cuts[49] * 1000, cuts[94] * 1000, cuts[98] * 1000
+
+
+def load_test(sessions, iterations=1, days=28, formats=("txt", "xlsx", "docx")):
+    """Run `sessions` concurrent sessions and return the per-session results and pooled latencies."""
+    context = multiprocessing.get_context("spawn")
+    with context.Manager() as manager:
+        barrier = manager.Barrier(sessions)
+        with context.Pool(sessions) as pool:
+            started = time.perf_counter()
+            results = pool.starmap(run_session, [(session, iterations, days, formats, barrier)
+                                                 for session in range(sessions)])
+            elapsed = time.perf_counter() - started
+
+    pooled = {}
+    for result in results:
+        for step, values in result["latencies"].items():
+            pooled.setdefault(step, []).extend(values)
+    return {"sessions": results, "latencies": pooled, "seconds": elapsed}
+
+
+def print_report(report):
+    print(f"\n🎀 {len(report['sessions'])} concurrent sessions in {report['seconds']:.1f}s 🎀")
+    print("⏱ Rerun latency by step (ms):")
+    print(f"   {'step':<14} {'reruns':>6} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for step, values in report["latencies"].items():
+        p50, p95, p99 = percentiles(values)
+        print(f"   {step:<14} {len(values):>6} {p50:8.1f} {p95:8.1f} {p99:8.1f}")
+
+    print("💻 Per session:")
+    for result in report["sessions"]:
+        io_text = ""
+        if result["io_mb"] is not None:
+            io_text = f", disk read {result['io_mb'][0]:.1f} MB / written {result['io_mb'][1]:.1f} MB"
+        generation = statistics.mean(result["generation_seconds"])
+        print(f"   #{result['session']}: CPU {result['cpu_seconds']:.2f}s, "
+              f"peak RSS {result['peak_rss_mb']:.0f} MB (+{result['rss_growth_mb']:.1f} MB), "
+              f"generation {generation:.2f}s{io_text}")
+
+    cpu = statistics.mean(result["cpu_seconds"] for result in report["sessions"])
+    rss = statistics.mean(result["rss_growth_mb"] for result in report["sessions"])
+    print(f"🌸 Mean per session: CPU {cpu:.2f}s, memory growth {rss:.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="🎀 Load-test the Streamlit app with concurrent AppTest sessions")
+    parser.add_argument("--sessions", type=int, default=4, help="Concurrent sessions")
+    parser.add_argument("--iterations", type=int, default=3, help="Generate/preview cycles per session")
+    parser.add_argument("--days", type=int, default=28, help="Days per generated schedule (Mode 1, 10 h/week)")
+    parser.add_argument("--formats", nargs="+", default=["txt", "xlsx", "docx"],
+                        choices=["txt", "xlsx", "docx", "jsonl", "ics"],
+                        help="Formats to export (txt, xlsx and docx are on by default in the app)")
+    args = parser.parse_args()
+    print_report(load_test(args.sessions, args.iterations, args.days, args.formats))
+
+
+if __name__ == "__main__":
+    main()
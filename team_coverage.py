@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Team coverage scheduling
+Places every employee's daily sessions so each 30-minute slot between 09:00 and 18:00
+has at least k people working, and reports the slots that stay uncovered
+
+Each person keeps their own weekly total, split across days as in the single-person
+generator. Coverage is a NumPy matrix of people working per (day, slot), updated as
+each session is placed.
+"""
+
+import argparse
+import csv
+import random
+import sys
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+
+import generate_schedule_cli_copy as core
+from feasibility import check_schedule
+
+
+def read_roster(path):
+    """Read a CSV roster with `employee` and `hours_per_week` columns into (name, hours) pairs."""
+    with open(path, newline="", encoding="utf-8") as f:
+        roster = [(row["employee"].strip(), float(row["hours_per_week"])) for row in csv.DictReader(f)]
+    if not roster:
+        raise ValueError(f"{path} lists no employees.")
+    return roster
+
+
+def slot_label(slot):
+    minute = core.WORK_START + slot * core.SLOT_MINUTES
+    return f"{minute // 60:02d}:{minute % 60:02d}"
+
+
+def coverage_chooser(coverage_row, required, rng):
+    """Pick the start that covers the most still-missing person-slots; ties are broken at random."""
+    def choose(candidates, length):
+        missing = np.maximum(required - coverage_row, 0)
+        window_sums = np.concatenate(([0], np.cumsum(missing)))
+        gains = window_sums[np.array(candidates) + length] - window_sums[candidates]
+        best = np.flatnonzero(gains == gains.max())
+        return candidates[best[rng.randrange(len(best))]]
+    return choose
+
+
+def schedule_team(roster, start_date, total_days, start_week=1, required=1, rng=random,
+                  sessions_per_day=1, min_gap=30):
+    """Schedule a whole roster day by day for coverage.
+
+    Returns (weeks per employee, coverage matrix). The weeks have the same shape as
+    `iter_schedule_weeks`; coverage[day, slot] counts the people working that slot.
+    """
+    coverage = np.zeros((total_days, core.WORK_SLOTS), dtype=np.int16)
+    weeks = {name: [] for name, _ in roster}
+    minutes_per_week = {name: round(hours * 60 / 30) * 30 for name, hours in roster}
+
+    for week_index, first_day in enumerate(range(0, total_days, 7)):
+        days_in_week = min(7, total_days - first_day)
+        plans = {name: core.plan_week_minutes(minutes_per_week[name], days_in_week, rng) for name, _ in roster}
+        week_start = start_date + timedelta(days=first_day)
+        for name, _ in roster:
+            weeks[name].append({
+                "week": start_week + week_index,
+                "start": week_start,
+                "end": week_start + timedelta(days=days_in_week - 1),
+                "minutes": sum(plans[name]),
+                "days": [],
+            })
+
+        for offset in range(days_in_week):
+            day_index = first_day + offset
+            date = start_date + timedelta(days=day_index)
+            choose = coverage_chooser(coverage[day_index], required, rng)
+            # Longest days first, while the most slots are still open
+            for name in sorted(plans, key=lambda name: -plans[name][offset]):
+                minutes = plans[name][offset]
+                if minutes <= 0:
+                    continue
+                session_minutes = [minutes]
+                if sessions_per_day > 1:
+                    session_minutes = core.split_day_minutes(minutes, sessions_per_day, min_gap, rng)
+                try:
+                    sessions = core.place_sessions(session_minutes, min_gap, rng, choose=choose)
+                except ValueError:
+                    # Too long for the working window: same 09:00 fallback as the generator
+                    end = core.WORK_START + minutes
+                    sessions = [{"start": "09:00", "end": f"{end // 60:02d}:{end % 60:02d}", "minutes": minutes}]
+
+                for session in sessions:
+                    first_slot = (core.time_to_minutes(session["start"]) - core.WORK_START) // core.SLOT_MINUTES
+                    length = -(-session["minutes"] // core.SLOT_MINUTES)
+                    coverage[day_index, first_slot:first_slot + length] += 1
+                weeks[name][-1]["days"].append({
+                    "date": date,
+                    "weekday": core.WEEKDAYS[date.weekday()],
+                    "minutes": minutes,
+                    "start": sessions[0]["start"],
+                    "end": sessions[-1]["end"],
+                    "sessions": sessions,
+                })
+        for name in weeks:
+            weeks[name][-1]["days"].sort(key=lambda day: day["date"])
+
+    return weeks, coverage
+
+
+def uncovered_slots(coverage, start_date, required):
+    """(date, first slot, last slot, people working) for each run of slots below `required`."""
+    gaps = []
+    for day_index, row in enumerate(coverage):
+        slot = 0
+        while slot < len(row):
+            if row[slot] >= required:
+                slot += 1
+                continue
+            end = slot
+            while end + 1 < len(row) and row[end + 1] < required and row[end + 1] == row[slot]:
+                end += 1
+            gaps.append((start_date + timedelta(days=day_index), slot, end, int(row[slot])))
+            slot = end + 1
+    return gaps
+
+
+def coverage_frame(coverage, start_date):
+    """Coverage matrix as a DataFrame: one row per date, one column per slot."""
+    return pd.DataFrame(
+        coverage,
+        index=[(start_date + timedelta(days=i)).strftime("%d %b %Y") for i in range(len(coverage))],
+        columns=[slot_label(slot) for slot in range(coverage.shape[1])],
+    )
+
+
+def print_report(coverage, start_date, required):
+    gaps = uncovered_slots(coverage, start_date, required)
+    covered = (coverage >= required).mean()
+    print(f"\n👥 {covered:.1%} of slots have at least {required} people")
+    if not gaps:
+        print("🌸 Every slot is covered 🌸")
+        return
+    print(f"⚠️ {len(gaps)} uncovered slot range(s):")
+    for date, first, last, working in gaps:
+        end = core.WORK_START + (last + 1) * core.SLOT_MINUTES
+        print(f"   {date.strftime('%d %b %Y')} {slot_label(first)}–{end // 60:02d}:{end % 60:02d} "
+              f"({working}/{required})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="🎀 Schedule a team so every slot is covered")
+    parser.add_argument("roster", help="CSV file with employee,hours_per_week columns")
+    parser.add_argument("--date", required=True, help="Any date in the first week (YYYY-MM-DD)")
+    parser.add_argument("--days", type=int, default=28)
+    parser.add_argument("--start-week", type=int, default=1)
+    parser.add_argument("--required", type=int, default=1, help="People needed in every 30-minute slot")
+    parser.add_argument("--sessions-per-day", type=int, default=1)
+    parser.add_argument("--min-gap", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", default="team_schedule", help="Prefix for the files written")
+    parser.add_argument("--db", default=None, help="Also save every schedule to this ScheduleStore database")
+    args = parser.parse_args()
+
+    seed = args.seed if args.seed is not None else random.randrange(2 ** 32)
+    roster = read_roster(args.roster)
+    infeasible = False
+    for name, hours in roster:
+        check = check_schedule(hours, args.days, start_week=args.start_week, sessions_per_day=args.sessions_per_day,
+                               min_gap=args.min_gap)
+        for reason in check["reasons"]:
+            print(f"❌ {name}: {reason['message']}")
+            infeasible = True
+    if infeasible:
+        sys.exit(1)
+    start_date = core.get_monday(args.date)
+    weeks, coverage = schedule_team(roster, start_date, args.days, args.start_week, args.required,
+                                    random.Random(seed), args.sessions_per_day, args.min_gap)
+
+    for name, hours in roster:
+        total_hours = sum(week["minutes"] for week in weeks[name]) / 60
+        lines = [line for week in weeks[name] for line in core.week_text_lines(week, hours)]
+        core.write_txt(lines + core.text_trailer_lines(total_hours), f"{args.output}_{name}.txt")
+        print(f"📄 {name}: {total_hours:.2f} hours saved to {args.output}_{name}.txt")
+    coverage_frame(coverage, start_date).to_excel(f"{args.output}_coverage.xlsx")
+    print(f"📊 Coverage grid saved to: {args.output}_coverage.xlsx")
+
+    if args.db:
+        from schedule_store import ScheduleStore
+        with ScheduleStore(args.db) as store:
+            for name, hours in roster:
+                params = {"any_date": args.date, "total_hours_per_week": hours, "total_days": args.days,
+                          "start_week": args.start_week, "team_required": args.required}
+                store.save_schedule(params, seed, weeks[name], name)
+        print(f"🗄️ Saved {len(roster)} schedules to {args.db}")
+
+    print_report(coverage, start_date, args.required)
+    print(f"🎲 Seed: {seed}")
+
+
+if __name__ == "__main__":
+    main()